@@ -1,8 +1,13 @@
-from django.contrib import admin
-from decimal import Decimal
+from datetime import timedelta
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.db.models import Prefetch
+from django.template.response import TemplateResponse
 from django.utils import timezone
 from django.utils.safestring import mark_safe
-from .models import Movie, Theater, Show, Seat, Booking,UserProfile, SeatClass, ShowPrice
+from .models import Movie, Theater, Show, Seat, Booking,UserProfile, SeatClass, ShowPrice, SeatLayout, LayoutRow, ShowTimeTemplate, ArchivedShow, ArchivedBooking, SalesRollup
+from . import archive, exports, posters, rollups, scheduling
 # ✅ Admin Action to Delete Expired Shows
 
 @admin.register(Booking)
@@ -18,6 +23,11 @@ class BookingAdmin(admin.ModelAdmin):
         "booking_time",
     )
 
+    list_select_related    = ("movie", "user", "show__movie", "show__theater")
+    date_hierarchy         = "booking_time"   # filters on a booking_time range (indexed)
+    show_full_result_count = False            # skip the unfiltered COUNT(*)
+    ordering               = ("-booking_time",)
+
     readonly_fields = (
         "movie",
         "theater",
@@ -29,6 +39,10 @@ class BookingAdmin(admin.ModelAdmin):
         "total_price",
     )
 
+    def get_queryset(self, request):
+        seats = Seat.objects.select_related("seat_class").order_by("id")
+        return super().get_queryset(request).prefetch_related(Prefetch("seats", queryset=seats))
+
     # ─────────────────────────────────────
     #  helper columns / fields
     # ─────────────────────────────────────
@@ -40,6 +54,10 @@ class BookingAdmin(admin.ModelAdmin):
     def show_time(self, obj):
         return obj.show.show_time
 
+    @admin.display(description="Total ₹", ordering="total_price")
+    def total_price(self, obj):
+        return obj.total_price      # stored at checkout by core.pricing
+
     @admin.display(description="Selected seats")
     def seat_summary(self, obj):
         """
@@ -47,23 +65,11 @@ class BookingAdmin(admin.ModelAdmin):
             A1, A2 – Premium
             C1, C2 – Regular
         """
-        rows = []
-        for sc in SeatClass.objects.all().order_by("name"):
-            nums = obj.seats.filter(seat_class=sc).values_list("seat_number", flat=True)
-            if nums:
-                rows.append(f"{', '.join(nums)} – {sc.name}")
-        return mark_safe("<br>".join(rows))
-
-    @admin.display(description="Total ₹")
-    def total_price(self, obj):
-        total = Decimal("0.00")
-        for seat in obj.seats.select_related("seat_class"):
-            price = ShowPrice.objects.filter(
-                show=obj.show, seat_class=seat.seat_class
-            ).first()
-            if price:
-                total += price.price
-        return total
+        by_class = {}
+        for seat in obj.seats.all():                # prefetched in get_queryset
+            by_class.setdefault(seat.seat_class.name, []).append(seat.seat_number)
+        return mark_safe("<br>".join(f"{', '.join(nums)} – {name}"
+                                     for name, nums in sorted(by_class.items())))
 
     # ─────────────────────────────────────
     #  LOCK IT DOWN  (no add / edit / delete)
@@ -78,13 +84,22 @@ class BookingAdmin(admin.ModelAdmin):
         return True
     
 
-@admin.action(description='Delete all expired shows (before today)')
-def delete_expired_shows(modeladmin, request, queryset):
-    today = timezone.now().date()
-    expired_shows = Show.objects.filter(show_time__date__lt=today)
-    count = expired_shows.count()
-    expired_shows.delete()
-    modeladmin.message_user(request, f"{count} expired show(s) deleted successfully.")
+@admin.action(description='Archive all expired shows (before today)')
+def archive_expired_shows(modeladmin, request, queryset):
+    shows, bookings = archive.archive()
+    modeladmin.message_user(request, f"{shows} expired show(s) and {bookings} booking(s) archived.")
+
+
+@admin.action(description=f'Generate upcoming shows (next {scheduling.DAYS_AHEAD} days)')
+def generate_upcoming_shows(modeladmin, request, queryset):
+    count = scheduling.generate()
+    modeladmin.message_user(request, f"{count} show(s) created.")
+
+
+@admin.action(description=f'Schedule shows (next {scheduling.DAYS_AHEAD} days)')
+def schedule_movie_shows(modeladmin, request, queryset):
+    count = scheduling.generate(movies=queryset)
+    modeladmin.message_user(request, f"{count} show(s) created.")
 
 
 @admin.register(SeatClass)
@@ -92,31 +107,171 @@ class SeatClassAdmin(admin.ModelAdmin):
     list_display = ('name', 'color')
 
 
+class LayoutRowInline(admin.TabularInline):
+    model = LayoutRow
+    extra = 0
+
+    # seat bitmaps are positional → freeze a layout once shows use it
+    def _in_use(self, obj):
+        return obj is not None and obj.show_set.exists()
+
+    def has_add_permission(self, request, obj=None):
+        return not self._in_use(obj)
+
+    def has_change_permission(self, request, obj=None):
+        return not self._in_use(obj)
+
+    def has_delete_permission(self, request, obj=None):
+        return not self._in_use(obj)
+
+
+@admin.register(SeatLayout)
+class SeatLayoutAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    inlines      = [LayoutRowInline]
+
+
+class ShowTimeTemplateInline(admin.TabularInline):
+    model = ShowTimeTemplate
+    extra = 0
+
+
+@admin.register(Theater)
+class TheaterAdmin(admin.ModelAdmin):
+    list_display = ('name', 'city', 'layout')
+    inlines      = [ShowTimeTemplateInline]
+
+
 class ShowPriceInline(admin.TabularInline):
+    """Per-show prices; classes without a row sell at their default price."""
     model = ShowPrice
     extra = 0
+    verbose_name        = "price override"
+    verbose_name_plural = "price overrides"
 
 
 # ✅ Custom Admin for Show
 class ShowAdmin(admin.ModelAdmin):
     list_display = ['movie', 'theater', 'show_time']
     inlines      = [ShowPriceInline]
-    actions = [delete_expired_shows]
+    actions = [archive_expired_shows, generate_upcoming_shows]
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         return qs
     
 
+class ArchivedBookingInline(admin.TabularInline):
+    model       = ArchivedBooking
+    fields      = ("booking_id", "username", "seats", "total_price", "booking_time")
+    extra       = 0
+    can_delete  = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedShow)
+class ArchivedShowAdmin(admin.ModelAdmin):
+    list_display   = ("movie_title", "theater_name", "show_time", "seats_sold", "revenue")
+    list_filter    = ("theater_city",)
+    search_fields  = ("movie_title", "theater_name")
+    date_hierarchy = "show_time"
+    inlines        = [ArchivedBookingInline]
+
+    # archive rows are history – read only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(admin.ModelAdmin):
+    """
+    Sales dashboard in place of a changelist: reads SalesRollup only, so it
+    answers from a few small GROUP BYs whatever the booking history.
+    """
+    change_list_template = "admin/core/salesrollup/dashboard.html"
+    DEFAULT_DAYS         = 30
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @staticmethod
+    def _id_param(request, name):
+        value = request.GET.get(name, "")
+        return int(value) if value.isdigit() else None
+
+    def changelist_view(self, request, extra_context=None):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            start = exports.parse_day(request.GET.get("from"))
+            end   = exports.parse_day(request.GET.get("to"))
+        except ValueError:
+            start = end = None
+        end     = end or timezone.localdate()
+        start   = start or end - timedelta(days=self.DEFAULT_DAYS - 1)
+        theater = self._id_param(request, "theater")
+        movie   = self._id_param(request, "movie")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts":     self.model._meta,
+            "title":    "Sales",
+            "start":    start,
+            "end":      end,
+            "theater":  theater,
+            "movie":    Movie.objects.filter(pk=movie).first() if movie else None,
+            "theaters": Theater.objects.order_by("city", "name"),
+            **rollups.dashboard(start, end, theater=theater, movie=movie),
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, self.change_list_template, context)
+
+
 # core/admin.py
 #@admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
     list_display  = ('title', 'release_date')
     filter_horizontal = ('available_theaters',)   # nice dual‑list widget
+    actions = [schedule_movie_shows]
+
+    def save_model(self, request, obj, form, change):
+        old = obj.poster_variants
+        if 'poster' in form.changed_data:
+            # resize once, at upload – the home page only reads the result.
+            # Store the upload first so build_variants can read it; the
+            # movie row itself is then written once, variants included.
+            if not obj.poster._committed:
+                obj.poster.save(obj.poster.name, obj.poster.file, save=False)
+            try:
+                obj.poster_variants = posters.build_variants(obj)
+            except Exception as exc:                 # bad image – like build_poster_variants
+                obj.poster_variants = {}
+                self.message_user(request, f"Poster variants not built ({exc}); "
+                                           f"run build_poster_variants after fixing it.",
+                                  messages.WARNING)
+        super().save_model(request, obj, form, change)
+        if obj.poster_variants != old:
+            posters.remove_stale(obj, old)       # the replaced poster's files
 
 
-admin.site.register(Theater)
-admin.site.register(Movie)
+admin.site.register(Movie, MovieAdmin)
 admin.site.register(Seat)
 admin.site.register(UserProfile)
 admin.site.register(Show, ShowAdmin)
\ No newline at end of file
@@ -0,0 +1,282 @@
+# core/admission.py
+"""
+Waiting room for the booking flow.
+
+Every movie has settings.ADMISSION_CAPACITY checkout slots – a token
+bucket whose tokens are checkout sessions: book_movie takes one, a paid
+booking gives it back, and an abandoned one comes back by itself after
+ADMISSION_SESSION_SECONDS.  Visitors who find the bucket empty join a
+FIFO queue and get the waiting-room page, which polls every
+ADMISSION_POLL_SECONDS and shows their place in line and an estimated
+wait; payment() only goes ahead for a session that still holds a slot.
+So on a hot release at most ADMISSION_CAPACITY people per movie are
+claiming and paying at once – the SQLite writers – however many wait.
+
+The slot is the movie, not the show: the show is picked on the booking
+page itself, after admission.
+
+Queue state lives in a pluggable AdmissionStore (settings.ADMISSION_STORE).
+DatabaseStore, the default, keeps it in two small tables, so every worker
+process sees the same queue; each call is one short transaction.
+LocalStore keeps it in this process, which suits a single-process server.
+With a per-process store a payment can land on a worker that never
+admitted the buyer, so unless ADMISSION_CAPACITY is set explicitly the
+waiting room is only on for stores that declare `shared = True`.
+"""
+import abc
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.module_loading import import_string
+
+from .models import AdmissionEntry, AdmissionRoom
+
+Status = namedtuple("Status", "admitted position wait")    # wait: seconds, estimated
+
+
+DEFAULT_CAPACITY = 50
+
+
+def capacity():
+    """
+    Checkout slots per movie; 0 turns the waiting room off.  Unset (None)
+    means DEFAULT_CAPACITY with a shared store and off with a local one.
+    """
+    configured = getattr(settings, "ADMISSION_CAPACITY", None)
+    if configured is None:
+        return DEFAULT_CAPACITY if store().shared else 0
+    return configured
+
+
+def session_seconds():
+    return getattr(settings, "ADMISSION_SESSION_SECONDS", 900)
+
+
+def poll_seconds():
+    return getattr(settings, "ADMISSION_POLL_SECONDS", 10)
+
+
+def movie_scope(movie_id):
+    return f"movie:{movie_id}"
+
+
+# ─────────────────────────────────────
+#  stores
+# ─────────────────────────────────────
+class AdmissionStore(abc.ABC):
+    """
+    Queue + slot state per scope.  Each method must be atomic per scope;
+    `now` is a time.time() timestamp.  `shared`: state is seen by every
+    server process.
+    """
+    shared = False
+
+    @abc.abstractmethod
+    def enter(self, scope, token, now, capacity, lease, queue_timeout):
+        """
+        Admit `token` if it holds or can take one of `capacity` slots (a
+        slot lasts `lease` seconds), else queue it.  Waiters not seen for
+        `queue_timeout` seconds lose their place.  Returns a Status.
+        """
+
+    @abc.abstractmethod
+    def admitted(self, scope, token, now):
+        """Does `token` hold a live slot?"""
+
+    @abc.abstractmethod
+    def release(self, scope, token, now):
+        """Give back `token`'s slot (or queue place)."""
+
+
+DEFAULT_CHECKOUT = 180                  # seconds, until real checkouts are timed
+
+
+class _Room:
+    def __init__(self):
+        self.slots   = {}               # token → (admitted_at, expires_at)
+        self.waiting = OrderedDict()    # token → [ticket number, last seen]
+        self.issued  = 0                # ticket numbers handed out …
+        self.served  = 0                # … and the last one to leave the queue
+        self.average = None             # seconds a checkout takes (moving average)
+
+
+class LocalStore(AdmissionStore):
+    """In-process store: one lock, one _Room per scope (not shared)."""
+
+    def __init__(self):
+        self._rooms = {}
+        self._lock  = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._rooms.clear()
+
+    def enter(self, scope, token, now, capacity, lease, queue_timeout):
+        with self._lock:
+            room = self._rooms.setdefault(scope, _Room())
+            for t, (_, expires_at) in list(room.slots.items()):
+                if expires_at <= now:
+                    del room.slots[t]
+
+            if token not in room.slots:
+                if token in room.waiting:
+                    room.waiting[token][1] = now
+                else:
+                    room.issued += 1
+                    room.waiting[token] = [room.issued, now]
+
+                # hand free slots to the head of the queue, skipping waiters
+                # who stopped polling
+                while room.waiting and len(room.slots) < capacity:
+                    t, (number, seen) = room.waiting.popitem(last=False)
+                    room.served = number
+                    if now - seen <= queue_timeout:
+                        room.slots[t] = (now, now + lease)
+
+            if token in room.slots:
+                return Status(True, 0, 0)
+            # ahead of us: everyone issued since the last served ticket
+            # (an overestimate while dropped waiters are still in the queue)
+            position = room.waiting[token][0] - room.served
+            average  = room.average or DEFAULT_CHECKOUT
+            return Status(False, position, math.ceil(position * average / max(capacity, 1)))
+
+    def admitted(self, scope, token, now):
+        with self._lock:
+            room = self._rooms.get(scope)
+            slot = room.slots.get(token) if room else None
+            return slot is not None and slot[1] > now
+
+    def release(self, scope, token, now):
+        with self._lock:
+            room = self._rooms.get(scope)
+            if room is None:
+                return
+            room.waiting.pop(token, None)
+            slot = room.slots.pop(token, None)
+            if slot:
+                took = now - slot[0]
+                room.average = took if room.average is None else 0.8 * room.average + 0.2 * took
+
+
+class DatabaseStore(AdmissionStore):
+    """
+    AdmissionRoom / AdmissionEntry rows, one transaction per call (SQLite's
+    IMMEDIATE transactions serialize them).  Same rules as LocalStore,
+    except that waiters who stopped polling are dropped wherever they are
+    in the queue, not only on reaching its head.
+    """
+    shared = True
+
+    def clear(self):
+        AdmissionRoom.objects.all().delete()
+
+    def enter(self, scope, token, now, capacity, lease, queue_timeout):
+        if self.admitted(scope, token, now):            # one read on every later page
+            return Status(True, 0, 0)
+        with transaction.atomic():
+            room, _ = AdmissionRoom.objects.get_or_create(scope=scope)
+            entries = room.entries
+            # lapsed slots, and other waiters who stopped polling
+            entries.filter(Q(expires_at__lte=now) |
+                           Q(expires_at__isnull=True, seen__lt=now - queue_timeout)
+                           & ~Q(token=token)).delete()
+            entry = entries.filter(token=token).first()
+            if entry is not None and entry.expires_at is not None:
+                return Status(True, 0, 0)
+
+            new = entry is None
+            if new:
+                room.issued += 1
+                entry = entries.create(token=token, number=room.issued, seen=now)
+            else:
+                entries.filter(pk=entry.pk).update(seen=now)
+
+            # hand free slots to the head of the queue
+            heads = []
+            free  = capacity - entries.filter(expires_at__isnull=False).count()
+            if free > 0:
+                heads = list(entries.filter(expires_at__isnull=True)
+                                    .order_by("number").values_list("pk", "number")[:free])
+                entries.filter(pk__in=[pk for pk, _ in heads]) \
+                       .update(admitted_at=now, expires_at=now + lease)
+                room.served = heads[-1][1]
+            if heads or new:
+                room.save(update_fields=["issued", "served"])
+
+            if entry.pk in {pk for pk, _ in heads}:
+                return Status(True, 0, 0)
+            position = entry.number - room.served
+            average  = room.average or DEFAULT_CHECKOUT
+            return Status(False, position, math.ceil(position * average / max(capacity, 1)))
+
+    def admitted(self, scope, token, now):
+        return AdmissionEntry.objects.filter(room__scope=scope, token=token,
+                                             expires_at__gt=now).exists()
+
+    def release(self, scope, token, now):
+        with transaction.atomic():
+            entry = (AdmissionEntry.objects.filter(room__scope=scope, token=token)
+                                           .values("pk", "room_id", "admitted_at").first())
+            if entry is None:
+                return
+            AdmissionEntry.objects.filter(pk=entry["pk"]).delete()
+            if entry["admitted_at"] is not None:
+                took = now - entry["admitted_at"]
+                room = AdmissionRoom.objects.filter(pk=entry["room_id"])
+                if not room.filter(average__isnull=False) \
+                           .update(average=0.8 * F("average") + 0.2 * took):
+                    room.update(average=took)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def store():
+    path = getattr(settings, "ADMISSION_STORE", "core.admission.DatabaseStore")
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = import_string(path)()
+        return _stores[path]
+
+
+# ─────────────────────────────────────
+#  request helpers (used by core.views)
+# ─────────────────────────────────────
+def _token(request, create=True):
+    """The session's queue token: a hash of its key (nothing to store)."""
+    if request.session.session_key is None:
+        if not create:
+            return None
+        request.session.save()
+    return hashlib.sha256(request.session.session_key.encode()).hexdigest()[:32]
+
+
+def enter(request, scope):
+    """Admit this session to `scope` or (re)queue it. Returns a Status."""
+    slots = capacity()
+    if not slots:
+        return Status(True, 0, 0)
+    return store().enter(scope, _token(request), time.time(), slots,
+                         session_seconds(), 3 * poll_seconds())
+
+
+def admitted(request, scope):
+    if not capacity():
+        return True
+    token = _token(request, create=False)
+    return token is not None and store().admitted(scope, token, time.time())
+
+
+def release(request, scope):
+    """Checkout finished – the slot goes to the next in line."""
+    token = _token(request, create=False)
+    if token is not None:
+        store().release(scope, token, time.time())
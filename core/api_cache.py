@@ -0,0 +1,133 @@
+# core/api_cache.py
+"""
+Read-through cache + conditional GET for the booking widget's JSON views.
+
+Each response is cached under a key that embeds the current *version* of
+every scope it depends on ("theater:3", "prices:17", …).  Scopes are
+versioned with the time of their last change, so invalidating is just
+bump("theater:3") – old entries are never read again and simply age out –
+and the newest scope version doubles as the Last-Modified date.
+
+Signal receivers in core.signals call bump() whenever Show, ShowPrice,
+SeatClass or Movie rows change.
+
+Versions live in the cache, so a bump is only seen by every worker (and
+by cron's `manage.py generate_shows`) when the cache backend is shared
+between processes.  With a per-process one (LocMemCache, the default)
+nothing is cached: every response is rebuilt on each request – it still
+answers 304 through its ETag.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+TIMEOUT = getattr(settings, "JSON_CACHE_TIMEOUT", 300)
+
+LOCAL_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",
+                  "django.core.cache.backends.dummy.DummyCache")
+
+
+def shared():
+    """Does the default cache reach every worker process?"""
+    return settings.CACHES.get("default", {}).get("BACKEND") not in LOCAL_BACKENDS
+
+
+def _version_key(scope):
+    return f"core:ver:{scope}"
+
+
+def bump(*scopes):
+    """Mark scopes as changed – every cached response using them goes stale."""
+    keys = [_version_key(s) for s in scopes]
+    old  = cache.get_many(keys)
+    now  = time.time_ns()
+    cache.set_many({k: max(now, old.get(k, 0) + 1) for k in keys}, None)
+
+
+def _versions(scopes):
+    keys  = [_version_key(s) for s in scopes]
+    found = cache.get_many(keys)
+    for k in keys:
+        if k not in found:
+            # first sight of a scope: start its clock now (add → workers agree)
+            cache.add(k, time.time_ns(), None)
+            found[k] = cache.get(k) or time.time_ns()
+    return [found[k] for k in keys]
+
+
+def versions(*scopes):
+    """Current version of each scope, for caches kept elsewhere (core.layouts)."""
+    return _versions(scopes)
+
+
+async def _aversions(scopes):
+    keys  = [_version_key(s) for s in scopes]
+    found = await cache.aget_many(keys)
+    for k in keys:
+        if k not in found:
+            await cache.aadd(k, time.time_ns(), None)
+            found[k] = await cache.aget(k) or time.time_ns()
+    return [found[k] for k in keys]
+
+
+def _cache_key(name, versions):
+    return f"core:json:{name}:" + ":".join(map(str, versions))
+
+
+def _entry(data, versions):
+    body = json.dumps(data, cls=DjangoJSONEncoder).encode()
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+    return (body, etag, max(versions) // 10**9)
+
+
+def _respond(request, entry):
+    body, etag, last_modified = entry
+    response = get_conditional_response(request, etag=etag,
+                                        last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"]          = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
+
+def json_response(request, name, scopes, build, timeout=TIMEOUT):
+    """
+    Serve `build()` (a JSON-able object) through the cache.
+    `name` identifies the endpoint + arguments, `scopes` what it depends on;
+    data no scope tracks (e.g. seat counts) is bounded by a short `timeout`.
+    Without a shared cache `build()` runs every time (see above).
+    Answers 304 when the client's ETag / Last-Modified is still current.
+    """
+    if not shared():
+        return _respond(request, _entry(build(), [time.time_ns()]))
+    versions = _versions(scopes)
+    key      = _cache_key(name, versions)
+
+    entry = cache.get(key)
+    if entry is None:
+        entry = _entry(build(), versions)
+        cache.set(key, entry, timeout)
+    return _respond(request, entry)
+
+
+async def ajson_response(request, name, scopes, build, timeout=TIMEOUT):
+    """json_response() for async views: `build` is a coroutine function."""
+    if not shared():
+        return _respond(request, _entry(await build(), [time.time_ns()]))
+    versions = await _aversions(scopes)
+    key      = _cache_key(name, versions)
+
+    entry = await cache.aget(key)
+    if entry is None:
+        entry = _entry(await build(), versions)
+        await cache.aset(key, entry, timeout)
+    return _respond(request, entry)
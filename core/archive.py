@@ -0,0 +1,119 @@
+# core/archive.py
+"""
+Retention for past shows.
+
+archive() moves shows that started before a cut-off date out of the live
+tables in batches of BATCH_SIZE shows.  Each batch is one transaction that
+
+  1. copies the shows and their bookings into ArchivedShow /
+     ArchivedBooking (movie, theater, seats and prices denormalized), then
+  2. deletes the live rows child-first with plain DELETE … WHERE statements.
+
+Step 2 skips Django's cascade collector and the per-row delete signals:
+they would load every row into Python only to rebuild seat bitmaps of
+shows that are about to disappear.  A batch either commits whole or not at
+all and the next run starts from whatever is still live, so an
+interrupted run is simply run again.
+
+Sales rollups (core.rollups) are not touched: the tickets were sold, and
+rollups.rebuild() counts archived bookings too.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import api_cache, scheduling
+from .models import (ArchivedBooking, ArchivedShow, Booking, Seat, SeatHold,
+                     Show, ShowPrice)
+
+BATCH_SIZE = getattr(settings, "ARCHIVE_BATCH_SIZE", 200)     # shows per transaction
+
+
+def _raw_delete(queryset):
+    # one DELETE statement – no collector, no signals
+    return queryset._raw_delete(queryset.db)
+
+
+def archive_batch(show_ids):
+    """Archive + delete the given shows. Returns (shows, bookings) archived."""
+    with transaction.atomic():
+        shows = list(Show.objects.filter(id__in=show_ids)
+                                 .select_related("movie", "theater"))
+        bookings = list(Booking.objects.filter(show_id__in=show_ids)
+                                       .select_related("user")
+                                       .order_by("id"))
+        seats = {}
+        for booking_id, seat_number in (
+                Booking.seats.through.objects
+                       .filter(booking__show_id__in=show_ids)
+                       .order_by("seat_id")
+                       .values_list("booking_id", "seat__seat_number")):
+            seats.setdefault(booking_id, []).append(seat_number)
+
+        sold, revenue = {}, {}
+        for b in bookings:
+            sold[b.show_id]    = sold.get(b.show_id, 0) + len(seats.get(b.id, ()))
+            revenue[b.show_id] = revenue.get(b.show_id, Decimal("0")) + b.total_price
+
+        # ignore_conflicts: rows left by an earlier, committed run stay as they are
+        ArchivedShow.objects.bulk_create([
+            ArchivedShow(show_id=s.id,
+                         movie_id=s.movie_id,
+                         theater_id=s.theater_id,
+                         movie_title=s.movie.title,
+                         theater_name=s.theater.name,
+                         theater_city=s.theater.city,
+                         show_time=s.show_time,
+                         seats_sold=sold.get(s.id, 0),
+                         revenue=revenue.get(s.id, Decimal("0")))
+            for s in shows
+        ], ignore_conflicts=True)
+        archived = dict(ArchivedShow.objects.filter(show_id__in=show_ids)
+                                            .values_list("show_id", "id"))
+        ArchivedBooking.objects.bulk_create([
+            ArchivedBooking(booking_id=b.id,
+                            show_id=archived[b.show_id],
+                            user_id=b.user_id,
+                            username=b.user.username,
+                            seats=seats.get(b.id, []),
+                            total_price=b.total_price,
+                            price_breakdown=b.price_breakdown,
+                            booking_time=b.booking_time)
+            for b in bookings
+        ], ignore_conflicts=True)
+
+        # child tables first so no FK is left dangling
+        _raw_delete(SeatHold.objects.filter(show_id__in=show_ids))
+        _raw_delete(Booking.seats.through.objects.filter(booking__show_id__in=show_ids))
+        _raw_delete(Booking.objects.filter(show_id__in=show_ids))
+        _raw_delete(Seat.objects.filter(show_id__in=show_ids))
+        _raw_delete(ShowPrice.objects.filter(show_id__in=show_ids))
+        _raw_delete(Show.objects.filter(id__in=show_ids))
+
+    # no delete signals fired → invalidate the widget's JSON ourselves
+    api_cache.bump(*{f"theater:{s.theater_id}" for s in shows})
+    return len(shows), len(bookings)
+
+
+def archive(before=None, batch_size=BATCH_SIZE, progress=None):
+    """
+    Archive every show that started before local date `before` (default:
+    today).  `progress(shows_done, bookings_done, total_shows)` is called
+    after each batch.  Returns (shows, bookings) archived.
+    """
+    expired = scheduling.shows_before(before or timezone.localdate())
+    total   = expired.count()
+    shows_done = bookings_done = 0
+    while True:
+        ids = list(expired.order_by("show_time", "id")
+                          .values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        shows, bookings = archive_batch(ids)
+        shows_done    += shows
+        bookings_done += bookings
+        if progress:
+            progress(shows_done, bookings_done, total)
+    return shows_done, bookings_done
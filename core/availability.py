@@ -0,0 +1,145 @@
+# core/availability.py
+"""
+Compact per-show seat availability index.
+
+Every Show carries a ``seat_bitmap``: one bit per seat of its layout's
+seat plan (bit set ⟹ seat booked).  The bitmap is kept up to date by the
+booking signals in ``core.signals`` so the booking page can build the seat
+map for every show from the Show rows alone – no per-show Seat / Booking
+queries.  Show.booked_count is rewritten in the same UPDATE, so "how full
+is it" needs neither the bitmap nor the seat plan.
+
+The booking page fetches one show's map at a time from compact_seat_map():
+the layout rows plus the bitmap (with held seats set too) in base64 – a
+few hundred bytes for any auditorium, however many shows the movie has.
+"""
+import base64
+
+from django.db import transaction
+from django.db.models import F
+
+from . import layouts
+from .models import Booking, Show
+from .scheduling import day_bounds
+
+
+# ─────────────────────────────────────
+#  bitmap helpers
+# ─────────────────────────────────────
+def pack(plan, seat_numbers):
+    """Seat labels → bitmap bytes (labels not in the plan are ignored)."""
+    bits = bytearray((len(plan) + 7) // 8)
+    for label in seat_numbers:
+        i = plan.index.get(label)
+        if i is not None:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def unpack(plan, bitmap):
+    """Bitmap bytes → list of booked seat labels (plan order)."""
+    bitmap = bytes(bitmap or b"")
+    return [label for i, label in enumerate(plan.seat_numbers)
+            if i >> 3 < len(bitmap) and bitmap[i >> 3] & (1 << (i & 7))]
+
+
+def count(bitmap):
+    """Number of booked seats in a bitmap."""
+    return int.from_bytes(bytes(bitmap or b""), "little").bit_count()
+
+
+def _merge(plan, bitmap, seat_numbers):
+    bits = bytearray(pack(plan, seat_numbers))
+    for i, byte in enumerate(bytes(bitmap or b"")[:len(bits)]):
+        bits[i] |= byte
+    return bytes(bits)
+
+
+# ─────────────────────────────────────
+#  index maintenance
+# ─────────────────────────────────────
+def mark_booked(show_id, seat_numbers):
+    """Set the bits for freshly booked seats."""
+    with transaction.atomic():
+        row = (Show.objects.select_for_update()
+                           .filter(pk=show_id)
+                           .values_list("seat_bitmap", "layout_id")
+                           .first())
+        if row is None:
+            return
+        current, layout_id = row
+        bitmap = _merge(layouts.plan(layout_id), current, seat_numbers)
+        Show.objects.filter(pk=show_id).update(seat_bitmap=bitmap,
+                                               booked_count=count(bitmap))
+
+
+def rebuild(show_id):
+    """
+    Recompute one show's bitmap from its bookings.
+    Used whenever seats are released, since a seat may still be held
+    by another booking.
+    """
+    layout_id = (Show.objects.filter(pk=show_id)
+                             .values_list("layout_id", flat=True).first())
+    if layout_id is None:
+        return
+    booked = (Booking.objects.filter(show_id=show_id)
+                             .values_list("seats__seat_number", flat=True))
+    bitmap = pack(layouts.plan(layout_id), booked)
+    Show.objects.filter(pk=show_id).update(seat_bitmap=bitmap,
+                                           booked_count=count(bitmap))
+
+
+# ─────────────────────────────────────
+#  read side
+# ─────────────────────────────────────
+def compact_seat_map(show, held=()):
+    """
+    {"show": id, "rows": [{"row", "seats", "class", "color"}, …],
+     "taken": base64 bitmap}  – bit i (byte i >> 3, bit i & 7) is the i-th
+    seat of the rows in order (A1…An, B1…), set ⟹ booked or `held`.
+    """
+    plan = layouts.plan(show.layout_id)
+    return {
+        "show":  show.id,
+        "rows":  plan.rows,
+        "taken": base64.b64encode(_merge(plan, show.seat_bitmap, held)).decode(),
+    }
+
+
+def seat_map_for(shows, held=None):
+    """
+    {show_id: {"available": [...all seats...], "booked": [...],
+               "rows": [{"row", "seats", "class", "color"}, …]}}
+    built from already-loaded Show rows.  `held` ({show_id: [seats]})
+    marks seats in someone's checkout as taken too.
+    """
+    held = held or {}
+    layouts.load({show.layout_id for show in shows})
+    seat_map = {}
+    for show in shows:
+        plan   = layouts.plan(show.layout_id)
+        booked = set(unpack(plan, show.seat_bitmap)) | set(held.get(show.id, ()))
+        seat_map[show.id] = {
+            "available": plan.seat_numbers,
+            "booked":    [s for s in plan.seat_numbers if s in booked],
+            "rows":      plan.rows,
+        }
+    return seat_map
+
+
+def city_overview(city, day):
+    """
+    Every show in `city` on local date `day` with its seats left, in one
+    query over the Show counters:
+        [{"id", "movie_id", "title", "theater_name", "show_time",
+          "capacity", "seats_left"}, …]   (by show time, then theater)
+    """
+    start, end = day_bounds(day)
+    return list(Show.objects
+                .filter(theater__city=city, show_time__gte=start, show_time__lt=end)
+                .order_by("show_time", "theater__name", "movie__title")
+                .values("id", "movie_id", "show_time", "capacity",
+                        title=F("movie__title"),
+                        theater_name=F("theater__name"),
+                        seats_left=F("capacity") - F("booked_count")))
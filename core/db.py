@@ -0,0 +1,49 @@
+# core/db.py
+"""
+Write-path helpers for the SQLite database.
+
+settings.DATABASES already makes every atomic() block a
+`BEGIN IMMEDIATE` transaction (the write lock is taken up front, so two
+bookings can't both read and then fail to upgrade) and gives SQLite a busy
+timeout to wait out short write bursts.  When a burst outlasts that
+timeout SQLite raises "database is locked"; retry_locked() runs the whole
+transaction again a few times with jittered exponential backoff before
+giving up with DatabaseBusy, which the views turn into a friendly message.
+"""
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection
+
+LOCK_RETRIES = getattr(settings, "DB_LOCK_RETRIES", 3)
+LOCK_BACKOFF = getattr(settings, "DB_LOCK_BACKOFF", 0.05)     # seconds, doubled per try
+
+
+class DatabaseBusy(Exception):
+    """The write still hit a locked database after every retry."""
+
+
+def is_locked(exc):
+    return isinstance(exc, OperationalError) and "locked" in str(exc)
+
+
+def retry_locked(func):
+    """
+    Re-run `func` (which must own its transaction) when SQLite reports a
+    lock.  Inside an outer atomic() block a retry can't help – the outer
+    transaction is already broken – so the error is passed straight on.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if not is_locked(exc) or connection.in_atomic_block:
+                    raise
+                if attempt == LOCK_RETRIES:
+                    raise DatabaseBusy(str(exc)) from exc
+            time.sleep(LOCK_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+    return wrapper
@@ -0,0 +1,125 @@
+# core/exports.py
+"""
+Booking export for reporting, as CSV or NDJSON, in constant memory.
+
+Bookings are walked in id order with iterator(chunk_size=CHUNK_SIZE): one
+streaming query over the bookings (user, show, movie and theater joined
+in, exported columns only), read CHUNK_SIZE rows at a time, plus one
+batched prefetch of seats and seat classes per chunk.  Each chunk is
+turned into text and dropped before the next one is read.  Prices come
+from what the booking recorded at checkout (total_price and
+price_breakdown, see core.pricing.quote), so no price lookups are needed.
+
+Used by `manage.py export_bookings` and the staff-only
+core.views.export_bookings endpoint.  Under ASGI the endpoint streams
+alines(), which advances the same generator on the request's sync thread
+one chunk at a time – Django would otherwise list() a sync iterator, i.e.
+hold the whole export in memory.
+"""
+import csv
+import json
+from itertools import islice
+from collections import Counter
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from .models import Booking, Seat
+from .scheduling import day_bounds
+
+CHUNK_SIZE = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+FORMATS    = ("csv", "ndjson")
+FIELDS     = ["booking_id", "booking_time", "user", "movie", "theater", "city",
+              "show_id", "show_time", "seats", "seat_classes", "total_price",
+              "price_breakdown"]
+
+
+def parse_day(value):
+    """'YYYY-MM-DD' → date, '' / None → None; ValueError otherwise."""
+    return date.fromisoformat(value) if value else None
+
+
+def bookings(start=None, end=None, theater=None, movie=None):
+    """
+    Bookings made between local days `start` and `end` (both inclusive,
+    either may be None), optionally for one theater / movie id.
+    """
+    qs = Booking.objects.all()
+    if start:
+        qs = qs.filter(booking_time__gte=day_bounds(start)[0])
+    if end:
+        qs = qs.filter(booking_time__lt=day_bounds(end)[1])
+    if theater:
+        qs = qs.filter(show__theater_id=theater)
+    if movie:
+        qs = qs.filter(show__movie_id=movie)
+    # only the exported columns – no seat bitmaps, password hashes, posters …
+    seats = (Seat.objects.select_related("seat_class")
+                         .only("seat_number", "seat_class__name")
+                         .order_by("id"))
+    return (qs.select_related("user", "show__movie", "show__theater")
+              .only("booking_time", "total_price", "price_breakdown", "user__username",
+                    "show__show_time", "show__movie__title",
+                    "show__theater__name", "show__theater__city")
+              .prefetch_related(Prefetch("seats", queryset=seats))
+              .order_by("id"))
+
+
+def rows(queryset, chunk_size=CHUNK_SIZE):
+    """One dict per booking (keys: FIELDS), read `chunk_size` at a time."""
+    for booking in queryset.iterator(chunk_size=chunk_size):
+        show, seats = booking.show, booking.seats.all()
+        classes     = Counter(seat.seat_class.name for seat in seats)
+        yield {
+            "booking_id":      booking.id,
+            "booking_time":    booking.booking_time,
+            "user":            booking.user.username,
+            "movie":           show.movie.title,
+            "theater":         show.theater.name,
+            "city":            show.theater.city,
+            "show_id":         show.id,
+            "show_time":       show.show_time,
+            "seats":           " ".join(seat.seat_number for seat in seats),
+            "seat_classes":    " ".join(f"{name}×{n}" for name, n in sorted(classes.items())),
+            "total_price":     booking.total_price,
+            "price_breakdown": booking.price_breakdown,
+        }
+
+
+# ─────────────────────────────────────
+#  encoders – generators of text lines
+# ─────────────────────────────────────
+class _Line:
+    """File-like object for csv.writer: write() hands the line back."""
+    def write(self, value):
+        return value
+
+
+def csv_lines(queryset, chunk_size=CHUNK_SIZE):
+    writer = csv.writer(_Line())
+    yield writer.writerow(FIELDS)
+    for row in rows(queryset, chunk_size):
+        row["booking_time"]    = row["booking_time"].isoformat()
+        row["show_time"]       = row["show_time"].isoformat()
+        row["price_breakdown"] = json.dumps(row["price_breakdown"], sort_keys=True)
+        yield writer.writerow([row[field] for field in FIELDS])
+
+
+def ndjson_lines(queryset, chunk_size=CHUNK_SIZE):
+    for row in rows(queryset, chunk_size):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def lines(fmt, queryset, chunk_size=CHUNK_SIZE):
+    return {"csv": csv_lines, "ndjson": ndjson_lines}[fmt](queryset, chunk_size)
+
+
+async def alines(fmt, queryset, chunk_size=CHUNK_SIZE):
+    """lines() as an async iterator: one chunk of lines per sync_to_async hop."""
+    source = lines(fmt, queryset, chunk_size)
+    take   = sync_to_async(lambda: list(islice(source, chunk_size)))
+    while part := await take():
+        yield "".join(part)
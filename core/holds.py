@@ -0,0 +1,134 @@
+# core/holds.py
+"""
+Seat holds for the checkout flow.
+
+book_movie  → claim()    : insert one SeatHold per seat with an expiry
+payment     → confirm()  : turn the user's live holds into a Booking
+sweep       → release_expired() / `manage.py release_expired_holds`
+
+Concurrency is handled by the unique (show, seat_number) constraint and
+conditional UPDATE/DELETEs – no table-wide lock – so buyers picking
+different seats of the same show never conflict.  SQLite still serializes
+the writes themselves; claim() and confirm() retry when it reports a lock
+(see core.db).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import api_cache, db, layouts, live, pricing, rollups
+from .models import Booking, SeatHold
+
+HOLD_MINUTES = getattr(settings, "SEAT_HOLD_MINUTES", 10)
+
+
+class SeatUnavailable(Exception):
+    """Some of the requested seats are held or sold by someone else."""
+
+    def __init__(self, seat_numbers):
+        self.seat_numbers = list(seat_numbers)
+        super().__init__(", ".join(self.seat_numbers))
+
+
+class InvalidSelection(ValueError):
+    """Nothing was picked, or some picks aren't seats of the show's layout."""
+
+    def __init__(self, seat_numbers=()):
+        self.seat_numbers = list(seat_numbers)
+        super().__init__(", ".join(self.seat_numbers))
+
+
+class HoldExpired(Exception):
+    """The user's holds lapsed (or were taken over) before payment."""
+
+
+@db.retry_locked
+def claim(user, show, seat_numbers):
+    """
+    Hold `seat_numbers` of `show` for `user`.
+    Returns the hold expiry; raises InvalidSelection for an empty pick or
+    unknown seat labels, SeatUnavailable if any seat is taken (or
+    db.DatabaseBusy if the database stayed locked).
+    """
+    plan    = layouts.plan(show.layout_id)
+    unknown = [s for s in seat_numbers if s not in plan]
+    if unknown or not seat_numbers:
+        raise InvalidSelection(unknown)
+    seat_numbers = plan.order(set(seat_numbers))
+
+    now        = timezone.now()
+    expires_at = now + timedelta(minutes=HOLD_MINUTES)
+
+    with transaction.atomic():
+        # the user's previous, unpaid picks for this show are replaced
+        SeatHold.objects.filter(show=show, user=user,
+                                booking__isnull=True).delete()
+        # lapsed holds on the wanted seats are fair game
+        SeatHold.objects.filter(show=show,
+                                seat_number__in=seat_numbers,
+                                booking__isnull=True,
+                                expires_at__lte=now).delete()
+        try:
+            with transaction.atomic():
+                SeatHold.objects.bulk_create([
+                    SeatHold(show=show, seat_number=s,
+                             user=user, expires_at=expires_at)
+                    for s in seat_numbers
+                ])
+        except IntegrityError:
+            taken = (SeatHold.objects.filter(show=show,
+                                             seat_number__in=seat_numbers)
+                                     .values_list("seat_number", flat=True))
+            raise SeatUnavailable(plan.order(taken))
+
+        transaction.on_commit(lambda: live.publish(show.id, taken=seat_numbers))
+        transaction.on_commit(lambda: api_cache.bump(f"seats:{show.id}"))
+    return expires_at
+
+
+@db.retry_locked
+def confirm(user, movie, show, seat_numbers):
+    """
+    Convert the user's live holds into a priced Booking.
+    Raises HoldExpired (and writes nothing) if any hold is gone, or
+    db.DatabaseBusy if the database stayed locked.
+    """
+    now = timezone.now()
+    total, breakdown = pricing.quote(show, seat_numbers)
+    with transaction.atomic():
+        booking = Booking.objects.create(user=user, movie=movie, show=show,
+                                         total_price=total,
+                                         price_breakdown=breakdown)
+        sold = (SeatHold.objects
+                .filter(show=show, user=user,
+                        seat_number__in=seat_numbers,
+                        booking__isnull=True,
+                        expires_at__gt=now)
+                .update(booking=booking, expires_at=None))
+        if sold != len(set(seat_numbers)):
+            raise HoldExpired()
+
+        booking.seats.set(layouts.materialize(show, seat_numbers))
+        rollups.record(booking)
+    return booking
+
+
+def active_holds(shows):
+    """{show_id: [seat_number, …]} for unexpired, unpaid holds."""
+    held = {}
+    for show_id, seat_number in (SeatHold.objects
+                                 .filter(show__in=shows,
+                                         booking__isnull=True,
+                                         expires_at__gt=timezone.now())
+                                 .values_list("show_id", "seat_number")):
+        held.setdefault(show_id, []).append(seat_number)
+    return held
+
+
+def release_expired():
+    """Delete every lapsed, unpaid hold. Returns how many were freed."""
+    count, _ = SeatHold.objects.filter(booking__isnull=True,
+                                       expires_at__lte=timezone.now()).delete()
+    return count
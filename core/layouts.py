@@ -0,0 +1,99 @@
+# core/layouts.py
+"""
+Seat plans derived from SeatLayout rows.
+
+A plan is the flattened, ordered seat list of a layout (A1…A10, B1…) with
+each seat's class.  Plans are cached per process and shared by every show
+on that layout; seat bitmaps index into plan.seat_numbers.
+
+Each cached plan is stamped with the api_cache versions of its layout and
+of "layouts" (all of them), which forget() bumps when rows or seat classes
+are edited (core.signals), so every worker rebuilds on its next use.  That
+needs a shared cache; with a per-process one, plans are also rebuilt every
+LOCAL_PLAN_SECONDS.
+"""
+import time
+
+from django.conf import settings
+
+from . import api_cache
+from .models import LayoutRow, Seat
+
+LOCAL_PLAN_SECONDS = getattr(settings, "LOCAL_PLAN_SECONDS", 30)
+
+_plans = {}                 # layout_id: (stamp, SeatPlan)
+
+
+class SeatPlan:
+    def __init__(self, rows):
+        # rows: [(label, seat_count, seat_class_id, class_name, color), …]
+        self.rows         = [{"row": label, "seats": count,
+                              "class": class_name, "color": color}
+                             for label, count, _, class_name, color in rows]
+        self.seat_numbers = [f"{label}{num}"
+                             for label, count, *_ in rows
+                             for num in range(1, count + 1)]
+        self.index        = {s: i for i, s in enumerate(self.seat_numbers)}
+        self.seat_class   = {f"{label}{num}": class_id
+                             for label, count, class_id, *_ in rows
+                             for num in range(1, count + 1)}
+
+    def __len__(self):
+        return len(self.seat_numbers)
+
+    def __contains__(self, seat_number):
+        return seat_number in self.index
+
+    def order(self, seat_numbers):
+        """Sort seat labels front-to-back; unknown labels first."""
+        return sorted(seat_numbers, key=lambda s: self.index.get(s, -1))
+
+
+def _stamps(layout_ids):
+    """{layout_id: what its cached plan must still match}."""
+    found = api_cache.versions("layouts", *(f"layout:{i}" for i in layout_ids))
+    slot  = None if api_cache.shared() else int(time.monotonic() // LOCAL_PLAN_SECONDS)
+    return {i: (found[0], version, slot) for i, version in zip(layout_ids, found[1:])}
+
+
+def plan(layout_id):
+    """The (cached) SeatPlan for one layout."""
+    load([layout_id])
+    return _plans[layout_id][1]
+
+
+def load(layout_ids):
+    """Build and cache the plans of `layout_ids` that are missing or stale – one query."""
+    stamps  = _stamps(list(set(layout_ids)))
+    missing = {i for i, stamp in stamps.items() if _plans.get(i, (None,))[0] != stamp}
+    if not missing:
+        return
+    rows = {layout_id: [] for layout_id in missing}
+    for layout_id, *row in (LayoutRow.objects
+                            .filter(layout_id__in=missing)
+                            .order_by("layout_id", "position", "id")
+                            .values_list("layout_id", "label", "seat_count",
+                                         "seat_class_id", "seat_class__name",
+                                         "seat_class__color")):
+        rows[layout_id].append(row)
+    for layout_id, layout_rows in rows.items():
+        _plans[layout_id] = (stamps[layout_id], SeatPlan(layout_rows))
+
+
+def forget(layout_id=None):
+    """Mark one layout's plan (or every plan) stale – in every worker, given a shared cache."""
+    api_cache.bump(f"layout:{layout_id}" if layout_id is not None else "layouts")
+
+
+def materialize(show, seat_numbers):
+    """
+    Create the Seat rows for `seat_numbers` of `show` (only booked seats
+    ever get a row) and return them.
+    """
+    seat_plan = plan(show.layout_id)
+    Seat.objects.bulk_create(
+        [Seat(show=show, seat_number=s, seat_class_id=seat_plan.seat_class[s])
+         for s in seat_numbers if s in seat_plan],
+        ignore_conflicts=True,
+    )
+    return Seat.objects.filter(show=show, seat_number__in=seat_numbers)
@@ -0,0 +1,118 @@
+# core/live.py
+"""
+Live seat-availability push (server-sent events).
+
+One ShowBroadcaster per show fans every seat change out to all the booking
+pages watching that show, so an open page costs a single subscription
+instead of repeated full renders.  Publishers are ordinary sync code
+(core.holds / core.signals); subscribers are async SSE streams on the ASGI
+event loop.
+
+The broadcaster lives in this process only – run the ASGI app as a single
+process per host (or put a shared pub/sub in front of publish()).
+"""
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+
+HEARTBEAT = 15          # seconds between keep-alive comments
+QUEUE_SIZE = 256        # per subscriber; overflow ⟹ resend a snapshot
+
+
+class _Subscriber:
+    def __init__(self, loop):
+        self.loop     = loop
+        self.queue    = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflow = False
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflow = True
+
+
+class ShowBroadcaster:
+    """Subscribers of one show. Guarded by the module-level _lock."""
+
+    def __init__(self):
+        self.subscribers = set()
+
+    def publish(self, event):
+        for sub in self.subscribers:
+            sub.loop.call_soon_threadsafe(sub.push, event)
+
+
+_broadcasters = {}              # show_id → ShowBroadcaster
+_lock = threading.Lock()
+
+
+def _subscribe(show_id):
+    sub = _Subscriber(asyncio.get_running_loop())
+    with _lock:
+        _broadcasters.setdefault(show_id, ShowBroadcaster()).subscribers.add(sub)
+    return sub
+
+
+def _unsubscribe(show_id, sub):
+    with _lock:
+        broadcaster = _broadcasters.get(show_id)
+        if broadcaster:
+            broadcaster.subscribers.discard(sub)
+            if not broadcaster.subscribers:
+                del _broadcasters[show_id]
+
+
+def publish(show_id, taken=(), released=()):
+    """Tell every page watching `show_id` which seats changed state."""
+    if not (taken or released):
+        return
+    event = {"taken": list(taken), "released": list(released)}
+    with _lock:
+        broadcaster = _broadcasters.get(show_id)
+        if broadcaster:
+            broadcaster.publish(event)
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _snapshot(show_id):
+    from . import availability, holds
+    from .models import Show
+
+    shows = list(Show.objects.filter(pk=show_id))
+    if not shows:
+        return {"booked": []}
+    seat_map = availability.seat_map_for(shows, holds.active_holds(shows))
+    return {"booked": seat_map[show_id]["booked"]}
+
+
+async def stream(show_id):
+    """Async SSE body: a snapshot, then deltas as seats are taken/released."""
+    sub = _subscribe(show_id)
+    try:
+        yield _sse("snapshot", await sync_to_async(_snapshot)(show_id))
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if sub.overflow:                # fell behind – start over
+                sub.overflow = False
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                yield _sse("snapshot", await sync_to_async(_snapshot)(show_id))
+                continue
+            yield _sse("delta", event)
+    finally:
+        _unsubscribe(show_id, sub)
+
+
+def snapshot_once(show_id):
+    """WSGI fallback: one snapshot, then let EventSource reconnect later."""
+    return "retry: 5000\n" + _sse("snapshot", _snapshot(show_id))
@@ -0,0 +1,36 @@
+# core/management/commands/archive_shows.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import archive
+
+
+class Command(BaseCommand):
+    help = ("Move shows that started before a date (default: today) and their "
+            "bookings into the archive tables, in batches.  Safe to interrupt "
+            "and re-run – it picks up where it stopped.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", help="Cut-off day, YYYY-MM-DD (default: today).")
+        parser.add_argument("--batch-size", type=int, default=archive.BATCH_SIZE,
+                            help="Shows per transaction (default: %(default)s).")
+
+    def handle(self, *args, **options):
+        before = None
+        if options["before"]:
+            try:
+                before = date.fromisoformat(options["before"])
+            except ValueError:
+                raise CommandError("--before must look like YYYY-MM-DD")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        def progress(shows, bookings, total):
+            self.stdout.write(f"  {shows}/{total} show(s), {bookings} booking(s) archived")
+
+        shows, bookings = archive.archive(before=before,
+                                          batch_size=options["batch_size"],
+                                          progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"{shows} show(s) and {bookings} booking(s) archived."))
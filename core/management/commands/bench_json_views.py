@@ -0,0 +1,192 @@
+# core/management/commands/bench_json_views.py
+"""
+Requests/second and latency of the booking widget's JSON views, served
+three ways through Django's real WSGI / ASGI handler with the full
+middleware stack (only the network is left out):
+
+  wsgi       sync views, one thread per in-flight request
+  asgi-sync  sync views under ASGI, each hopping to the thread pool
+  asgi       async views on the event loop
+
+Each mode runs in its own child process, because the URLconf picks the
+sync or async views at import time (settings.ASYNC_JSON_VIEWS).  Runs
+against the configured database – read-only – so point it at a copy of
+production data for meaningful numbers.
+"""
+import asyncio
+import io
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import reverse
+
+from core.models import Show
+
+MODES = ("wsgi", "asgi-sync", "asgi")
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = "Compare the JSON views under WSGI, ASGI with sync views and ASGI with async views."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=MODES + ("all",), default="all",
+                            help="One deployment mode, or all of them (default).")
+        parser.add_argument("--requests", type=int, default=2000,
+                            help="Requests per mode (default: %(default)s).")
+        parser.add_argument("--concurrency", type=int, default=32,
+                            help="Requests in flight (default: %(default)s).")
+        parser.add_argument("--cold", action="store_true",
+                            help="Bypass the JSON cache so every request hits the database.")
+        parser.add_argument("--json", action="store_true",
+                            help="Print one JSON result line (used between processes).")
+
+    def handle(self, *args, **options):
+        if options["mode"] == "all":
+            results = [self.spawn(mode, options) for mode in MODES]
+            self.table(results)
+            return
+
+        if (options["mode"] == "asgi") != settings.ASYNC_JSON_VIEWS:
+            raise CommandError("MOVIEBOOKING_ASYNC_VIEWS must be 1 for --mode asgi and "
+                               "0 otherwise (or use --mode all)")
+
+        show = Show.objects.order_by("id").first()
+        if show is None:
+            raise CommandError("no shows in the database – generate some first")
+        urls = [reverse("get_movies", args=[show.theater_id]),
+                reverse("get_shows",  args=[show.theater_id, show.movie_id]),
+                reverse("get_prices", args=[show.id])]
+
+        caches = settings.CACHES
+        if options["cold"]:
+            caches = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+        logging.getLogger("core.queries").setLevel(logging.WARNING)
+        with override_settings(ALLOWED_HOSTS=["testserver"], CACHES=caches):
+            cache.clear()
+            run = self.run_wsgi if options["mode"] == "wsgi" else self.run_asgi
+            result = run(urls, options["requests"], options["concurrency"])
+        result["mode"] = options["mode"]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result))
+        else:
+            self.table([result])
+
+    # ─────────────────────────────────────
+    #  runners
+    # ─────────────────────────────────────
+    def run_wsgi(self, urls, total, concurrency):
+        app = get_wsgi_application()
+
+        def one(i):
+            status  = []
+            environ = {"REQUEST_METHOD": "GET", "PATH_INFO": urls[i % len(urls)],
+                       "QUERY_STRING": "", "SERVER_NAME": "testserver",
+                       "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+                       "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+                       "wsgi.url_scheme": "http"}
+            start = time.perf_counter()
+            body  = app(environ, lambda s, headers: status.append(int(s[:3])))
+            b"".join(body)
+            body.close()
+            return time.perf_counter() - start, status[0]
+
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(one, range(total)))
+        return self.summary(samples, time.perf_counter() - began)
+
+    def run_asgi(self, urls, total, concurrency):
+        app = get_asgi_application()
+
+        async def one(i):
+            path   = urls[i % len(urls)]
+            scope  = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                      "method": "GET", "scheme": "http", "path": path,
+                      "raw_path": path.encode(), "query_string": b"", "root_path": "",
+                      "headers": [(b"host", b"testserver")],
+                      "client": ("127.0.0.1", 0), "server": ("testserver", 80)}
+            status = []
+            requested = asyncio.Event()
+
+            async def receive():
+                if not requested.is_set():
+                    requested.set()
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await asyncio.Event().wait()        # never disconnects
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            start = time.perf_counter()
+            await app(scope, receive, send)
+            return time.perf_counter() - start, status[0]
+
+        async def main():
+            gate = asyncio.Semaphore(concurrency)
+
+            async def gated(i):
+                async with gate:
+                    return await one(i)
+
+            began   = time.perf_counter()
+            samples = await asyncio.gather(*(gated(i) for i in range(total)))
+            return samples, time.perf_counter() - began
+
+        samples, elapsed = asyncio.run(main())
+        return self.summary(samples, elapsed)
+
+    def summary(self, samples, elapsed):
+        timings = [t for t, _ in samples]
+        errors  = sum(1 for _, status in samples if status != 200)
+        return {
+            "requests": len(samples),
+            "errors":   errors,
+            "rps":      round(len(samples) / elapsed, 1),
+            "p50_ms":   round(statistics.median(timings) * 1000, 2),
+            "p95_ms":   round(percentile(timings, 95) * 1000, 2),
+            "p99_ms":   round(percentile(timings, 99) * 1000, 2),
+        }
+
+    # ─────────────────────────────────────
+    #  all modes
+    # ─────────────────────────────────────
+    def spawn(self, mode, options):
+        env = dict(os.environ, MOVIEBOOKING_ASYNC_VIEWS="1" if mode == "asgi" else "0")
+        cmd = [sys.executable, sys.argv[0], "bench_json_views", "--json",
+               "--mode", mode,
+               "--requests", str(options["requests"]),
+               "--concurrency", str(options["concurrency"])]
+        if options["cold"]:
+            cmd.append("--cold")
+        out = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        if out.returncode:
+            raise CommandError(f"{mode} run failed:\n{out.stderr}")
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    def table(self, results):
+        self.stdout.write(f"{'mode':<10}{'requests':>10}{'errors':>8}{'req/s':>10}"
+                          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for r in results:
+            self.stdout.write(f"{r['mode']:<10}{r['requests']:>10}{r['errors']:>8}"
+                              f"{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}"
+                              f"{r['p99_ms']:>10}")
@@ -0,0 +1,46 @@
+# core/management/commands/build_poster_variants.py
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core import posters
+from core.models import Movie
+
+
+class Command(BaseCommand):
+    help = ("Create the resized WebP/JPEG poster variants for movies that don't "
+            "have them yet (new uploads get them when saved in the admin).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4,
+                            help="Posters resized in parallel (default: %(default)s).")
+        parser.add_argument("--force", action="store_true",
+                            help="Rebuild the variant list of every movie.")
+
+    def handle(self, *args, **options):
+        movies = Movie.objects.exclude(poster="").only("id", "poster", "poster_variants")
+        if not options["force"]:
+            movies = movies.filter(poster_variants={})
+        movies = list(movies)
+
+        def build(movie):
+            # image work only – the DB writes stay on this thread
+            try:
+                return movie, posters.build_variants(movie), None
+            except Exception as exc:                 # bad image – report, keep going
+                return movie, None, exc
+
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+            for movie, variants, exc in pool.map(build, movies):
+                if not variants:
+                    failed += 1
+                    self.stderr.write(f"{movie.poster.name}: {exc or 'file not found'}")
+                    continue
+                old, movie.poster_variants = movie.poster_variants, variants
+                Movie.objects.filter(pk=movie.pk).update(poster_variants=variants)
+                posters.remove_stale(movie, old)
+                done += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{done} poster(s) processed, {failed} failed."))
@@ -0,0 +1,47 @@
+# core/management/commands/export_bookings.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core import exports
+
+
+class Command(BaseCommand):
+    help = ("Stream bookings as CSV or NDJSON to stdout (or --output), in "
+            "constant memory however many there are.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=exports.FORMATS, default="csv")
+        parser.add_argument("--from", dest="start",
+                            help="First booking day, YYYY-MM-DD (inclusive).")
+        parser.add_argument("--to", dest="end",
+                            help="Last booking day, YYYY-MM-DD (inclusive).")
+        parser.add_argument("--theater", type=int, help="Only this theater id.")
+        parser.add_argument("--movie", type=int, help="Only this movie id.")
+        parser.add_argument("--output", help="Write to this file instead of stdout.")
+        parser.add_argument("--chunk-size", type=int, default=exports.CHUNK_SIZE,
+                            help="Bookings per fetch (default: %(default)s).")
+
+    def handle(self, *args, **options):
+        try:
+            start = exports.parse_day(options["start"])
+            end   = exports.parse_day(options["end"])
+        except ValueError:
+            raise CommandError("--from / --to must look like YYYY-MM-DD")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        queryset = exports.bookings(start, end, options["theater"], options["movie"])
+        lines    = exports.lines(options["format"], queryset, options["chunk_size"])
+
+        if not options["output"]:
+            out = self.stdout
+            for line in lines:
+                out.write(line, ending="")
+            return
+
+        count = -1 if options["format"] == "csv" else 0     # minus the header
+        with open(options["output"], "w", newline="", encoding="utf-8") as out:
+            for line in lines:
+                out.write(line)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"{count} booking(s) written to {options['output']}."))
@@ -0,0 +1,27 @@
+# core/management/commands/generate_shows.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import scheduling
+
+
+class Command(BaseCommand):
+    help = ("Create any missing shows for the next N days from each theater's "
+            "show-time template (safe to run repeatedly, e.g. nightly from cron).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=scheduling.DAYS_AHEAD,
+                            help="How many days to schedule (default: %(default)s).")
+        parser.add_argument("--start", help="First day, YYYY-MM-DD (default: tomorrow).")
+
+    def handle(self, *args, **options):
+        start = None
+        if options["start"]:
+            try:
+                start = date.fromisoformat(options["start"])
+            except ValueError:
+                raise CommandError("--start must look like YYYY-MM-DD")
+
+        created = scheduling.generate(days=options["days"], start=start)
+        self.stdout.write(self.style.SUCCESS(f"{created} show(s) created."))
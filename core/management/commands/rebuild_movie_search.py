@@ -0,0 +1,13 @@
+# core/management/commands/rebuild_movie_search.py
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = ("Re-index every movie for search (needed after bulk imports, which "
+            "skip the Movie signals that keep the index current).")
+
+    def handle(self, *args, **options):
+        count = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{count} movie(s) indexed."))
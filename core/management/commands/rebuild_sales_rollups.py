@@ -0,0 +1,14 @@
+# core/management/commands/rebuild_sales_rollups.py
+from django.core.management.base import BaseCommand
+
+from core import rollups
+
+
+class Command(BaseCommand):
+    help = ("Recompute the sales rollups from every live and archived booking.  "
+            "Bookings keep them up to date on their own; run this after bulk "
+            "imports or if the dashboard ever looks off.")
+
+    def handle(self, *args, **options):
+        rows = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{rows} rollup row(s) written."))
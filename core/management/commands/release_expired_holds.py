@@ -0,0 +1,12 @@
+# core/management/commands/release_expired_holds.py
+from django.core.management.base import BaseCommand
+
+from core import holds
+
+
+class Command(BaseCommand):
+    help = "Free seat holds whose checkout window has lapsed (run from cron)."
+
+    def handle(self, *args, **options):
+        count = holds.release_expired()
+        self.stdout.write(self.style.SUCCESS(f"{count} expired seat hold(s) released."))
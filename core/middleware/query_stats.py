@@ -0,0 +1,113 @@
+# core/middleware/query_stats.py
+"""
+Per-request SQL instrumentation.
+
+Wraps the DB connection for the duration of each request and records the
+query count, total SQL time and queries that ran more than once.
+
+  QUERY_STATS = "headers" → X-DB-Queries / X-DB-Time-ms / X-DB-Duplicates headers
+  QUERY_STATS = "log"     → one JSON log line per request on the "core.queries" logger
+
+Any single query slower than QUERY_STATS_SLOW_MS is logged (warning) with
+its SQL and the view that ran it.  Settings only install the middleware
+when QUERY_STATS is set (by default: under DEBUG, as "headers").
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger("core.queries")
+
+SLOW_MS = getattr(settings, "QUERY_STATS_SLOW_MS", 100)
+
+_IN_LIST = re.compile(r"\((?:%s,\s*)+%s\)")      # IN (%s, %s, …) of any length
+
+
+def fingerprint(sql):
+    """SQL with literal lists collapsed, so 'same query, other ids' match."""
+    return _IN_LIST.sub("(…)", sql)
+
+
+class QueryStats:
+    """connection.execute_wrapper hook collecting one request's queries."""
+
+    def __init__(self):
+        self.count    = 0
+        self.total_ms = 0.0
+        self.seen     = Counter()
+        self.slow     = []                           # [(ms, sql), …]
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            self.count    += 1
+            self.total_ms += ms
+            self.seen[fingerprint(sql)] += 1
+            if ms >= SLOW_MS:
+                self.slow.append((ms, sql))
+
+    def duplicates(self):
+        return {sql: n for sql, n in self.seen.most_common() if n > 1}
+
+
+class QueryStatsMiddleware:
+    """Sync and async capable, so async views under ASGI stay on the event loop."""
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        # async ORM queries run on the request's sync thread, which has its
+        # own connection – hook that one, so look `connection` up over there
+        stats = QueryStats()
+        await sync_to_async(lambda: connection.execute_wrappers.append(stats))()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(lambda: connection.execute_wrappers.remove(stats))()
+        return self.report(request, response, stats)
+
+    def report(self, request, response, stats):
+        match = getattr(request, "resolver_match", None)
+        view  = match.view_name if match else request.path
+
+        for ms, sql in stats.slow:
+            logger.warning("slow query (%.1f ms) in %s: %s", ms, view, sql)
+
+        duplicates = stats.duplicates()
+        if getattr(settings, "QUERY_STATS", None) == "headers":
+            response["X-DB-Queries"]    = str(stats.count)
+            response["X-DB-Time-ms"]    = f"{stats.total_ms:.1f}"
+            response["X-DB-Duplicates"] = str(sum(n - 1 for n in duplicates.values()))
+        else:
+            logger.info("%s", json.dumps({
+                "view":       view,
+                "method":     request.method,
+                "status":     response.status_code,
+                "queries":    stats.count,
+                "sql_ms":     round(stats.total_ms, 1),
+                "duplicates": [{"sql": sql[:200], "count": n}
+                               for sql, n in list(duplicates.items())[:5]],
+            }))
+        return response
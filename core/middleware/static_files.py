@@ -0,0 +1,136 @@
+# core/middleware/static_files.py
+"""
+Serves STATIC_ROOT (the output of `manage.py collectstatic`, see
+core.storage) straight from the middleware stack, without a view or a
+separate web server:
+
+  • hashed names (listed in staticfiles.json) never change content, so
+    they go out as `Cache-Control: public, max-age=<1 year>, immutable`
+    and browsers stop revalidating them;
+  • anything else gets STATIC_MAX_AGE seconds plus Last-Modified, and
+    If-Modified-Since → 304;
+  • a precompressed .br / .gz sibling is sent instead of the file when
+    Accept-Encoding allows it (with Vary: Accept-Encoding).
+
+STATIC_ROOT is indexed once at startup – restart after collectstatic.
+Requests for anything not in the index fall through to the next handler,
+so runserver's own static serving keeps working in development.
+"""
+import json
+import mimetypes
+import os
+from collections import namedtuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))          # preferred first
+
+Asset = namedtuple("Asset", "path content_type mtime immutable variants")  # variants: {encoding: path}
+
+
+def index(root, manifest="staticfiles.json"):
+    """{relative url path: Asset} for every file under `root`."""
+    try:
+        with open(os.path.join(root, manifest)) as f:
+            hashed = set(json.load(f).get("paths", {}).values())
+    except (OSError, ValueError):
+        hashed = set()
+
+    assets = {}
+    for folder, _, files in os.walk(root):
+        present = set(files)
+        for name in files:
+            if name.endswith((".br", ".gz")) and name[:-3] in present:
+                continue                                # a variant, not an asset
+            path = os.path.join(folder, name)
+            rel  = os.path.relpath(path, root).replace(os.sep, "/")
+            content_type, _ = mimetypes.guess_type(name)
+            assets[rel] = Asset(
+                path         = path,
+                content_type = content_type or "application/octet-stream",
+                mtime        = int(os.stat(path).st_mtime),
+                immutable    = rel in hashed,
+                variants     = {encoding: path + suffix for encoding, suffix in ENCODINGS
+                                if name + suffix in present},
+            )
+    return assets
+
+
+def accepted(header):
+    """Content codings the client takes (q > 0) from an Accept-Encoding header."""
+    codings = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if not coding.strip():
+            continue
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        codings.add(coding.strip().lower())
+    return codings
+
+
+class StaticFilesMiddleware:
+    """Sync and async capable, like QueryStatsMiddleware."""
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix  = "/" + settings.STATIC_URL.strip("/") + "/"
+        self.max_age = getattr(settings, "STATIC_MAX_AGE", 60)
+        root = settings.STATIC_ROOT
+        self.assets = index(root) if root and os.path.isdir(root) else {}
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.serve(request) or await self.get_response(request)
+
+    def serve(self, request):
+        """The response for a static asset, or None to pass the request on."""
+        if request.method not in ("GET", "HEAD") or not request.path.startswith(self.prefix):
+            return None
+        asset = self.assets.get(request.path[len(self.prefix):])
+        if asset is None:
+            return None
+
+        if not asset.immutable and not was_modified_since(
+                request.headers.get("If-Modified-Since"), asset.mtime):
+            return HttpResponseNotModified()
+
+        path, encoding = asset.path, None
+        if asset.variants:
+            codings = accepted(request.headers.get("Accept-Encoding", ""))
+            for name, _ in ENCODINGS:
+                if name in codings and name in asset.variants:
+                    path, encoding = asset.variants[name], name
+                    break
+
+        with open(path, "rb") as f:
+            body = f.read()
+        response = HttpResponse(b"" if request.method == "HEAD" else body,
+                                content_type=asset.content_type)
+        response["Content-Length"] = str(len(body))
+        response["Last-Modified"]  = http_date(asset.mtime)
+        response["Cache-Control"]  = (IMMUTABLE if asset.immutable
+                                      else f"public, max-age={self.max_age}")
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if asset.variants:
+            response["Vary"] = "Accept-Encoding"
+        return response
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+# seat order of the A–E × 1–10 grid every show had at this point
+SEAT_INDEX = {f"{row}{num}": i for i, (row, num) in
+              enumerate((r, n) for r in "ABCDE" for n in range(1, 11))}
+
+
+def pack(seat_numbers):
+    bits = bytearray((len(SEAT_INDEX) + 7) // 8)
+    for label in seat_numbers:
+        i = SEAT_INDEX.get(label)
+        if i is not None:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def build_bitmaps(apps, schema_editor):
+    Show    = apps.get_model('core', 'Show')
+    Booking = apps.get_model('core', 'Booking')
+    booked  = {}
+    for show_id, seat_number in Booking.objects.values_list(
+            'show_id', 'seats__seat_number'):
+        booked.setdefault(show_id, []).append(seat_number)
+    for show_id, seat_numbers in booked.items():
+        Show.objects.filter(pk=show_id).update(seat_bitmap=pack(seat_numbers))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_alter_seat_seat_class'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='show',
+            name='seat_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(build_bitmaps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def hold_sold_seats(apps, schema_editor):
+    """Existing bookings keep their seats: record them as sold holds."""
+    Booking  = apps.get_model('core', 'Booking')
+    SeatHold = apps.get_model('core', 'SeatHold')
+    holds = [
+        SeatHold(show_id=show_id, seat_number=seat_number,
+                 user_id=user_id, booking_id=booking_id)
+        for booking_id, show_id, user_id, seat_number in
+        Booking.objects.exclude(seats__isnull=True)
+                       .values_list('id', 'show_id', 'user_id', 'seats__seat_number')
+    ]
+    SeatHold.objects.bulk_create(holds, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_show_seat_bitmap'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seat_number', models.CharField(max_length=10)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('booking', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='core.booking')),
+                ('show', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='core.show')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expires_at'], name='core_seatho_expires_5f95a5_idx')],
+                'constraints': [models.UniqueConstraint(fields=('show', 'seat_number'), name='unique_hold_per_show_seat')],
+            },
+        ),
+        migrations.RunPython(hold_sold_seats, migrations.RunPython.noop),
+    ]
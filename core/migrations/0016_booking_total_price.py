@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:49
+
+from django.db import migrations, models
+
+
+def price_existing_bookings(apps, schema_editor):
+    from decimal import Decimal
+
+    Booking   = apps.get_model('core', 'Booking')
+    ShowPrice = apps.get_model('core', 'ShowPrice')
+    prices = {(show_id, class_id): price for show_id, class_id, price in
+              ShowPrice.objects.values_list('show_id', 'seat_class_id', 'price')}
+
+    priced = {}
+    for booking_id, show_id, seat_number, class_id, class_name in (
+            Booking.seats.through.objects
+            .order_by('seat_id')
+            .values_list('booking_id', 'booking__show_id', 'seat__seat_number',
+                         'seat__seat_class_id', 'seat__seat_class__name')):
+        price = prices.get((show_id, class_id), Decimal('0.00'))
+        entry = priced.setdefault(booking_id, {}).setdefault(
+            class_name, {'seats': [], 'price': price, 'subtotal': Decimal('0.00')})
+        entry['seats'].append(seat_number)
+        entry['subtotal'] += price
+
+    for booking_id, classes in priced.items():
+        Booking.objects.filter(pk=booking_id).update(
+            total_price=sum(c['subtotal'] for c in classes.values()),
+            price_breakdown={
+                name: {'seats': c['seats'],
+                       'price': f"{c['price']:.2f}",
+                       'subtotal': f"{c['subtotal']:.2f}"}
+                for name, c in sorted(classes.items())
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_seathold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='price_breakdown',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.RunPython(price_existing_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_standard_layout(apps, schema_editor):
+    """
+    The old hardcoded grid (A–B Premium, C–E Regular, 10 seats a row)
+    becomes the Standard layout; unbooked per-show Seat rows go away.
+    """
+    SeatClass  = apps.get_model('core', 'SeatClass')
+    SeatLayout = apps.get_model('core', 'SeatLayout')
+    LayoutRow  = apps.get_model('core', 'LayoutRow')
+    Show       = apps.get_model('core', 'Show')
+    Seat       = apps.get_model('core', 'Seat')
+
+    premium, _ = SeatClass.objects.get_or_create(name='Premium')
+    regular, _ = SeatClass.objects.get_or_create(name='Regular')
+    standard, _ = SeatLayout.objects.get_or_create(name='Standard')
+    for position, label in enumerate("ABCDE"):
+        LayoutRow.objects.get_or_create(
+            layout=standard, label=label,
+            defaults={'seat_count': 10, 'position': position,
+                      'seat_class': premium if label in "AB" else regular})
+
+    Show.objects.filter(layout__isnull=True).update(layout=standard)
+    Seat.objects.filter(booking__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_booking_total_price'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatLayout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='show',
+            name='layout',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='core.seatlayout'),
+        ),
+        migrations.AddField(
+            model_name='theater',
+            name='layout',
+            field=models.ForeignKey(blank=True, help_text='Leave empty ⟹ the Standard layout.', null=True, on_delete=django.db.models.deletion.PROTECT, to='core.seatlayout'),
+        ),
+        migrations.CreateModel(
+            name='LayoutRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=5)),
+                ('seat_count', models.PositiveSmallIntegerField()),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('seat_class', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.seatclass')),
+                ('layout', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='core.seatlayout')),
+            ],
+            options={
+                'ordering': ['position', 'id'],
+                'unique_together': {('layout', 'label')},
+            },
+        ),
+        migrations.RunPython(create_standard_layout, migrations.RunPython.noop),
+    ]
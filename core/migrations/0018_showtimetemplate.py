@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_seat_layouts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShowTimeTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('time', models.TimeField()),
+                ('theater', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='show_times', to='core.theater')),
+            ],
+            options={
+                'ordering': ['time'],
+                'unique_together': {('theater', 'time')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_showtimetemplate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='show',
+            index=models.Index(fields=['theater', 'movie', 'show_time'], name='core_show_theater_971594_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='show',
+            index=models.Index(fields=['movie', 'show_time'], name='core_show_movie_i_4963ea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='show',
+            index=models.Index(fields=['show_time'], name='core_show_show_ti_a61467_idx'),
+        ),
+    ]
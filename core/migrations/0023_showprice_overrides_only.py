@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def drop_default_prices(apps, schema_editor):
+    """ShowPrice now only stores overrides – rows equal to the default go."""
+    ShowPrice = apps.get_model("core", "ShowPrice")
+    ShowPrice.objects.filter(price=F("seat_class__default_price")).delete()
+
+
+def restore_default_prices(apps, schema_editor):
+    ShowPrice = apps.get_model("core", "ShowPrice")
+    SeatClass = apps.get_model("core", "SeatClass")
+    Show      = apps.get_model("core", "Show")
+    classes   = list(SeatClass.objects.all())
+    for show_id in Show.objects.values_list("id", flat=True).iterator():
+        ShowPrice.objects.bulk_create(
+            [ShowPrice(show_id=show_id, seat_class=c, price=c.default_price)
+             for c in classes],
+            ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0022_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_default_prices, restore_default_prices),
+    ]
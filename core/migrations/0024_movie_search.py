@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# FTS5 index of Movie.title / description for core.search (SQLite only)
+CREATE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS core_movie_fts USING fts5(
+    title, description,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE)
+    schema_editor.execute("INSERT INTO core_movie_fts (rowid, title, description) "
+                          "SELECT id, title, description FROM core_movie")
+    schema_editor.execute("INSERT INTO core_movie_fts (core_movie_fts) VALUES ('optimize')")
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS core_movie_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0023_showprice_overrides_only"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:21
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def fill_counts(apps, schema_editor):
+    Show      = apps.get_model('core', 'Show')
+    LayoutRow = apps.get_model('core', 'LayoutRow')
+    sizes = dict(LayoutRow.objects.values('layout_id')
+                                  .annotate(n=Sum('seat_count'))
+                                  .values_list('layout_id', 'n'))
+    for layout_id, size in sizes.items():
+        Show.objects.filter(layout_id=layout_id).update(capacity=size)
+    for show_id, bitmap in Show.objects.values_list('id', 'seat_bitmap').iterator():
+        booked = int.from_bytes(bytes(bitmap or b''), 'little').bit_count()
+        if booked:
+            Show.objects.filter(pk=show_id).update(booked_count=booked)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_movie_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='show',
+            name='booked_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='show',
+            name='capacity',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_rollups(apps, schema_editor):
+    # live bookings only – older archived shows have no movie / theater id
+    from collections import defaultdict
+    from decimal import Decimal
+
+    from django.utils import timezone
+
+    Booking     = apps.get_model('core', 'Booking')
+    SalesRollup = apps.get_model('core', 'SalesRollup')
+    totals = defaultdict(lambda: [0, Decimal('0.00')])
+    for booking_time, movie_id, theater_id, breakdown in (
+            Booking.objects.values_list('booking_time', 'show__movie_id',
+                                        'show__theater_id', 'price_breakdown')
+                           .iterator(chunk_size=2000)):
+        day = timezone.localdate(booking_time)
+        for seat_class, entry in breakdown.items():
+            total = totals[day, movie_id, theater_id, seat_class]
+            total[0] += len(entry['seats'])
+            total[1] += Decimal(entry['subtotal'])
+    SalesRollup.objects.bulk_create(
+        [SalesRollup(day=day, movie_id=movie_id, theater_id=theater_id,
+                     seat_class=seat_class, tickets=tickets, revenue=revenue)
+         for (day, movie_id, theater_id, seat_class), (tickets, revenue) in totals.items()],
+        batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_show_occupancy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedshow',
+            name='movie_id',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedshow',
+            name='theater_id',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('seat_class', models.CharField(max_length=20)),
+                ('tickets', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.movie')),
+                ('theater', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.theater')),
+            ],
+            options={
+                'verbose_name': 'sales',
+                'verbose_name_plural': 'sales',
+                'indexes': [models.Index(fields=['day', 'seat_class', 'movie', 'theater', 'tickets', 'revenue'], name='sales_rollup_covering'), models.Index(fields=['theater', 'day'], name='core_salesr_theater_a0d11f_idx'), models.Index(fields=['movie', 'day'], name='core_salesr_movie_i_41d1bc_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'movie', 'theater', 'seat_class'), name='unique_sales_rollup')],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='salesrollup',
+            name='movie',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.movie'),
+        ),
+        migrations.AlterField(
+            model_name='salesrollup',
+            name='theater',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='core.theater'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+def drop_duplicate_shows(apps, schema_editor):
+    # earlier concurrent scheduler runs could insert a show twice; keep the
+    # copy with sales (else the oldest) and drop unsold extras
+    from django.db.models import Count, Exists, OuterRef
+
+    Show     = apps.get_model('core', 'Show')
+    Booking  = apps.get_model('core', 'Booking')
+    SeatHold = apps.get_model('core', 'SeatHold')
+    dupes = (Show.objects.values('movie_id', 'theater_id', 'show_time')
+                         .annotate(n=Count('id')).filter(n__gt=1))
+    for key in dupes:
+        copies = list(Show.objects.filter(movie_id=key['movie_id'],
+                                          theater_id=key['theater_id'],
+                                          show_time=key['show_time'])
+                      .annotate(sold=Exists(Booking.objects.filter(show=OuterRef('pk')))
+                                     | Exists(SeatHold.objects.filter(show=OuterRef('pk'))))
+                      .order_by('-sold', 'id'))
+        Show.objects.filter(pk__in=[c.pk for c in copies[1:] if not c.sold]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_sales_rollup_protect'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_shows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='show',
+            constraint=models.UniqueConstraint(fields=('movie', 'theater', 'show_time'), name='unique_show'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:22
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_show_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='movie_title_lower'),
+        ),
+    ]
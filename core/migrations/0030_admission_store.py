@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_movie_title_lower'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionRoom',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=64, unique=True)),
+                ('issued', models.PositiveIntegerField(default=0)),
+                ('served', models.PositiveIntegerField(default=0)),
+                ('average', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AdmissionEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=32)),
+                ('number', models.PositiveIntegerField()),
+                ('seen', models.FloatField()),
+                ('admitted_at', models.FloatField(blank=True, null=True)),
+                ('expires_at', models.FloatField(blank=True, null=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='core.admissionroom')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['room', 'expires_at', 'number'], name='core_admiss_room_id_f51ed7_idx')],
+                'constraints': [models.UniqueConstraint(fields=('room', 'token'), name='unique_admission_entry')],
+            },
+        ),
+    ]
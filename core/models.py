@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 
 class Movie(models.Model):
@@ -8,6 +9,8 @@ class Movie(models.Model):
     duration = models.IntegerField(help_text="Duration in minutes")
     release_date = models.DateField()
     poster = models.ImageField(upload_to='posters/',null=False, blank=False, default='posters/default.jpg')
+    # resized WebP/JPEG copies, filled by core.posters.build_variants()
+    poster_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     available_theaters = models.ManyToManyField(
         'Theater',
@@ -16,11 +19,30 @@ class Movie(models.Model):
                   "Select one or more ⟹ schedule ONLY in those theaters."
     )
     
+    def poster_srcset(self, ext="jpg"):
+        """'<url> 160w, <url> 320w, …' for one variant format ('' if none)."""
+        storage = self.poster.storage
+        return ", ".join(f"{storage.url(name)} {width}w"
+                         for width, name in self.poster_variants.get(ext, []))
+
+    @property
+    def poster_webp_srcset(self):
+        return self.poster_srcset("webp")
+
+    @property
+    def poster_jpg_srcset(self):
+        return self.poster_srcset("jpg")
+
     def save(self, *args, **kwargs):
         if self.trailer_link and "youtube.com/watch?v=" in self.trailer_link:
             self.trailer_link = self.trailer_link.replace("watch?v=", "embed/")
         super().save(*args, **kwargs)
 
+    class Meta:
+        indexes = [
+            # core.search's exact-title pass
+            models.Index(Lower("title"), name="movie_title_lower"),
+        ]
 
     def __str__(self):
         return self.title
@@ -28,14 +50,62 @@ class Movie(models.Model):
 class Theater(models.Model):
     name = models.CharField(max_length=100)
     city = models.CharField(max_length=100)
+    layout = models.ForeignKey(
+        'SeatLayout', on_delete=models.PROTECT, null=True, blank=True,
+        help_text="Leave empty ⟹ the Standard layout."
+    )
 
     def __str__(self):
         return f"{self.name} - {self.city}"
 
+class ShowTimeTemplate(models.Model):
+    """A daily show time for one theater (none ⟹ core.scheduling.DEFAULT_TIMES)."""
+    theater = models.ForeignKey(Theater, on_delete=models.CASCADE, related_name="show_times")
+    time    = models.TimeField()
+
+    class Meta:
+        ordering = ["time"]
+        unique_together = ('theater', 'time')
+
+    def __str__(self):
+        return f"{self.theater.name} @ {self.time:%H:%M}"
+
 class Show(models.Model):
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
     theater = models.ForeignKey(Theater, on_delete=models.CASCADE)
     show_time = models.DateTimeField()
+    # the theater's layout at scheduling time – referenced, never copied
+    layout = models.ForeignKey('SeatLayout', on_delete=models.PROTECT, null=True, blank=True)
+    # one bit per layout seat, set ⟹ booked  (maintained by core.availability)
+    seat_bitmap = models.BinaryField(default=b"", editable=False)
+    # seats in the layout / seats sold  (kept in step with the bitmap)
+    capacity     = models.PositiveIntegerField(default=0, editable=False)
+    booked_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        constraints = [
+            # concurrent scheduler runs insert with ignore_conflicts against this
+            models.UniqueConstraint(fields=["movie", "theater", "show_time"],
+                                    name="unique_show"),
+        ]
+        indexes = [
+            # schedule lookups: per theater+movie, per movie, and by date alone
+            models.Index(fields=["theater", "movie", "show_time"]),
+            models.Index(fields=["movie", "show_time"]),
+            models.Index(fields=["show_time"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.layout_id is None:
+            self.layout_id = self.theater.layout_id or SeatLayout.standard().id
+        if not self.capacity:
+            from . import layouts
+            self.capacity = len(layouts.plan(self.layout_id))
+        super().save(*args, **kwargs)
+
+    @property
+    def seats_left(self):
+        return max(self.capacity - self.booked_count, 0)
 
     def __str__(self):
         return f"{self.movie.title} at {self.theater.name} on {self.show_time}"
@@ -46,7 +116,38 @@ class SeatClass(models.Model):
     default_price = models.DecimalField(max_digits=6, decimal_places=2, default=150)
     def __str__(self): return self.name
 
+class SeatLayout(models.Model):
+    """
+    An auditorium seating plan shared by every show in the theaters using it.
+    Seat bitmaps are positional, so a layout must not change once shows use it.
+    """
+    STANDARD = "Standard"
+
+    name = models.CharField(max_length=100, unique=True)
+
+    @classmethod
+    def standard(cls):
+        return cls.objects.get(name=cls.STANDARD)
+
+    def __str__(self):
+        return self.name
+
+class LayoutRow(models.Model):
+    layout     = models.ForeignKey(SeatLayout, on_delete=models.CASCADE, related_name="rows")
+    label      = models.CharField(max_length=5)                    # A, B, … AA
+    seat_count = models.PositiveSmallIntegerField()                # seats 1…n
+    seat_class = models.ForeignKey(SeatClass, on_delete=models.PROTECT)
+    position   = models.PositiveSmallIntegerField(default=0)       # front → back
+
+    class Meta:
+        ordering = ["position", "id"]
+        unique_together = ('layout', 'label')
+
+    def __str__(self):
+        return f"{self.layout} / row {self.label} × {self.seat_count}"
+
 class Seat(models.Model):
+    # created on first booking only – the layout defines every other seat
     # show = models.ForeignKey(Show, on_delete=models.CASCADE,null=True)
     seat_number = models.CharField(max_length=10)
     show = models.ForeignKey(Show, on_delete=models.CASCADE, related_name="seats")  # 👈 important!
@@ -62,6 +163,7 @@ class Seat(models.Model):
         # return f"{self.seat_number} - {'Booked' if self.is_booked else 'Available'}"
 
 class ShowPrice(models.Model):
+    # override of seat_class.default_price for one show (no row ⟹ default)
     show        = models.ForeignKey("Show", on_delete=models.CASCADE)
     seat_class  = models.ForeignKey(SeatClass, on_delete=models.CASCADE)
     price       = models.DecimalField(max_digits=6, decimal_places=2)
@@ -76,13 +178,157 @@ class Booking(models.Model):
     show = models.ForeignKey(Show, on_delete=models.CASCADE)
     seats = models.ManyToManyField(Seat)
     booking_time = models.DateTimeField(auto_now_add=True)
+    # priced once at checkout by core.pricing.quote()
+    total_price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    price_breakdown = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        # admin changelist: date hierarchy + newest-first ordering
+        indexes = [models.Index(fields=["booking_time"])]
 
     def __str__(self):
         return f"{self.user.username} - {self.show.movie.title} - {self.booking_time}"
+
+class SeatHold(models.Model):
+    """
+    A claim on one seat of one show.
+      • booking empty, expires_at set   ⟹ temporary hold during checkout
+      • booking set,   expires_at empty ⟹ seat sold
+    The unique (show, seat_number) constraint is what stops double-booking.
+    """
+    show        = models.ForeignKey(Show, on_delete=models.CASCADE, related_name="holds")
+    seat_number = models.CharField(max_length=10)
+    user        = models.ForeignKey(User, on_delete=models.CASCADE)
+    booking     = models.ForeignKey(Booking, on_delete=models.CASCADE,
+                                    null=True, blank=True, related_name="holds")
+    expires_at  = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["show", "seat_number"],
+                                    name="unique_hold_per_show_seat"),
+        ]
+        indexes = [models.Index(fields=["expires_at"])]
+
+    def __str__(self):
+        state = "sold" if self.booking_id else f"held until {self.expires_at}"
+        return f"{self.show_id}-{self.seat_number} ({state})"
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     #mobile_number = models.CharField(max_length=15)
     email = models.EmailField()
 
     def __str__(self):
-        return self.user.username
\ No newline at end of file
+        return self.user.username
+
+# ─────────────────────────────────────
+#  archive  (written by core.archive, never edited)
+# ─────────────────────────────────────
+class ArchivedShow(models.Model):
+    """A past show, denormalized so it outlives its Movie / Theater rows."""
+    show_id      = models.PositiveIntegerField(unique=True)     # id of the live Show
+    movie_title  = models.CharField(max_length=255)
+    theater_name = models.CharField(max_length=255)
+    theater_city = models.CharField(max_length=255)
+    # ids of the live Movie / Theater, for rebuilding SalesRollup (may be gone)
+    movie_id     = models.PositiveIntegerField(null=True, blank=True)
+    theater_id   = models.PositiveIntegerField(null=True, blank=True)
+    show_time    = models.DateTimeField(db_index=True)
+    seats_sold   = models.PositiveIntegerField(default=0)
+    revenue      = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    archived_at  = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-show_time"]
+
+    def __str__(self):
+        return f"{self.movie_title} at {self.theater_name} on {self.show_time}"
+
+
+class ArchivedBooking(models.Model):
+    """One booking of an ArchivedShow; seats and prices as sold."""
+    booking_id      = models.PositiveIntegerField(unique=True)  # id of the live Booking
+    show            = models.ForeignKey(ArchivedShow, on_delete=models.CASCADE,
+                                        related_name="bookings")
+    user            = models.ForeignKey(User, on_delete=models.SET_NULL,
+                                        null=True, blank=True)
+    username        = models.CharField(max_length=150)
+    seats           = models.JSONField(default=list)            # ["A1", "A2", …]
+    total_price     = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    price_breakdown = models.JSONField(default=dict, blank=True)
+    booking_time    = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.username} - {self.show.movie_title} - {self.booking_time}"
+
+
+# ─────────────────────────────────────
+#  sales rollups  (written by core.rollups)
+# ─────────────────────────────────────
+class SalesRollup(models.Model):
+    """
+    Tickets and revenue per local booking day × movie × theater × seat
+    class, kept in step with bookings by core.rollups.
+    """
+    day        = models.DateField()
+    movie      = models.ForeignKey(Movie, on_delete=models.PROTECT)     # sales history outlives
+    theater    = models.ForeignKey(Theater, on_delete=models.PROTECT)   # neither by accident
+    seat_class = models.CharField(max_length=20)        # SeatClass name, as priced
+    tickets    = models.PositiveIntegerField(default=0)
+    revenue    = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name        = "sales"
+        verbose_name_plural = "sales"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "movie", "theater", "seat_class"],
+                                    name="unique_sales_rollup"),
+        ]
+        indexes = [
+            # dashboard over a day range: every column, so SQLite never reads the table
+            models.Index(fields=["day", "seat_class", "movie", "theater", "tickets", "revenue"],
+                         name="sales_rollup_covering"),
+            # … and for one theater / movie
+            models.Index(fields=["theater", "day"]),
+            models.Index(fields=["movie", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.day} / {self.movie_id} / {self.theater_id} / {self.seat_class}"
+
+
+# ─────────────────────────────────────
+#  waiting room  (core.admission.DatabaseStore)
+# ─────────────────────────────────────
+class AdmissionRoom(models.Model):
+    """Queue counters for one admission scope ("movie:<id>")."""
+    scope   = models.CharField(max_length=64, unique=True)
+    issued  = models.PositiveIntegerField(default=0)    # ticket numbers handed out …
+    served  = models.PositiveIntegerField(default=0)    # … and the last one admitted
+    average = models.FloatField(null=True, blank=True)  # seconds a checkout takes
+
+    def __str__(self):
+        return self.scope
+
+
+class AdmissionEntry(models.Model):
+    """A session in a room: waiting (expires_at unset) or holding a slot."""
+    room        = models.ForeignKey(AdmissionRoom, on_delete=models.CASCADE,
+                                    related_name="entries")
+    token       = models.CharField(max_length=32)
+    number      = models.PositiveIntegerField()         # place in the queue
+    seen        = models.FloatField()                   # time.time() of the last poll
+    admitted_at = models.FloatField(null=True, blank=True)
+    expires_at  = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["room", "token"], name="unique_admission_entry"),
+        ]
+        indexes = [
+            models.Index(fields=["room", "expires_at", "number"]),
+        ]
+
+    def __str__(self):
+        return f"{self.room} / {self.token}"
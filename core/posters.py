@@ -0,0 +1,83 @@
+# core/posters.py
+"""
+Resized poster variants for the home page.
+
+build_variants() turns a Movie.poster into a handful of widths in WebP and
+JPEG, stored next to the original as
+
+    posters/<name>.<content-hash>.<width>w.<ext>
+
+Because the name changes whenever the image does, the files can be served
+with far-future, immutable cache headers (serve_media under DEBUG, the web
+server in production – see MEDIA_ROOT in settings).  The result is recorded
+in Movie.poster_variants so templates can emit srcset without touching disk;
+remove_stale() deletes the files a rebuilt list no longer names.
+"""
+import hashlib
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .models import Movie
+
+WIDTHS  = getattr(settings, "POSTER_WIDTHS", [160, 320, 640])
+QUALITY = 80
+FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+
+
+def variant_name(poster_name, digest, width, ext):
+    stem = os.path.splitext(poster_name)[0]
+    return f"{stem}.{digest}.{width}w.{ext}"
+
+
+def build_variants(movie):
+    """
+    Render every missing variant of `movie.poster`.
+    Returns {"webp": [[width, name], …], "jpg": […]} (smallest first), or
+    {} when the poster file is missing.
+    """
+    storage = movie.poster.storage
+    name    = movie.poster.name
+    try:
+        with storage.open(name, "rb") as f:
+            original = f.read()
+    except FileNotFoundError:
+        return {}
+
+    digest = hashlib.sha256(original).hexdigest()[:12]
+    image  = ImageOps.exif_transpose(Image.open(io.BytesIO(original))).convert("RGB")
+    widths = sorted({min(w, image.width) for w in WIDTHS})
+
+    variants = {ext: [] for ext in FORMATS}
+    for width in widths:
+        resized = None
+        for ext, fmt in FORMATS.items():
+            target = variant_name(name, digest, width, ext)
+            if not storage.exists(target):
+                if resized is None:
+                    height  = round(image.height * width / image.width)
+                    resized = image.resize((width, height), Image.LANCZOS)
+                buf = io.BytesIO()
+                resized.save(buf, fmt, quality=QUALITY, optimize=True)
+                storage.save(target, ContentFile(buf.getvalue()))
+            variants[ext].append([width, target])
+    return variants
+
+
+def remove_stale(movie, old):
+    """
+    Delete the variant files of `old` (the movie's previous poster_variants)
+    that movie.poster_variants no longer lists – unless another movie still
+    shows that poster (e.g. the shared default one).
+    """
+    keep  = {name for entries in movie.poster_variants.values() for _, name in entries}
+    stale = {name for entries in old.values() for _, name in entries} - keep
+    stems = {name.rsplit(".", 3)[0] for name in stale}
+    used  = {stem for stem in stems
+             if Movie.objects.exclude(pk=movie.pk).filter(poster__startswith=f"{stem}.").exists()}
+    for name in stale:
+        if name.rsplit(".", 3)[0] not in used:
+            movie.poster.storage.delete(name)
@@ -0,0 +1,64 @@
+# core/pricing.py
+"""
+Single-pass pricing for a set of seats of one show.
+
+A seat costs its SeatClass.default_price unless the show has a ShowPrice
+override for that class; show_prices() resolves both in one query.
+
+quote() takes each seat's class from the show's seat plan and fetches the
+show's price for every class involved in one query, then returns the total
+plus a per-class breakdown.  Bookings store the result
+(Booking.total_price / price_breakdown) when they are created, so
+confirmation pages, PDFs and the admin never price seats again.
+"""
+from decimal import Decimal
+
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from . import layouts
+from .models import SeatClass, ShowPrice
+
+
+def show_prices(show_id):
+    """SeatClass queryset annotated with `price`: the show's override, else the default."""
+    override = ShowPrice.objects.filter(show_id=show_id, seat_class=OuterRef("pk")) \
+                                .values("price")[:1]
+    return SeatClass.objects.annotate(price=Coalesce(Subquery(override), F("default_price")))
+
+
+def quote(show, seat_numbers):
+    """
+    Returns (total, breakdown) for `seat_numbers` of `show`:
+        total     → Decimal
+        breakdown → {"Premium": {"seats": ["A1", "A2"],
+                                 "price": "200.00", "subtotal": "400.00"}, …}
+    (string amounts so the breakdown can be stored as JSON as-is)
+    """
+    plan         = layouts.plan(show.layout_id)
+    seat_numbers = plan.order(s for s in set(seat_numbers) if s in plan)
+
+    classes = {
+        class_id: (name, seat_price)
+        for class_id, name, seat_price in
+        show_prices(show.id).filter(id__in={plan.seat_class[s] for s in seat_numbers})
+                            .values_list("id", "name", "price")
+    }
+
+    total, priced = Decimal("0.00"), {}
+    for seat_number in seat_numbers:
+        name, seat_price = classes[plan.seat_class[seat_number]]
+        entry = priced.setdefault(name, {"seats": [],
+                                         "price": seat_price,
+                                         "subtotal": Decimal("0.00")})
+        entry["seats"].append(seat_number)
+        entry["subtotal"] += seat_price
+        total += seat_price
+
+    breakdown = {
+        name: {"seats":    entry["seats"],
+               "price":    f"{entry['price']:.2f}",
+               "subtotal": f"{entry['subtotal']:.2f}"}
+        for name, entry in sorted(priced.items())
+    }
+    return total, breakdown
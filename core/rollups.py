@@ -0,0 +1,162 @@
+# core/rollups.py
+"""
+Sales rollups: tickets and revenue per local booking day × movie ×
+theater × seat class, in SalesRollup.
+
+The rows are maintained incrementally from each booking's price_breakdown
+(what core.pricing.quote charged, per seat class):
+
+  • holds.confirm() calls record() inside the booking's transaction, so a
+    booking and its rollup increment commit or roll back together;
+  • deleting a live booking (admin, cascades) takes it back out again via
+    the Booking post_delete receiver in core.signals, and drops rows it
+    leaves at zero tickets;
+  • archiving a show leaves the rollups alone – the sale still happened,
+    and core.archive deletes with raw DELETEs that send no signals;
+  • a movie or theater with sales can't be deleted (PROTECT) – the
+    revenue history would go with it.
+
+rebuild() recomputes everything from live and archived bookings, for
+bulk imports or if the rows ever drift.  dashboard() is what the admin
+reads: two GROUP BYs over the rollups (answered from a covering
+index) plus the names of the movies and theaters on show.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import ArchivedBooking, Booking, Movie, SalesRollup, Theater
+
+REBUILD_CHUNK_SIZE = getattr(settings, "ROLLUP_REBUILD_CHUNK_SIZE", 2000)
+
+
+def _lines(breakdown):
+    """(seat_class, tickets, revenue) per class of a price breakdown."""
+    for seat_class, entry in breakdown.items():
+        yield seat_class, len(entry["seats"]), Decimal(entry["subtotal"])
+
+
+def add(day, movie_id, theater_id, breakdown, sign=1):
+    """Add (sign=1) or take back (sign=-1) one booking's breakdown."""
+    for seat_class, tickets, revenue in _lines(breakdown):
+        key     = dict(day=day, movie_id=movie_id, theater_id=theater_id,
+                       seat_class=seat_class)
+        changes = dict(tickets=F("tickets") + sign * tickets,
+                       revenue=F("revenue") + sign * revenue)
+        if sign < 0:
+            SalesRollup.objects.filter(**key).update(**changes)
+            SalesRollup.objects.filter(**key, tickets=0).delete()   # nothing left to PROTECT
+            continue
+        if SalesRollup.objects.filter(**key).update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                SalesRollup.objects.create(**key, tickets=tickets, revenue=revenue)
+        except IntegrityError:          # another booking created the row first
+            SalesRollup.objects.filter(**key).update(**changes)
+
+
+def record(booking):
+    """Count a new booking (call inside its transaction)."""
+    add(timezone.localdate(booking.booking_time),
+        booking.show.movie_id, booking.show.theater_id, booking.price_breakdown)
+
+
+def unrecord(booking, movie_id, theater_id):
+    """Take a deleted booking back out."""
+    add(timezone.localdate(booking.booking_time),
+        movie_id, theater_id, booking.price_breakdown, sign=-1)
+
+
+def rebuild(chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Recompute every rollup from live and archived bookings in one
+    transaction.  Archived shows whose movie or theater no longer exists
+    (or that predate ArchivedShow.movie_id) are left out.
+    Returns the number of rollup rows written.
+    """
+    totals = defaultdict(lambda: [0, Decimal("0.00")])
+
+    def count(rows):
+        for booking_time, movie_id, theater_id, breakdown in \
+                rows.iterator(chunk_size=chunk_size):
+            day = timezone.localdate(booking_time)
+            for seat_class, tickets, revenue in _lines(breakdown):
+                entry = totals[day, movie_id, theater_id, seat_class]
+                entry[0] += tickets
+                entry[1] += revenue
+
+    with transaction.atomic():
+        count(Booking.objects.values_list("booking_time", "show__movie_id",
+                                          "show__theater_id", "price_breakdown"))
+        count(ArchivedBooking.objects
+              .filter(show__movie_id__in=Movie.objects.values("id"),
+                      show__theater_id__in=Theater.objects.values("id"))
+              .values_list("booking_time", "show__movie_id",
+                           "show__theater_id", "price_breakdown"))
+
+        SalesRollup.objects.all().delete()
+        SalesRollup.objects.bulk_create(
+            (SalesRollup(day=day, movie_id=movie_id, theater_id=theater_id,
+                         seat_class=seat_class, tickets=tickets, revenue=revenue)
+             for (day, movie_id, theater_id, seat_class), (tickets, revenue)
+             in totals.items()),
+            batch_size=1000)
+    return len(totals)
+
+
+# ─────────────────────────────────────
+#  dashboard
+# ─────────────────────────────────────
+def dashboard(start, end, theater=None, movie=None, top=50):
+    """
+    Sales between local days `start` and `end` (inclusive), optionally for
+    one theater / movie id:
+        {"totals":   {"total_tickets", "total_revenue"},
+         "by_day":   [{"day", "total_tickets", "total_revenue"}, …],
+         "by_class": [{"seat_class", "total_tickets", "total_revenue"}, …],
+         "by_show":  [{"movie_id", "theater_id", "movie_title", "theater_name",
+                       "city", "total_tickets", "total_revenue"}, …]}
+    (by_show: the `top` movie × theater pairs by revenue)
+    """
+    rows = SalesRollup.objects.filter(day__gte=start, day__lte=end)
+    if theater:
+        rows = rows.filter(theater_id=theater)
+    if movie:
+        rows = rows.filter(movie_id=movie)
+    sums = dict(total_tickets=Sum("tickets"), total_revenue=Sum("revenue"))
+
+    # totals, days and classes all fold out of one small day × class grouping
+    totals   = {"total_tickets": 0, "total_revenue": Decimal("0.00")}
+    by_day   = defaultdict(lambda: dict(totals))
+    by_class = defaultdict(lambda: dict(totals))
+    for row in rows.values("day", "seat_class").annotate(**sums):
+        for entry in (totals, by_day[row["day"]], by_class[row["seat_class"]]):
+            entry["total_tickets"] += row["total_tickets"]
+            entry["total_revenue"] += row["total_revenue"]
+
+    return {
+        "totals":   totals,
+        "by_day":   [{"day": day, **by_day[day]} for day in sorted(by_day)],
+        "by_class": sorted(({"seat_class": name, **entry} for name, entry in by_class.items()),
+                           key=lambda c: (-c["total_revenue"], c["seat_class"])),
+        "by_show":  _by_show(rows, sums, top),
+    }
+
+
+def _by_show(rows, sums, top):
+    # group on the ids (covering index), then name just the `top` pairs
+    pairs    = list(rows.values("movie_id", "theater_id").annotate(**sums)
+                        .order_by("-total_revenue", "movie_id", "theater_id")[:top])
+    titles   = dict(Movie.objects.filter(id__in={p["movie_id"] for p in pairs})
+                                 .values_list("id", "title"))
+    theaters = {t.id: t for t in Theater.objects.filter(id__in={p["theater_id"] for p in pairs})}
+    return [{**pair,
+             "movie_title":  titles[pair["movie_id"]],
+             "theater_name": theaters[pair["theater_id"]].name,
+             "city":         theaters[pair["theater_id"]].city}
+            for pair in pairs]
@@ -0,0 +1,134 @@
+# core/scheduling.py
+"""
+Rolling-window show schedule.
+
+generate() works out which (movie, theater, show_time) combinations are
+wanted for the next N days, subtracts the Shows that already exist, and
+bulk-inserts the rest, all in one transaction.  New shows need no
+ShowPrice rows – they sell at the seat classes' default prices until an
+override is set.  Running it twice is a no-op, and two runs at once can't
+duplicate a show: the insert skips rows that hit Show's unique
+(movie, theater, show_time) constraint.
+
+Entry points: `manage.py generate_shows` (cron), the "Generate upcoming
+shows" action in the Show admin, the "Schedule shows" action in the Movie
+admin and the post_save hook for new movies (core.signals).  A movie's
+available_theaters are saved after the movie itself (the admin saves M2M
+fields last), so changing them calls reschedule(), which also drops the
+unsold upcoming shows in theaters that are no longer allowed.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import api_cache, layouts
+from .models import Movie, SeatLayout, Show, Theater
+
+# used for theaters without ShowTimeTemplate rows
+DEFAULT_TIMES = [time(13, 0), time(16, 0), time(19, 0), time(22, 0)]
+
+DAYS_AHEAD = getattr(settings, "SHOW_SCHEDULE_DAYS", 7)
+
+
+# ─────────────────────────────────────
+#  index-friendly date lookups
+# ─────────────────────────────────────
+def day_bounds(day, days=1):
+    """
+    [start, end) of `days` local days from `day` as aware datetimes.
+    Filtering show_time on this range (instead of show_time__date) keeps
+    the column bare, so the show_time indexes can be used.
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end   = timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
+    return start, end
+
+
+def shows_on(day, **filters):
+    """Shows starting on local date `day`."""
+    start, end = day_bounds(day)
+    return Show.objects.filter(show_time__gte=start, show_time__lt=end, **filters)
+
+
+def shows_before(day):
+    """Shows that started before local date `day`."""
+    return Show.objects.filter(show_time__lt=day_bounds(day)[0])
+
+
+def generate(days=DAYS_AHEAD, start=None, movies=None):
+    """
+    Create the missing shows from `start` (default: tomorrow) for `days`
+    days – for every movie, or only `movies` (instances, ids or a
+    queryset).  Returns the number of shows found missing (any a
+    concurrent run inserted first are skipped).
+    """
+    start = start or timezone.localdate() + timedelta(days=1)
+    dates = [start + timedelta(days=i) for i in range(days)]
+    if not dates:
+        return 0
+
+    theaters = {t.id: t for t in Theater.objects.prefetch_related("show_times")}
+    times    = {tid: [st.time for st in t.show_times.all()] or DEFAULT_TIMES
+                for tid, t in theaters.items()}
+
+    catalogue = Movie.objects.prefetch_related("available_theaters")
+    if movies is not None:
+        if not isinstance(movies, QuerySet):
+            movies = [getattr(m, "pk", m) for m in movies]
+        catalogue = catalogue.filter(pk__in=movies)
+
+    wanted = set()
+    for movie in catalogue:
+        # empty ⟹ every theater
+        theater_ids = [t.id for t in movie.available_theaters.all()] or list(theaters)
+        for tid in theater_ids:
+            for day in dates:
+                for t in times[tid]:
+                    wanted.add((movie.id, tid,
+                                timezone.make_aware(datetime.combine(day, t))))
+
+    window_start, window_end = day_bounds(dates[0], days)
+    standard   = SeatLayout.standard().id
+    layout_ids = {tid: t.layout_id or standard for tid, t in theaters.items()}
+    with transaction.atomic():
+        existing = Show.objects.filter(show_time__gte=window_start, show_time__lt=window_end)
+        if movies is not None:
+            existing = existing.filter(movie_id__in={m for m, _, _ in wanted})
+        existing = set(existing.values_list("movie_id", "theater_id", "show_time"))
+
+        missing = sorted(wanted - existing, key=lambda k: (k[2], k[1], k[0]))
+        if not missing:
+            return 0
+
+        layouts.load(layout_ids.values())
+        Show.objects.bulk_create([
+            Show(movie_id=movie_id, theater_id=tid, show_time=show_time,
+                 layout_id=layout_ids[tid],
+                 capacity=len(layouts.plan(layout_ids[tid])))
+            for movie_id, tid, show_time in missing
+        ], ignore_conflicts=True)
+    # bulk_create skips post_save → invalidate the widget's JSON ourselves
+    api_cache.bump(*{f"theater:{tid}" for _, tid, _ in missing})
+    return len(missing)
+
+def reschedule(movies):
+    """
+    Bring the upcoming shows of `movies` (instances or ids) in line with
+    their available_theaters: future shows with no bookings or holds in
+    theaters that aren't allowed are deleted, missing ones are generated.
+    Returns (removed, created).
+    """
+    removed = 0
+    for movie in Movie.objects.filter(pk__in=[getattr(m, "pk", m) for m in movies]) \
+                              .prefetch_related("available_theaters"):
+        allowed = [t.id for t in movie.available_theaters.all()]
+        if not allowed:                                  # every theater
+            continue
+        unsold = (Show.objects.filter(movie=movie, show_time__gte=timezone.now(),
+                                      booking__isnull=True, holds__isnull=True)
+                              .exclude(theater_id__in=allowed))
+        removed += unsold.delete()[1].get("core.Show", 0)
+    return removed, generate(movies=movies)
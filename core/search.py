@@ -0,0 +1,134 @@
+# core/search.py
+"""
+Movie search over title + description.
+
+On SQLite the text lives in an FTS5 table, core_movie_fts (rowid = movie
+id, created by migration 0024), so a search is one indexed MATCH ranked
+by bm25 with titles weighted above descriptions.  The last word is a
+prefix match, which is what the typeahead needs: "star wa" finds
+"Star Wars".  Ranking is bounded: bm25 scores only the newest
+RANK_WINDOW matches, so a broad word costs the same few ms as a precise
+one; past that, refine the query.  Movies whose whole title is the query
+come first whatever their age – an index lookup on lower(title) in the
+same query.
+
+The index is kept in step by the Movie post_save / post_delete receivers
+in core.signals; rows written with bulk_create / update() skip those, so
+run `manage.py rebuild_movie_search` after bulk imports.  Other database
+backends fall back to a plain icontains filter.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+
+from .models import Movie
+
+TABLE         = "core_movie_fts"
+PER_PAGE      = 20
+TITLE_WEIGHT  = 10.0        # bm25 column weights: title, description
+DESC_WEIGHT   = 1.0
+RANK_WINDOW   = 1000        # newest matches that get scored and paged through
+
+_TERM = re.compile(r"\w+")
+
+
+def enabled():
+    return connection.vendor == "sqlite"
+
+
+def match_expression(q):
+    """
+    User text → FTS5 query: every word quoted (no operator injection), all
+    words required, the last one prefix-matched since it may still be
+    being typed.  '' when there is nothing to match.
+    """
+    terms = [f'"{term}"' for term in _TERM.findall(q.lower())]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+# ─────────────────────────────────────
+#  index maintenance
+# ─────────────────────────────────────
+def index(movie):
+    if not enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [movie.pk])
+        cursor.execute(f"INSERT INTO {TABLE} (rowid, title, description) "
+                       f"VALUES (%s, %s, %s)", [movie.pk, movie.title, movie.description])
+
+
+def unindex(movie_id):
+    if not enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [movie_id])
+
+
+def rebuild():
+    """Re-index every movie. Returns how many were indexed."""
+    if not enabled():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(f"INSERT INTO {TABLE} (rowid, title, description) "
+                       f"SELECT id, title, description FROM core_movie")
+        count = cursor.rowcount
+        # merge the index segments the bulk insert left behind
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+        return count
+
+
+# ─────────────────────────────────────
+#  queries
+# ─────────────────────────────────────
+def exact_titles(q):
+    """Movies titled exactly `q` (any case), newest first – index lookup."""
+    return (Movie.objects.alias(lower_title=Lower("title"))
+                         .filter(lower_title=Lower(Value(q.strip()))).order_by("-id"))
+
+
+def search(q, page=1, per_page=PER_PAGE):
+    """
+    One page of movies matching `q`, best match first.
+    Returns (movies, has_next); `page` counts from 1.
+    """
+    expression = match_expression(q)
+    if not expression:
+        return [], False
+    offset = (max(page, 1) - 1) * per_page
+
+    if enabled():
+        # exact titles first, then the bm25 window without them – one
+        # query; one row past the page tells us whether there is a next
+        # one (no COUNT)
+        exact, exact_params = (exact_titles(q).values("id")[:RANK_WINDOW]
+                               .query.sql_with_params())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH exact AS ({exact})"
+                f" SELECT id FROM ("
+                f"  SELECT id, 0 AS tier, 0.0 AS score FROM exact"
+                f"  UNION ALL"
+                f"  SELECT rowid, 1, score FROM ("
+                f"    SELECT rowid, bm25({TABLE}, %s, %s) AS score FROM {TABLE}"
+                f"    WHERE {TABLE} MATCH %s ORDER BY rowid DESC LIMIT %s"
+                f"  ) WHERE rowid NOT IN (SELECT id FROM exact)"
+                f") ORDER BY tier, score, id DESC LIMIT %s OFFSET %s",
+                [*exact_params, TITLE_WEIGHT, DESC_WEIGHT, expression, RANK_WINDOW,
+                 per_page + 1, offset])
+            ids = [row[0] for row in cursor.fetchall()]
+        has_next, ids = len(ids) > per_page, ids[:per_page]
+        found = Movie.objects.in_bulk(ids)
+        return [found[i] for i in ids if i in found], has_next
+
+    terms = Q()
+    for term in _TERM.findall(q):
+        terms &= Q(title__icontains=term) | Q(description__icontains=term)
+    movies = list(Movie.objects.filter(terms).order_by("title", "id")
+                               [offset:offset + per_page + 1])
+    return movies[:per_page], len(movies) > per_page
@@ -1,70 +1,122 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Movie, Theater, Show, Seat,SeatClass,ShowPrice
-from datetime import datetime, time, timedelta
+from .models import Movie, Show, Seat,SeatClass,ShowPrice,Booking,LayoutRow,SeatHold
+from . import api_cache, availability, layouts, live, rollups, scheduling, search
 
-@receiver(post_save, sender=SeatClass)
-def sync_show_prices(sender, instance, **kwargs):
-    """
-    Anytime the admin saves a SeatClass (default_price changed),
-    update EVERY ShowPrice that belongs to this class.
-    """
-    ShowPrice.objects.filter(seat_class=instance) \
-                     .update(price=instance.default_price)
-    
-    
 @receiver(post_save, sender=Movie)
 def create_default_shows(sender, instance, created, **kwargs):
+    """A new movie gets the upcoming schedule straight away (bulk, aware times)."""
     if created:
-        # Define default show times (you can add more)
-        show_times = [time(10, 0), time(13, 0), time(16, 0), time(19, 0)]
-
-        # Get all theaters (or pick a default theater if you want)
-        theaters = Theater.objects.all()
-
-        # For each theater and time, create a Show for this movie
-        for theater in theaters:
-            for show_time in show_times:
-                # Create a datetime for today with show_time
-                show_datetime = datetime.combine(datetime.today(), show_time)
-                # Create show
-                Show.objects.create(movie=instance, theater=theater, show_time=show_datetime)
+        scheduling.generate(movies=[instance.pk])
 
 
-@receiver(post_save, sender=Show)
-def create_seats_for_show(sender, instance, created, **kwargs):
+@receiver(m2m_changed, sender=Movie.available_theaters.through)
+def reschedule_movie(sender, instance, action, reverse, pk_set, **kwargs):
     """
-    When a Show is first created → generate 50 seats and
-    attach the correct SeatClass (A–B = Premium, C–E = Regular)
+    The theaters are saved after the movie (admin, .set()), so the
+    post_save schedule above may have used every theater – redo it.
     """
-    if not created:
+    if action not in ("post_add", "post_remove", "post_clear"):
         return
+    movies = pk_set if reverse else [instance.pk]
+    if movies:
+        scheduling.reschedule(movies)
+
 
-    premium  = SeatClass.objects.get(name='Premium')
-    regular  = SeatClass.objects.get(name='Regular')
+@receiver(post_save, sender=Movie)
+def index_movie(sender, instance, **kwargs):
+    search.index(instance)
 
-    for row in "ABCDE":
-        for num in range(1, 11):
-            seat_class = premium if row in "AB" else regular
-            Seat.objects.get_or_create(
-                show        = instance,
-                seat_number = f"{row}{num}",
-                defaults    = {'seat_class': seat_class}
-            )
 
+@receiver(post_delete, sender=Movie)
+def unindex_movie(sender, instance, **kwargs):
+    search.unindex(instance.pk)
 
-@receiver(post_save, sender=Show)
-def create_prices_for_show(sender, instance, created, **kwargs):
+
+@receiver(m2m_changed, sender=Booking.seats.through)
+def update_seat_bitmap(sender, instance, action, reverse, pk_set, **kwargs):
     """
-    When a Show is first created → add a ShowPrice row
-    for every SeatClass, using its default_price.
+    Keep Show.seat_bitmap in step with Booking.seats:
+    added seats set their bits, anything removed rebuilds the show's map.
     """
-    if not created:
+    if reverse:                      # seat.booking_set.add(...) – rare
+        if action in ("post_add", "post_remove", "post_clear"):
+            availability.rebuild(instance.show_id)
         return
 
-    for seat_cls in SeatClass.objects.all():
-        ShowPrice.objects.get_or_create(
-            show       = instance,
-            seat_class = seat_cls,
-            defaults   = {'price': seat_cls.default_price}
-        )
\ No newline at end of file
+    if action == "post_add" and pk_set:
+        seat_numbers = Seat.objects.filter(pk__in=pk_set) \
+                                   .values_list("seat_number", flat=True)
+        availability.mark_booked(instance.show_id, list(seat_numbers))
+    elif action in ("post_remove", "post_clear"):
+        availability.rebuild(instance.show_id)
+
+
+@receiver(post_delete, sender=Booking)
+def release_seat_bitmap(sender, instance, **kwargs):
+    """A deleted booking frees its seats in the show's bitmap."""
+    availability.rebuild(instance.show_id)
+
+
+@receiver(post_delete, sender=Booking)
+def unrecord_sales(sender, instance, **kwargs):
+    """A deleted booking comes back out of the sales rollups."""
+    show = Show.objects.filter(pk=instance.show_id).values("movie_id", "theater_id").first()
+    if show:
+        rollups.unrecord(instance, show["movie_id"], show["theater_id"])
+
+
+@receiver(post_delete, sender=SeatHold)
+def push_released_seat(sender, instance, **kwargs):
+    """Expired, replaced or cancelled hold → tell open booking pages."""
+    transaction.on_commit(
+        lambda: live.publish(instance.show_id, released=[instance.seat_number]))
+
+
+@receiver(post_save, sender=LayoutRow)
+@receiver(post_delete, sender=LayoutRow)
+def forget_seat_plan(sender, instance, **kwargs):
+    """Edited layout rows → rebuild that layout's cached seat plan."""
+    layouts.forget(instance.layout_id)
+
+
+@receiver(post_save, sender=SeatClass)
+def forget_seat_plans(sender, instance, **kwargs):
+    """Class names / colours are baked into cached plans."""
+    layouts.forget()
+
+
+# ─────────────────────────────────────
+#  JSON endpoint cache invalidation
+# ─────────────────────────────────────
+@receiver(post_save, sender=Show)
+@receiver(post_delete, sender=Show)
+def invalidate_theater_json(sender, instance, **kwargs):
+    api_cache.bump(f"theater:{instance.theater_id}")
+
+
+@receiver(post_save, sender=ShowPrice)
+@receiver(post_delete, sender=ShowPrice)
+def invalidate_price_json(sender, instance, **kwargs):
+    api_cache.bump(f"prices:{instance.show_id}")
+
+
+@receiver(post_save, sender=SeatClass)
+@receiver(post_delete, sender=SeatClass)
+def invalidate_seatclass_json(sender, instance, **kwargs):
+    api_cache.bump("seatclasses")
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def invalidate_movie_json(sender, instance, **kwargs):
+    api_cache.bump("movies")
+
+
+@receiver(post_delete, sender=SeatHold)
+@receiver(post_delete, sender=Booking)
+def invalidate_seat_map_json(sender, instance, **kwargs):
+    # after commit, so a seat map built meanwhile can't be cached as current
+    show_id = instance.show_id
+    transaction.on_commit(lambda: api_cache.bump(f"seats:{show_id}"))
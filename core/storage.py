@@ -0,0 +1,74 @@
+# core/storage.py
+"""
+Static files build: `manage.py collectstatic` with this storage writes
+
+  • content-hashed copies (style.css → style.4f2a9c1b7e3d.css) and
+    staticfiles.json mapping one to the other – {% static %} emits the
+    hashed names, so a changed file gets a new URL;
+  • a .gz (and, with the optional `brotli` package, a .br) next to every
+    text asset, for core.middleware.static_files to pick from
+    Accept-Encoding without compressing per request.
+
+Until collectstatic has run there is no manifest and {% static %} falls
+back to the plain names, so tests and runserver need no build step.
+"""
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:           # gzip only
+    brotli = None
+
+COMPRESSIBLE = {".css", ".js", ".map", ".json", ".svg", ".txt", ".html", ".xml",
+                ".ico", ".ttf", ".otf", ".eot"}
+MIN_SIZE     = 256            # bytes; smaller files aren't worth a variant
+
+
+def encoders():
+    """{suffix: compress(bytes) → bytes}, best first."""
+    found = {}
+    if brotli is not None:
+        found[".br"] = lambda data: brotli.compress(data, quality=11)
+    found[".gz"] = lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    return found
+
+
+def compress(path):
+    """Write the precompressed variants of `path`; returns the suffixes written."""
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE:
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < MIN_SIZE:
+        return []
+
+    written = []
+    for suffix, encode in encoders().items():
+        packed = encode(data)
+        if len(packed) < len(data) * 0.95:          # else serve the original
+            with open(path + suffix, "wb") as f:
+                f.write(packed)
+            written.append(suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also precompresses what it wrote."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name in sorted(names):
+                compress(self.path(name))
+
+    def stored_name(self, name):
+        if not self.hashed_files:                    # collectstatic hasn't run
+            return name
+        return super().stored_name(name)
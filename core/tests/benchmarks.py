@@ -0,0 +1,129 @@
+# core/tests/benchmarks.py
+"""
+Dataset seeding and measuring helpers for the booking hot-path benchmarks
+(see test_benchmarks.py).
+
+Each measured call is checked twice:
+  • query budget – the number of SQL queries must not exceed BUDGETS[name]
+    (budgets are constant, so N+1 loops show up on the larger datasets);
+  • speed – the median wall time must stay within TOLERANCE × the stored
+    baseline in benchmark_baseline.json.  Only with BENCH=1: wall-clock
+    checks are too noisy for the default run on shared machines.
+
+Environment knobs:
+  BENCH=1               check timings against the baseline too
+  BENCH_UPDATE=1        write the measured medians as the new baseline
+  BENCH_TOLERANCE=3.0   allowed slowdown factor vs. the baseline
+  BENCH_SLACK_MS=5      …plus this much absolute slack (timer noise)
+  BENCH_REPEAT=5        timed runs per measurement (1 without BENCH / BENCH_UPDATE)
+"""
+import json
+import os
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import holds, scheduling
+from core.models import Movie, Show, Theater
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+UPDATE        = os.environ.get("BENCH_UPDATE") == "1"
+TIMED         = os.environ.get("BENCH") == "1"
+TOLERANCE     = float(os.environ.get("BENCH_TOLERANCE", "3.0"))
+SLACK         = float(os.environ.get("BENCH_SLACK_MS", "5")) / 1000
+REPEAT        = int(os.environ.get("BENCH_REPEAT", "5" if TIMED or UPDATE else "1"))
+
+# theaters × movies × 4 daily slots (scheduling.DEFAULT_TIMES) × bookings
+DATASETS = {
+    "small": {"theaters": 2,  "movies": 2, "bookings_per_show": 1},
+    "large": {"theaters": 12, "movies": 6, "bookings_per_show": 3},
+}
+
+# max SQL queries per request – must hold for every dataset size
+BUDGETS = {
+    "home":                 5,
+    # book_movie*, payment_post: + the waiting room's DatabaseStore
+    # (first visit ~10 incl. savepoints, checkout release ~6)
+    "book_movie":          18,
+    "book_movie_post":     29,
+    "payment":              8,
+    "payment_post":        36,
+    "booking_confirmation": 8,
+    "get_movies":           2,
+    "get_shows":            2,
+    "get_prices":           2,
+    "seat_map":             4,
+    "browse_shows":         2,
+    "admin_bookings":      12,
+    "schedule":            12,     # timed per show created; + SAVEPOINT/RELEASE of its transaction
+}
+
+
+def seed(theaters, movies, bookings_per_show):
+    """Tomorrow's full schedule plus `bookings_per_show` 2-seat bookings per show."""
+    # bulk_create: skip Movie post_save, the generator schedules everything
+    Theater.objects.bulk_create(
+        [Theater(name=f"Theater {i}", city=f"City {i % 3}") for i in range(theaters)])
+    Movie.objects.bulk_create(
+        [Movie(title=f"Movie {i}", description="Benchmark movie", duration=120,
+               release_date=timezone.localdate()) for i in range(movies)])
+    scheduling.generate(days=1)
+
+    users = User.objects.bulk_create(
+        [User(username=f"bench{i}") for i in range(bookings_per_show)])
+    for show in Show.objects.select_related("movie"):
+        for i, user in enumerate(users):
+            seats = [f"C{2 * i + 1}", f"C{2 * i + 2}"]
+            holds.claim(user, show, seats)
+            holds.confirm(user, show.movie, show, seats)
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_FILE) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results):
+    baseline = load_baseline()
+    for dataset, timings in results.items():
+        baseline.setdefault(dataset, {}).update(timings)
+    with open(BASELINE_FILE, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+class Measurement:
+    def __init__(self, name, queries, median):
+        self.name, self.queries, self.median = name, queries, median
+
+
+def measure(name, call, setup=None):
+    """
+    Run `call()` once to count queries, then REPEAT times for timing.
+    `setup()` runs (untimed) before every call; the cache is always cleared
+    so the database work is what gets measured.
+    """
+    def prepare():
+        cache.clear()
+        if setup:
+            setup()
+
+    prepare()
+    with CaptureQueriesContext(connection) as ctx:
+        call()
+    queries = len(ctx)
+
+    timings = []
+    for _ in range(REPEAT):
+        prepare()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return Measurement(name, queries, statistics.median(timings))
@@ -0,0 +1,138 @@
+# core/tests/test_admission.py
+"""
+Waiting room: slot handout and queue order in LocalStore and
+DatabaseStore, and the gate in book_movie / payment.
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import admission, layouts
+from core.admission import DatabaseStore, LocalStore
+from core.models import AdmissionEntry, Booking, Movie, Show, Theater
+
+
+def enter(store, token, now, capacity=2, lease=100, queue_timeout=30):
+    return store.enter("movie:1", token, now, capacity, lease, queue_timeout)
+
+
+class StoreTestsMixin:
+    store_class = None
+
+    def setUp(self):
+        self.store = self.store_class()
+
+    def test_slots_then_fifo_queue(self):
+        self.assertTrue(enter(self.store, "a", 0).admitted)
+        self.assertTrue(enter(self.store, "b", 0).admitted)
+        c, d = enter(self.store, "c", 0), enter(self.store, "d", 0)
+        self.assertEqual((c.admitted, c.position), (False, 1))
+        self.assertEqual((d.admitted, d.position), (False, 2))
+        self.assertGreater(d.wait, c.wait)
+
+        self.store.release("movie:1", "a", 10)
+        self.assertFalse(enter(self.store, "d", 11).admitted)    # c is first in line
+        self.assertTrue(enter(self.store, "c", 12).admitted)
+        self.assertEqual(enter(self.store, "d", 13).position, 1)
+
+    def test_slots_expire(self):
+        enter(self.store, "a", 0)
+        enter(self.store, "b", 0)
+        self.assertFalse(enter(self.store, "c", 1).admitted)
+        self.assertTrue(self.store.admitted("movie:1", "a", 99))
+        self.assertFalse(self.store.admitted("movie:1", "a", 100))
+        self.assertTrue(enter(self.store, "c", 100).admitted)
+
+    def test_waiters_who_stop_polling_lose_their_place(self):
+        enter(self.store, "a", 0)
+        enter(self.store, "b", 0)
+        enter(self.store, "gone", 0)
+        enter(self.store, "c", 0)
+        self.store.release("movie:1", "a", 50)
+        enter(self.store, "c", 50)                 # "gone" last polled at 0 → skipped
+        self.assertTrue(self.store.admitted("movie:1", "c", 50))
+        self.assertFalse(self.store.admitted("movie:1", "gone", 50))
+
+
+class LocalStoreTests(StoreTestsMixin, TestCase):
+    store_class = LocalStore
+
+
+class DatabaseStoreTests(StoreTestsMixin, TestCase):
+    store_class = DatabaseStore
+
+    def test_state_is_shared_between_instances(self):
+        enter(self.store, "a", 0)
+        other = DatabaseStore()                    # another worker process
+        self.assertTrue(other.admitted("movie:1", "a", 1))
+        self.assertEqual(enter(other, "b", 1).position, 0)
+        other.release("movie:1", "a", 61)
+        self.assertFalse(self.store.admitted("movie:1", "a", 62))
+        self.assertEqual(list(AdmissionEntry.objects.values_list("token", flat=True)), ["b"])
+
+    def test_checkout_time_drives_the_estimate(self):
+        enter(self.store, "a", 0, capacity=1)
+        self.store.release("movie:1", "a", 60)    # one checkout took a minute
+        enter(self.store, "b", 60, capacity=1)
+        self.assertEqual(enter(self.store, "c", 61, capacity=1).wait, 60)
+
+
+class CapacityTests(TestCase):
+    @override_settings(ADMISSION_CAPACITY=None, ADMISSION_STORE="core.admission.LocalStore")
+    def test_unset_is_off_for_a_per_process_store(self):
+        self.assertEqual(admission.capacity(), 0)
+
+    @override_settings(ADMISSION_CAPACITY=None)
+    def test_unset_is_on_with_the_default_store(self):
+        self.assertEqual(admission.capacity(), admission.DEFAULT_CAPACITY)
+
+    @override_settings(ADMISSION_CAPACITY=5)
+    def test_explicit_capacity_wins(self):
+        self.assertEqual(admission.capacity(), 5)
+
+
+@override_settings(ADMISSION_CAPACITY=1)
+class WaitingRoomViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Queue", city="Test")
+        cls.movie   = Movie.objects.create(title="Opening Night", description="-",
+                                           duration=90, release_date=timezone.localdate())
+        cls.show    = Show.objects.filter(movie=cls.movie).first()
+        cls.first   = User.objects.create_user("first")
+        cls.second  = User.objects.create_user("second")
+
+    def setUp(self):
+        admission.store().clear()
+        self.url = reverse("book_movie", args=[self.movie.id])
+
+    def client_for(self, user):
+        client = self.client_class()
+        client.force_login(user)
+        return client
+
+    def test_second_visitor_waits_until_the_first_pays(self):
+        first, second = self.client_for(self.first), self.client_for(self.second)
+        self.assertTemplateUsed(first.get(self.url), "core/book_movie.html")
+
+        waiting = second.get(self.url)
+        self.assertTemplateUsed(waiting, "core/waiting_room.html")
+        self.assertEqual(waiting.context["position"], 1)
+
+        seat = layouts.plan(self.show.layout_id).seat_numbers[0]
+        first.post(self.url, {"show_id": self.show.id, "selected_seats": seat})
+        response = first.post(reverse("payment", args=[self.movie.id]))
+        self.assertIn("booking-confirmation", response["Location"])
+
+        self.assertTemplateUsed(second.get(self.url), "core/book_movie.html")
+
+    def test_payment_needs_a_slot(self):
+        client = self.client_for(self.first)
+        seat   = layouts.plan(self.show.layout_id).seat_numbers[0]
+        client.post(self.url, {"show_id": self.show.id, "selected_seats": seat})
+        admission.store().clear()                   # slot lapsed
+
+        response = client.post(reverse("payment", args=[self.movie.id]))
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        self.assertFalse(Booking.objects.exists())
@@ -0,0 +1,65 @@
+# core/tests/test_api_cache.py
+"""
+JSON cache and shared vs per-process backends: responses are cached only
+when every worker sees the same scope versions.
+"""
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import api_cache
+from core.models import Movie, SeatClass, Show, Theater
+
+
+class PriceCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        theater  = Theater.objects.create(name="Prices", city="Test")
+        movie    = Movie.objects.create(title="Priced", description="-", duration=90,
+                                        release_date=timezone.localdate())
+        cls.movie = movie
+        cls.show  = Show.objects.filter(movie=movie, theater=theater).first()
+        cls.url   = reverse("get_prices", args=[cls.show.id])
+
+    def setUp(self):
+        cache.clear()
+
+    def change_price_elsewhere(self):
+        """Another worker's edit: the row changes, our process sees no bump."""
+        SeatClass.objects.update(default_price=999)
+
+    def prices(self):
+        return set(self.client.get(self.url).json()["prices"].values())
+
+    def test_per_process_cache_never_serves_stale_prices(self):
+        self.assertFalse(api_cache.shared())
+        self.prices()
+        self.change_price_elsewhere()
+        self.assertEqual(self.prices(), {999.0})
+
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_per_process_cache_never_serves_stale_movies(self):
+        url = reverse("get_movies", args=[self.show.theater_id])
+        self.client.get(url)
+        Movie.objects.filter(pk=self.movie.pk).update(title="Renamed")   # cron / other worker
+        self.assertEqual([m["title"] for m in self.client.get(url).json()["movies"]],
+                         ["Renamed"])
+
+    def test_shared_cache_is_used(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        with override_settings(CACHES={"default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": location}}):
+            self.assertTrue(api_cache.shared())
+            before = self.prices()
+            self.change_price_elsewhere()
+            self.assertEqual(self.prices(), before)       # until someone bumps it
+            api_cache.bump("seatclasses")
+            self.assertEqual(self.prices(), {999.0})
@@ -0,0 +1,106 @@
+# core/tests/test_archive.py
+"""
+Archiving past shows: what the archive rows hold, that an interrupted run
+is simply run again, and that the raw deletes leave nothing behind.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from core import archive, holds, layouts
+from core.models import (ArchivedBooking, ArchivedShow, Booking, Movie, Seat, SeatClass,
+                         SeatHold, Show, ShowPrice, Theater)
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Vault", city="Test")
+        cls.movie   = Movie.objects.create(title="Old Times", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        cls.buyer   = User.objects.create_user("buyer")
+        cls.other   = User.objects.create_user("browser")
+        cls.past    = list(Show.objects.filter(movie=cls.movie).order_by("show_time")[:2])
+        cls.future  = Show.objects.filter(movie=cls.movie).order_by("show_time")[2]
+        seats       = layouts.plan(cls.past[0].layout_id).seat_numbers
+
+        ShowPrice.objects.create(show=cls.past[0], seat_class=SeatClass.objects.first(),
+                                 price=Decimal("123.00"))
+        cls.bookings = []
+        for show in cls.past:
+            holds.claim(cls.buyer, show, [seats[-1], seats[0]])
+            cls.bookings.append(holds.confirm(cls.buyer, cls.movie, show,
+                                              [seats[-1], seats[0]]))
+        holds.claim(cls.other, cls.past[0], [seats[5]])          # never paid
+        cls.seats = [seats[0], seats[-1]]
+
+        for n, show in enumerate(cls.past):
+            Show.objects.filter(pk=show.pk).update(
+                show_time=timezone.now() - timedelta(days=3 - n))
+
+    def test_archived_rows(self):
+        self.assertEqual(archive.archive(), (2, 2))
+        show    = self.past[0]
+        booking = self.bookings[0]
+
+        row = ArchivedShow.objects.get(show_id=show.id)
+        self.assertEqual((row.movie_title, row.theater_name, row.theater_city),
+                         ("Old Times", "Vault", "Test"))
+        self.assertEqual((row.movie_id, row.theater_id), (self.movie.id, self.theater.id))
+        self.assertEqual(row.seats_sold, 2)
+        self.assertEqual(row.revenue, booking.total_price)
+
+        sold = ArchivedBooking.objects.get(booking_id=booking.id)
+        self.assertEqual(sold.show, row)
+        self.assertEqual((sold.user_id, sold.username), (self.buyer.id, "buyer"))
+        self.assertEqual(sorted(sold.seats), sorted(self.seats))
+        self.assertEqual(sold.total_price, booking.total_price)
+        self.assertEqual(sold.price_breakdown, booking.price_breakdown)
+        self.assertEqual(sold.booking_time, booking.booking_time)
+
+    def test_raw_deletes_clear_every_child_table(self):
+        ids = [s.id for s in self.past]
+        archive.archive()
+        self.assertFalse(Show.objects.filter(id__in=ids).exists())
+        self.assertFalse(Booking.objects.filter(show_id__in=ids).exists())
+        self.assertFalse(Booking.seats.through.objects
+                                .filter(booking_id__in=[b.id for b in self.bookings])
+                                .exists())
+        self.assertFalse(Seat.objects.filter(show_id__in=ids).exists())
+        self.assertFalse(SeatHold.objects.filter(show_id__in=ids).exists())
+        self.assertFalse(ShowPrice.objects.filter(show_id__in=ids).exists())
+        self.assertTrue(Show.objects.filter(pk=self.future.pk).exists())
+
+    def test_failed_batch_rolls_back_and_rerun_finishes(self):
+        real = archive._raw_delete
+
+        def fail_on_shows(queryset):
+            if queryset.model is Show:
+                raise RuntimeError("killed")
+            return real(queryset)
+
+        with mock.patch.object(archive, "_raw_delete", side_effect=fail_on_shows), \
+             self.assertRaises(RuntimeError):
+            archive.archive(batch_size=1)
+        self.assertFalse(ArchivedShow.objects.exists())
+        self.assertEqual(Booking.objects.filter(show__in=self.past).count(), 2)
+
+        self.assertEqual(archive.archive(batch_size=1), (2, 2))
+        self.assertEqual(ArchivedBooking.objects.count(), 2)
+
+    def test_interrupted_run_resumes_after_the_committed_batch(self):
+        def stop(shows, bookings, total):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            archive.archive(batch_size=1, progress=stop)
+        self.assertEqual(list(ArchivedShow.objects.values_list("show_id", flat=True)),
+                         [self.past[0].id])
+
+        self.assertEqual(archive.archive(batch_size=1), (1, 1))
+        self.assertEqual(ArchivedShow.objects.count(), 2)
+        self.assertEqual(ArchivedBooking.objects.count(), 2)
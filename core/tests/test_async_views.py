@@ -0,0 +1,79 @@
+# core/tests/test_async_views.py
+"""
+The async JSON views (routed under ASGI) must answer exactly like the sync
+ones: same body, same ETag, same 304 on revalidation.  Routed to them, the
+query-stats middleware must still see their queries.
+"""
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+from django.utils import timezone
+
+from core import views
+from core.models import Movie, Show, Theater
+
+STATS_MIDDLEWARE = "core.middleware.query_stats.QueryStatsMiddleware"
+
+# what core.urls routes with ASYNC_JSON_VIEWS on (it decides at import time)
+urlpatterns = [
+    path("get-movies/<int:theater_id>/", views.aget_movies, name="get_movies"),
+]
+
+
+class AsyncJsonViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Async", city="Test")
+        cls.movie   = Movie.objects.create(title="Async", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        cls.show    = Show.objects.filter(movie=cls.movie, theater=cls.theater).first()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def both(self, sync_view, async_view, *args, **headers):
+        cache.clear()
+        sync = sync_view(self.factory.get("/", headers=headers), *args)
+        cache.clear()
+        asyn = async_to_sync(async_view)(self.factory.get("/", headers=headers), *args)
+        return sync, asyn
+
+    def test_same_json_and_etag(self):
+        cases = [(views.get_movies,      views.aget_movies,      self.theater.id),
+                 (views.get_shows,       views.aget_shows,       self.theater.id, self.movie.id),
+                 (views.get_show_prices, views.aget_show_prices, self.show.id)]
+        for sync_view, async_view, *args in cases:
+            with self.subTest(view=sync_view.__name__):
+                sync, asyn = self.both(sync_view, async_view, *args)
+                self.assertEqual(asyn.status_code, 200)
+                self.assertEqual(asyn.content, sync.content)
+                self.assertEqual(asyn["ETag"], sync["ETag"])
+
+    def test_not_modified(self):
+        etag = views.get_movies(self.factory.get("/"), self.theater.id)["ETag"]
+        sync, asyn = self.both(views.get_movies, views.aget_movies, self.theater.id,
+                               if_none_match=etag)
+        self.assertEqual(sync.status_code, 304)
+        self.assertEqual(asyn.status_code, 304)
+
+    def sync_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            views.get_movies(self.factory.get("/"), self.theater.id)
+        return len(queries)
+
+    @override_settings(ASYNC_JSON_VIEWS=True, ROOT_URLCONF=__name__, QUERY_STATS="headers",
+                       MIDDLEWARE=[STATS_MIDDLEWARE, *(m for m in settings.MIDDLEWARE
+                                                       if m != STATS_MIDDLEWARE)])
+    async def test_query_stats_count_async_queries(self):
+        await cache.aclear()
+        response = await self.async_client.get(reverse("get_movies", args=[self.theater.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(response.resolver_match.func, views.aget_movies)
+        expected = await sync_to_async(self.sync_queries)()
+        self.assertGreater(expected, 0)
+        self.assertEqual(int(response["X-DB-Queries"]), expected)
@@ -0,0 +1,172 @@
+# core/tests/test_benchmarks.py
+"""
+Booking hot-path benchmarks with query-count budgets; timings only with BENCH=1.
+
+    python manage.py test core.tests.test_benchmarks                  # query budgets
+    BENCH=1 python manage.py test core.tests.test_benchmarks          # + timings
+    BENCH_UPDATE=1 python manage.py test core.tests.test_benchmarks   # new baseline
+    python manage.py test --exclude-tag=benchmark                      # skip them
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase, tag
+from django.urls import reverse
+
+from core import holds, scheduling
+from core.models import Booking, Movie, Show, Theater
+
+from .benchmarks import (BUDGETS, DATASETS, SLACK, TIMED, TOLERANCE, UPDATE,
+                         load_baseline, measure, save_baseline, seed)
+
+
+class BookingBenchmarksMixin:
+    dataset = None
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(**DATASETS[cls.dataset])
+        cls.user    = User.objects.create_user("buyer", password="bench-pass")
+        cls.movie   = Movie.objects.order_by("id").first()
+        cls.theater = Theater.objects.order_by("id").first()
+        cls.show    = (Show.objects.filter(movie=cls.movie, theater=cls.theater)
+                                   .order_by("show_time").first())
+        cls.booking = Booking.objects.filter(show=cls.show).first()
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = {}        # not in setUpTestData: that copies per test
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE and cls.results:
+            save_baseline({cls.dataset: cls.results})
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.free_seat = 0
+
+    # ─────────────────────────────────────
+    #  helpers
+    # ─────────────────────────────────────
+    def check(self, result):
+        self.results[result.name] = round(result.median, 6)
+        self.assertLessEqual(
+            result.queries, BUDGETS[result.name],
+            f"{result.name} ran {result.queries} queries on the {self.dataset} "
+            f"dataset (budget {BUDGETS[result.name]})")
+
+        if not TIMED or UPDATE:
+            return
+        baseline = load_baseline().get(self.dataset, {}).get(result.name)
+        if baseline:
+            self.assertLessEqual(
+                result.median, baseline * TOLERANCE + SLACK,
+                f"{result.name} took {result.median * 1000:.1f} ms on the "
+                f"{self.dataset} dataset (baseline {baseline * 1000:.1f} ms)")
+
+    def get_ok(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def hold_next_seat(self):
+        """Hold a fresh seat (row A) and put it in the session like book_movie does."""
+        self.client.get(reverse("book_movie", args=[self.movie.id]))    # checkout slot
+        self.free_seat += 1
+        seat = f"A{self.free_seat}"
+        holds.claim(self.user, self.show, [seat])
+        session = self.client.session
+        session["show_id"]      = self.show.id
+        session["seat_numbers"] = [seat]
+        session.save()
+
+    # ─────────────────────────────────────
+    #  pages
+    # ─────────────────────────────────────
+    def test_home(self):
+        self.check(measure("home", lambda: self.get_ok(reverse("home"))))
+
+    def test_book_movie(self):
+        self.check(measure("book_movie", lambda: self.get_ok(
+            reverse("book_movie", args=[self.movie.id]))))
+
+    def test_book_movie_post(self):
+        def post():
+            response = self.client.post(reverse("book_movie", args=[self.movie.id]),
+                                        {"show_id": self.show.id,
+                                         "selected_seats": "B1,B2"})
+            self.assertEqual(response.status_code, 302)
+        self.check(measure("book_movie_post", post))
+
+    def test_payment(self):
+        self.check(measure("payment", lambda: self.get_ok(
+            reverse("payment", args=[self.movie.id])), setup=self.hold_next_seat))
+
+    def test_payment_post(self):
+        def post():
+            response = self.client.post(reverse("payment", args=[self.movie.id]))
+            self.assertEqual(response.status_code, 302)
+            self.assertIn("booking-confirmation", response["Location"])
+        self.check(measure("payment_post", post, setup=self.hold_next_seat))
+
+    def test_booking_confirmation(self):
+        self.check(measure("booking_confirmation", lambda: self.get_ok(
+            reverse("booking_confirmation", args=[self.booking.id]))))
+
+    # ─────────────────────────────────────
+    #  booking widget JSON
+    # ─────────────────────────────────────
+    def test_get_movies(self):
+        self.check(measure("get_movies", lambda: self.get_ok(
+            reverse("get_movies", args=[self.theater.id]))))
+
+    def test_get_shows(self):
+        self.check(measure("get_shows", lambda: self.get_ok(
+            reverse("get_shows", args=[self.theater.id, self.movie.id]))))
+
+    def test_get_prices(self):
+        self.check(measure("get_prices", lambda: self.get_ok(
+            reverse("get_prices", args=[self.show.id]))))
+
+    def test_seat_map(self):
+        self.check(measure("seat_map", lambda: self.get_ok(
+            reverse("seat_map", args=[self.show.id]))))
+
+    def test_browse_shows(self):
+        self.check(measure("browse_shows", lambda: self.get_ok(
+            reverse("browse_shows") + f"?city={self.theater.city}")))
+
+    # ─────────────────────────────────────
+    #  admin
+    # ─────────────────────────────────────
+    def test_admin_bookings(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True, is_superuser=True)
+        self.check(measure("admin_bookings", lambda: self.get_ok(
+            reverse("admin:core_booking_changelist"))))
+
+    # ─────────────────────────────────────
+    #  scheduling
+    # ─────────────────────────────────────
+    def test_schedule(self):
+        created = []
+
+        def unschedule():
+            Show.objects.filter(movie=self.movie).delete()
+
+        def schedule():
+            created.append(scheduling.generate(movies=[self.movie]))
+
+        result = measure("schedule", schedule, setup=unschedule)
+        result.median /= created[-1]        # cost of one show
+        self.check(result)
+
+
+@tag("benchmark")
+class SmallDatasetBenchmarks(BookingBenchmarksMixin, TestCase):
+    dataset = "small"
+
+
+@tag("benchmark")
+class LargeDatasetBenchmarks(BookingBenchmarksMixin, TestCase):
+    dataset = "large"
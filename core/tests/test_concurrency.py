@@ -0,0 +1,107 @@
+# core/tests/test_concurrency.py
+"""
+Concurrent booking throughput on the real (on-disk, WAL) test database,
+and racing buyers for one seat getting exactly one winner.
+
+Several threads, each with its own connection, hold and pay for seats of
+the same show at once – like gunicorn workers do.  Every booking must go
+through (no "database is locked" reaching the caller) and the time per
+booking is checked against benchmark_baseline.json like the other
+benchmarks.
+"""
+import threading
+import time
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TransactionTestCase, tag
+from django.utils import timezone
+
+from core import availability, holds, layouts
+from core.models import Booking, Movie, Show, Theater
+
+from .benchmarks import SLACK, TOLERANCE, UPDATE, load_baseline, save_baseline
+
+WORKERS           = 8
+BOOKINGS_PER_USER = 5
+
+
+@tag("benchmark")
+@skipUnless(connection.vendor == "sqlite", "SQLite locking behaviour")
+class ConcurrentBookingTests(TransactionTestCase):
+    serialized_rollback = True      # keep the seat classes / layout from migrations
+
+    def setUp(self):
+        theater   = Theater.objects.create(name="Rush", city="Test")
+        self.movie = Movie.objects.create(title="Rush", description="-", duration=90,
+                                          release_date=timezone.localdate())
+        self.show = Show.objects.filter(movie=self.movie, theater=theater).first()
+        self.users = [User.objects.create_user(f"rush{i}") for i in range(WORKERS)]
+
+    def test_one_winner_per_seat(self):
+        seat    = layouts.plan(self.show.layout_id).seat_numbers[0]
+        results = []
+        start   = threading.Barrier(WORKERS)
+
+        def buyer(user):
+            try:
+                start.wait()
+                holds.claim(user, self.show, [seat])
+                results.append("won")
+            except holds.SeatUnavailable:
+                results.append("lost")
+            except Exception as exc:
+                results.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buyer, args=(user,)) for user in self.users]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(results), ["lost"] * (WORKERS - 1) + ["won"])
+
+    def test_concurrent_bookings(self):
+        seats  = layouts.plan(self.show.layout_id).seat_numbers
+        errors = []
+        start  = threading.Barrier(WORKERS)
+
+        def buyer(n, user):
+            try:
+                start.wait()
+                for i in range(BOOKINGS_PER_USER):
+                    seat = [seats[n * BOOKINGS_PER_USER + i]]
+                    holds.claim(user, self.show, seat)
+                    holds.confirm(user, self.movie, self.show, seat)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buyer, args=(n, user))
+                   for n, user in enumerate(self.users)]
+        began = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        per_booking = (time.perf_counter() - began) / (WORKERS * BOOKINGS_PER_USER)
+
+        self.assertEqual(errors, [])
+        total = WORKERS * BOOKINGS_PER_USER
+        self.assertEqual(Booking.objects.filter(show=self.show).count(), total)
+        show = Show.objects.get(pk=self.show.pk)
+        self.assertEqual(len(availability.unpack(layouts.plan(show.layout_id),
+                                                 show.seat_bitmap)), total)
+
+        if UPDATE:
+            save_baseline({"concurrency": {"booking": round(per_booking, 6)}})
+            return
+        baseline = load_baseline().get("concurrency", {}).get("booking")
+        if baseline:
+            self.assertLessEqual(
+                per_booking, baseline * TOLERANCE + SLACK,
+                f"a concurrent booking took {per_booking * 1000:.1f} ms "
+                f"(baseline {baseline * 1000:.1f} ms)")
@@ -0,0 +1,113 @@
+# core/tests/test_exports.py
+"""
+Booking export: CSV / NDJSON content, filters, the staff-only endpoint,
+and a query count that grows per chunk, not per booking.
+"""
+import csv
+import io
+import json
+import warnings
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import exports, holds, layouts
+from core.models import Booking, Movie, Show, Theater
+
+
+class BookingExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today       = timezone.localdate()
+        cls.theater = Theater.objects.create(name="Export", city="Test")
+        cls.other   = Theater.objects.create(name="Elsewhere", city="Test")
+        cls.movie   = Movie.objects.create(title="Ledger", description="-", duration=90,
+                                           release_date=today)
+        cls.user    = User.objects.create_user("buyer")
+        seats       = None
+        for theater in (cls.theater, cls.other):
+            show  = Show.objects.filter(movie=cls.movie, theater=theater).first()
+            seats = seats or layouts.plan(show.layout_id).seat_numbers
+            for i in range(3):
+                pair = seats[2 * i:2 * i + 2]
+                holds.claim(cls.user, show, pair)
+                holds.confirm(cls.user, cls.movie, show, pair)
+        cls.old = Booking.objects.order_by("id").first()
+        Booking.objects.filter(pk=cls.old.pk).update(
+            booking_time=timezone.now() - timedelta(days=10))
+
+    def export(self, fmt="csv", **filters):
+        return "".join(exports.lines(fmt, exports.bookings(**filters)))
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export())))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(list(rows[0]), exports.FIELDS)
+        first = Booking.objects.order_by("id").first()
+        self.assertEqual(int(rows[0]["booking_id"]), first.id)
+        self.assertEqual(rows[0]["seats"].split(), sorted(s.seat_number for s in first.seats.all()))
+        self.assertEqual(rows[0]["total_price"], str(first.total_price))
+        self.assertEqual(json.loads(rows[0]["price_breakdown"]), first.price_breakdown)
+
+    def test_ndjson(self):
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["movie"], "Ledger")
+        self.assertIsInstance(rows[0]["price_breakdown"], dict)
+
+    def test_filters(self):
+        today = timezone.localdate()
+        self.assertEqual(len(self.export("ndjson", theater=self.theater.id).splitlines()), 3)
+        self.assertEqual(len(self.export("ndjson", start=today).splitlines()), 5)
+        self.assertEqual(len(self.export("ndjson", end=today - timedelta(days=1))
+                             .splitlines()), 1)
+
+    def test_queries_per_chunk_not_per_booking(self):
+        # one streamed bookings query + one seats query per chunk of 2
+        with self.assertNumQueries(1 + 3):
+            list(exports.rows(exports.bookings(), chunk_size=2))
+
+    def test_endpoint_is_staff_only_and_streams(self):
+        url = reverse("export_bookings")
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        staff = User.objects.create_user("finance", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(url, {"format": "ndjson", "movie": self.movie.id})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(len(body.splitlines()), 6)
+        self.assertEqual(self.client.get(url, {"from": "yesterday"}).status_code, 400)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command("export_bookings", "--format", "csv",
+                     "--theater", str(self.other.id), stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 4)     # header + 3
+
+    def test_async_lines_come_a_chunk_at_a_time(self):
+        async def collect():
+            return [part async for part in exports.alines("ndjson", exports.bookings(),
+                                                          chunk_size=2)]
+        parts = async_to_sync(collect)()
+        self.assertEqual([len(part.splitlines()) for part in parts], [2, 2, 2])
+        self.assertEqual("".join(parts), self.export("ndjson"))
+
+    async def test_asgi_endpoint_streams_without_buffering(self):
+        staff = await User.objects.acreate(username="finance", is_staff=True)
+        await self.async_client.aforce_login(staff)
+        response = await self.async_client.get(reverse("export_bookings"),
+                                               {"format": "ndjson"})
+        self.assertTrue(response.is_async)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")     # the "synchronous iterator" fallback warns
+            body = b"".join([part async for part in response])
+        self.assertEqual(len(body.splitlines()), 6)
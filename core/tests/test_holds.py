@@ -0,0 +1,64 @@
+# core/tests/test_holds.py
+"""
+Seat holds: one winner per seat, lapsed holds are up for grabs again and
+can't be paid for, and bad selections aren't reported as taken seats.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import holds, layouts
+from core.models import Booking, Movie, SeatHold, Show, Theater
+
+
+class SeatHoldTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Holds", city="Test")
+        cls.movie   = Movie.objects.create(title="Hold On", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        cls.show    = Show.objects.filter(movie=cls.movie, theater=cls.theater).first()
+        cls.seat    = layouts.plan(cls.show.layout_id).seat_numbers[0]
+        cls.alice   = User.objects.create_user("alice")
+        cls.bob     = User.objects.create_user("bob")
+
+    def lapse(self, user):
+        SeatHold.objects.filter(user=user).update(
+            expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_same_seat_has_one_winner(self):
+        holds.claim(self.alice, self.show, [self.seat])
+        with self.assertRaises(holds.SeatUnavailable) as caught:
+            holds.claim(self.bob, self.show, [self.seat])
+        self.assertEqual(caught.exception.seat_numbers, [self.seat])
+        self.assertEqual(list(SeatHold.objects.values_list("user", flat=True)),
+                         [self.alice.id])
+
+    def test_lapsed_hold_can_be_reclaimed_and_not_paid(self):
+        holds.claim(self.alice, self.show, [self.seat])
+        self.lapse(self.alice)
+        holds.claim(self.bob, self.show, [self.seat])
+
+        with self.assertRaises(holds.HoldExpired):
+            holds.confirm(self.alice, self.movie, self.show, [self.seat])
+        self.assertFalse(Booking.objects.exists())
+        holds.confirm(self.bob, self.movie, self.show, [self.seat])
+
+    def test_invalid_selection(self):
+        with self.assertRaises(holds.InvalidSelection):
+            holds.claim(self.alice, self.show, [])
+        with self.assertRaises(holds.InvalidSelection) as caught:
+            holds.claim(self.alice, self.show, [self.seat, "ZZ9"])
+        self.assertEqual(caught.exception.seat_numbers, ["ZZ9"])
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_view_answers_unknown_seats_with_400(self):
+        self.client.force_login(self.alice)
+        response = self.client.post(reverse("book_movie", args=[self.movie.id]),
+                                    {"show_id": self.show.id, "selected_seats": "ZZ9"})
+        self.assertEqual(response.status_code, 400)
+        self.assertContains(response, "ZZ9 don&#x27;t exist", status_code=400)
+        self.assertNotContains(response, "just taken", status_code=400)
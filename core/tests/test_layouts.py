@@ -0,0 +1,85 @@
+# core/tests/test_layouts.py
+"""
+Seat plans: built from a layout's rows, shared by its shows, rebuilt when
+rows or seat classes change (also when another worker made the change),
+and a custom layout works end to end through booking.
+"""
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from core import api_cache, availability, holds, layouts
+from core.models import LayoutRow, Movie, Seat, SeatClass, SeatLayout, Show, Theater
+
+
+class SeatPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.box    = SeatClass.objects.create(name="Box", color="#800000", default_price=500)
+        cls.stalls = SeatClass.objects.create(name="Stalls", color="#008000", default_price=90)
+        cls.layout = SeatLayout.objects.create(name="Studio")
+        LayoutRow.objects.bulk_create([
+            LayoutRow(layout=cls.layout, label="S", seat_count=4, seat_class=cls.stalls, position=1),
+            LayoutRow(layout=cls.layout, label="B", seat_count=2, seat_class=cls.box, position=2),
+        ])
+        layouts.forget(cls.layout.id)           # bulk_create sent no signal
+        cls.theater = Theater.objects.create(name="Studio", city="Test", layout=cls.layout)
+        cls.movie   = Movie.objects.create(title="Small Room", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        cls.show    = Show.objects.filter(theater=cls.theater).first()
+
+    def setUp(self):
+        layouts.forget(self.layout.id)          # rolled-back edits of other tests
+
+    def test_plan(self):
+        plan = layouts.plan(self.layout.id)
+        self.assertEqual(plan.seat_numbers, ["S1", "S2", "S3", "S4", "B1", "B2"])
+        self.assertEqual(plan.rows[1], {"row": "B", "seats": 2,
+                                        "class": "Box", "color": "#800000"})
+        self.assertEqual(plan.seat_class["B2"], self.box.id)
+        self.assertEqual(plan.order(["B1", "X9", "S2"]), ["X9", "S2", "B1"])
+        self.assertNotIn("S5", plan)
+        self.assertEqual(self.show.capacity, 6)
+
+    def test_plan_is_cached(self):
+        layouts.plan(self.layout.id)
+        with self.assertNumQueries(0):
+            layouts.plan(self.layout.id)
+
+    def test_edits_rebuild_the_plan(self):
+        layouts.plan(self.layout.id)
+        self.box.color = "#000080"
+        self.box.save()
+        self.assertEqual(layouts.plan(self.layout.id).rows[1]["color"], "#000080")
+
+        row = LayoutRow.objects.get(layout=self.layout, label="S")
+        row.seat_class = self.box
+        row.save()
+        self.assertEqual(layouts.plan(self.layout.id).seat_class["S1"], self.box.id)
+
+    def test_another_workers_edit_rebuilds_the_plan(self):
+        layouts.plan(self.layout.id)
+        SeatClass.objects.filter(pk=self.box.pk).update(name="Royal Box")   # no signal here
+        api_cache.bump("layouts")                                          # … the bump it sent
+        self.assertEqual(layouts.plan(self.layout.id).rows[1]["class"], "Royal Box")
+
+    def test_materialize(self):
+        seats = layouts.materialize(self.show, ["B1", "S4", "Z1"])
+        self.assertEqual(sorted(seats.values_list("seat_number", "seat_class")),
+                         [("B1", self.box.id), ("S4", self.stalls.id)])
+        layouts.materialize(self.show, ["B1"])                 # existing rows are reused
+        self.assertEqual(Seat.objects.filter(show=self.show).count(), 2)
+
+    def test_booking_on_custom_layout(self):
+        user = User.objects.create_user("studio")
+        holds.claim(user, self.show, ["B2", "S1"])
+        booking = holds.confirm(user, self.movie, self.show, ["B2", "S1"])
+
+        self.assertEqual(booking.total_price, Decimal("590.00"))
+        self.assertEqual(set(booking.price_breakdown), {"Box", "Stalls"})
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.booked_count, 2)
+        self.assertEqual(availability.seat_map_for([self.show])[self.show.id]["booked"],
+                         ["S1", "B2"])
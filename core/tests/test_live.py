@@ -0,0 +1,71 @@
+# core/tests/test_live.py
+"""
+Live seat push: the SSE stream's snapshot + deltas, unsubscribe on
+disconnect, the overflow resync, and the one-shot WSGI fallback.
+"""
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import holds, layouts, live
+from core.models import Movie, Show, Theater
+
+
+def parse(chunk):
+    """'event: x\\ndata: {...}\\n\\n' → (x, {...})"""
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+class LiveSeatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        theater   = Theater.objects.create(name="Live", city="Test")
+        movie     = Movie.objects.create(title="Live", description="-", duration=90,
+                                         release_date=timezone.localdate())
+        cls.show  = Show.objects.filter(movie=movie, theater=theater).first()
+        cls.seats = layouts.plan(cls.show.layout_id).seat_numbers
+        holds.claim(User.objects.create_user("early"), cls.show, cls.seats[:1])
+
+    async def test_snapshot_then_deltas_then_unsubscribe(self):
+        stream = live.stream(self.show.id)
+        self.assertEqual(parse(await anext(stream)), ("snapshot", {"booked": self.seats[:1]}))
+        self.assertIn(self.show.id, live._broadcasters)
+
+        await sync_to_async(live.publish)(self.show.id, taken=self.seats[1:3])
+        await sync_to_async(live.publish)(self.show.id, released=self.seats[:1])
+        self.assertEqual(parse(await anext(stream)),
+                         ("delta", {"taken": self.seats[1:3], "released": []}))
+        self.assertEqual(parse(await anext(stream)),
+                         ("delta", {"taken": [], "released": self.seats[:1]}))
+
+        await stream.aclose()                       # browser went away
+        self.assertNotIn(self.show.id, live._broadcasters)
+
+    async def test_overflow_resends_a_snapshot(self):
+        with mock.patch.object(live, "QUEUE_SIZE", 1):
+            stream = live.stream(self.show.id)
+            await anext(stream)
+        for seat in self.seats[1:4]:
+            live.publish(self.show.id, taken=[seat])
+        event, data = parse(await anext(stream))
+        self.assertEqual((event, data), ("snapshot", {"booked": self.seats[:1]}))
+        await stream.aclose()
+
+    def test_publish_without_watchers_is_a_no_op(self):
+        live.publish(self.show.id, taken=self.seats[:1])
+        live.publish(self.show.id)
+        self.assertNotIn(self.show.id, live._broadcasters)
+
+    def test_wsgi_fallback_answers_one_snapshot(self):
+        response = self.client.get(reverse("seat_events", args=[self.show.id]))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        body = response.content.decode()
+        self.assertTrue(body.startswith("retry: 5000\n"))
+        self.assertEqual(parse(body.split("\n", 1)[1]), ("snapshot", {"booked": self.seats[:1]}))
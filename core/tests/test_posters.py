@@ -0,0 +1,90 @@
+# core/tests/test_posters.py
+"""
+Poster variants from the admin: built from the upload before the movie is
+saved (one write), only when the poster changes, the replaced poster's
+files deleted, and a bad image is reported instead of failing the save.
+"""
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from core import posters
+from core.models import Movie
+
+
+def upload(name="poster.png", size=(400, 600)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, "navy").save(buf, "PNG")
+    return SimpleUploadedFile(name, buf.getvalue(), content_type="image/png")
+
+
+class PosterAdminTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        self.settings = override_settings(MEDIA_ROOT=media)
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+        self.client.force_login(User.objects.create_superuser("admin"))
+
+    def form(self, **fields):
+        return {"title": "Poster Child", "description": "-", "duration": 90,
+                "release_date": timezone.localdate().isoformat(), **fields}
+
+    def test_upload_builds_variants_in_a_single_write(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("admin:core_movie_add"),
+                                        self.form(poster=upload()))
+        self.assertEqual(response.status_code, 302)
+        movie = Movie.objects.get(title="Poster Child")
+        self.assertEqual([w for w, _ in movie.poster_variants["webp"]], [160, 320, 400])
+        self.assertTrue(all(movie.poster.storage.exists(name)
+                            for _, name in movie.poster_variants["jpg"]))
+        self.assertFalse([q for q in queries if q["sql"].startswith('UPDATE "core_movie"')])
+
+    def test_edit_without_new_poster_does_not_rebuild(self):
+        self.client.post(reverse("admin:core_movie_add"), self.form(poster=upload()))
+        movie = Movie.objects.get(title="Poster Child")
+        with mock.patch.object(posters, "build_variants") as build:
+            self.client.post(reverse("admin:core_movie_change", args=[movie.pk]),
+                             self.form(title="Renamed"))
+        build.assert_not_called()
+        self.assertTrue(Movie.objects.get(pk=movie.pk).poster_variants)
+
+    def test_new_poster_removes_old_variants(self):
+        self.client.post(reverse("admin:core_movie_add"), self.form(poster=upload()))
+        movie   = Movie.objects.get(title="Poster Child")
+        storage = movie.poster.storage
+        old     = [name for _, name in movie.poster_variants["jpg"]]
+        Movie.objects.create(title="Twin", description="-", duration=90,
+                             release_date=timezone.localdate(), poster=movie.poster.name,
+                             poster_variants=movie.poster_variants)
+
+        self.client.post(reverse("admin:core_movie_change", args=[movie.pk]),
+                         self.form(poster=upload("new.png", (300, 450))))
+        self.assertTrue(all(storage.exists(name) for name in old))    # still Twin's poster
+
+        movie.refresh_from_db()
+        replaced = [name for _, name in movie.poster_variants["jpg"]]
+        self.client.post(reverse("admin:core_movie_change", args=[movie.pk]),
+                         self.form(poster=upload("newer.png", (300, 450))))
+        movie.refresh_from_db()
+        self.assertFalse(any(storage.exists(name) for name in replaced))
+        self.assertTrue(all(storage.exists(name) for _, name in movie.poster_variants["jpg"]))
+
+    def test_bad_image_is_reported_not_fatal(self):
+        with mock.patch.object(posters, "build_variants", side_effect=OSError("truncated")):
+            response = self.client.post(reverse("admin:core_movie_add"),
+                                        self.form(poster=upload()), follow=True)
+        self.assertContains(response, "Poster variants not built (truncated)")
+        self.assertEqual(Movie.objects.get(title="Poster Child").poster_variants, {})
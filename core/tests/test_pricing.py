@@ -0,0 +1,97 @@
+# core/tests/test_pricing.py
+"""
+Seat pricing: a show's ShowPrice override beats the class default, and
+quote() prices mixed seat classes into a total plus per-class breakdown.
+Migration 0023 (overrides only) leaves every price where it was.
+"""
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.test import TestCase
+from django.utils import timezone
+
+from core import pricing
+from core.models import Movie, SeatClass, Show, ShowPrice, Theater
+
+
+class PricingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.premium = SeatClass.objects.get(name="Premium")     # Standard rows A–B
+        cls.regular = SeatClass.objects.get(name="Regular")     # Standard rows C–E
+        SeatClass.objects.filter(pk=cls.premium.pk).update(default_price=200)
+        SeatClass.objects.filter(pk=cls.regular.pk).update(default_price=120)
+        Theater.objects.create(name="Prices", city="Test")
+        movie     = Movie.objects.create(title="Priced", description="-", duration=90,
+                                         release_date=timezone.localdate())
+        cls.show, cls.other = Show.objects.filter(movie=movie).order_by("show_time")[:2]
+
+    def prices(self, show):
+        return dict(pricing.show_prices(show.id).values_list("name", "price"))
+
+    def test_defaults_without_overrides(self):
+        self.assertEqual(self.prices(self.show),
+                         {"Premium": Decimal("200.00"), "Regular": Decimal("120.00")})
+
+    def test_override_beats_default_for_its_show_only(self):
+        ShowPrice.objects.create(show=self.show, seat_class=self.premium, price=250)
+        self.assertEqual(self.prices(self.show),
+                         {"Premium": Decimal("250.00"), "Regular": Decimal("120.00")})
+        self.assertEqual(self.prices(self.other)["Premium"], Decimal("200.00"))
+
+    def test_quote_mixed_classes(self):
+        ShowPrice.objects.create(show=self.show, seat_class=self.regular, price="99.50")
+        total, breakdown = pricing.quote(self.show, ["C2", "A1", "C1", "A1", "Z9"])
+        self.assertEqual(total, Decimal("399.00"))
+        self.assertEqual(breakdown, {
+            "Premium": {"seats": ["A1"], "price": "200.00", "subtotal": "200.00"},
+            "Regular": {"seats": ["C1", "C2"], "price": "99.50", "subtotal": "199.00"},
+        })
+
+    def test_quote_nothing(self):
+        self.assertEqual(pricing.quote(self.show, []), (Decimal("0.00"), {}))
+
+    def test_quote_is_one_query(self):
+        pricing.quote(self.show, ["A1"])                # seat plan cached
+        with self.assertNumQueries(1):
+            pricing.quote(self.show, ["A1", "C1", "E10"])
+
+
+class OverridesOnlyMigrationTests(TestCase):
+    """0023 drops ShowPrice rows equal to the default; prices stay the same."""
+    migration = import_module("core.migrations.0023_showprice_overrides_only")
+
+    @classmethod
+    def setUpTestData(cls):
+        Theater.objects.create(name="Migrated", city="Test")
+        movie     = Movie.objects.create(title="Old Prices", description="-", duration=90,
+                                         release_date=timezone.localdate())
+        cls.shows = list(Show.objects.filter(movie=movie))
+        premium   = SeatClass.objects.get(name="Premium")
+        # pre-0023 data: a full row per show and class, one of them custom
+        ShowPrice.objects.bulk_create(
+            [ShowPrice(show=show, seat_class=c, price=c.default_price)
+             for show in cls.shows for c in SeatClass.objects.all()])
+        ShowPrice.objects.filter(show=cls.shows[0], seat_class=premium).update(price=999)
+
+    def prices(self):
+        return {show.id: dict(pricing.show_prices(show.id).values_list("name", "price"))
+                for show in self.shows}
+
+    def test_forward_keeps_prices_and_only_overrides(self):
+        before = self.prices()
+        self.migration.drop_default_prices(apps, None)
+        self.assertEqual(self.prices(), before)
+        self.assertEqual(list(ShowPrice.objects.values_list("show", "price")),
+                         [(self.shows[0].id, Decimal("999.00"))])
+
+    def test_reverse_restores_full_rows(self):
+        self.migration.drop_default_prices(apps, None)
+        before = self.prices()
+        self.migration.restore_default_prices(apps, None)
+        self.assertEqual(self.prices(), before)
+        self.assertEqual(ShowPrice.objects.count(),
+                         Show.objects.count() * SeatClass.objects.count())
+        self.assertEqual(ShowPrice.objects.get(show=self.shows[0], price=999).seat_class.name,
+                         "Premium")
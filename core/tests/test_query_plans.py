@@ -0,0 +1,88 @@
+# core/tests/test_query_plans.py
+"""
+EXPLAIN QUERY PLAN regression tests: the hot schedule / booking lookups
+must be answered from an index, never by scanning a whole table.
+"""
+import re
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from core import scheduling, search
+from core.models import Booking, Movie, SalesRollup, SeatHold, Show, Theater
+
+FULL_SCAN = re.compile(r"\bSCAN (core_\w+)(?! USING (?:COVERING )?INDEX)")
+
+
+@skipUnless(connection.vendor == "sqlite", "plans are checked on SQLite")
+class HotQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Plan", city="Test")
+        cls.movie   = Movie.objects.create(title="Plan", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        cls.show    = Show.objects.filter(movie=cls.movie).first()
+        cls.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def assertIndexed(self, queryset):
+        plan = queryset.explain()
+        self.assertIsNone(FULL_SCAN.search(plan),
+                          f"full table scan in plan:\n{plan}\nfor:\n{queryset.query}")
+
+    def test_shows_for_theater_and_movie(self):           # get_shows
+        self.assertIndexed(scheduling.shows_on(self.tomorrow,
+                                               theater_id=self.theater.id,
+                                               movie_id=self.movie.id)
+                                     .order_by("show_time"))
+
+    def test_shows_for_movie(self):                       # book_movie
+        self.assertIndexed(scheduling.shows_on(self.tomorrow, movie=self.movie))
+
+    def test_expired_shows(self):                         # core.archive
+        self.assertIndexed(scheduling.shows_before(timezone.localdate()))
+
+    def test_schedule_window(self):                       # scheduling.generate
+        start, end = scheduling.day_bounds(self.tomorrow, 7)
+        self.assertIndexed(Show.objects.filter(show_time__gte=start, show_time__lt=end)
+                                       .values_list("movie_id", "theater_id", "show_time"))
+
+    def test_exact_title(self):                           # search's title pass
+        self.assertIndexed(search.exact_titles("plan").values_list("id", flat=True))
+
+    def test_bookings_for_show(self):                     # seat bitmap rebuild
+        self.assertIndexed(Booking.objects.filter(show=self.show)
+                                          .values_list("seats__seat_number", flat=True))
+
+    def test_active_holds(self):                          # seat map holds overlay
+        self.assertIndexed(SeatHold.objects.filter(show__in=[self.show],
+                                                   booking__isnull=True,
+                                                   expires_at__gt=timezone.now()))
+
+    def test_city_overview(self):                         # browse_shows
+        start, end = scheduling.day_bounds(self.tomorrow)
+        self.assertIndexed(Show.objects.filter(theater__city="Test",
+                                               show_time__gte=start, show_time__lt=end)
+                                       .order_by("show_time", "theater__name"))
+
+    def test_admin_bookings_by_month(self):               # BookingAdmin date hierarchy
+        start, end = scheduling.day_bounds(timezone.localdate().replace(day=1), 31)
+        self.assertIndexed(Booking.objects.filter(booking_time__gte=start,
+                                                  booking_time__lt=end)
+                                          .order_by("-booking_time"))
+
+    def test_sales_dashboard(self):                       # SalesRollupAdmin
+        today = timezone.localdate()
+        plan  = (SalesRollup.objects.filter(day__gte=today - timedelta(days=29), day__lte=today)
+                                    .values("day", "seat_class")
+                                    .annotate(Sum("tickets"), Sum("revenue"))
+                                    .explain())
+        self.assertIn("USING COVERING INDEX sales_rollup_covering", plan)
+
+    def test_show_day_filter_needs_ranges(self):
+        """Guard the premise: show_time__date wraps the column and scans."""
+        plan = Show.objects.filter(show_time__date=self.tomorrow).explain()
+        self.assertRegex(plan, FULL_SCAN)
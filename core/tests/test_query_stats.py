@@ -0,0 +1,57 @@
+# core/tests/test_query_stats.py
+"""
+Per-request SQL stats: response headers or one JSON log line, depending on
+QUERY_STATS, and a warning for every slow query.
+"""
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.middleware import query_stats
+from core.models import Movie, Theater
+
+STATS_MIDDLEWARE = "core.middleware.query_stats.QueryStatsMiddleware"
+
+
+@override_settings(MIDDLEWARE=[STATS_MIDDLEWARE,
+                               *(m for m in settings.MIDDLEWARE if m != STATS_MIDDLEWARE)],
+                   QUERY_STATS="log")
+class QueryStatsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Stats", city="Test")
+        Movie.objects.create(title="Counted", description="-", duration=90,
+                             release_date=timezone.localdate())
+        cls.url = reverse("search_movies")
+
+    @override_settings(QUERY_STATS="headers")
+    def test_headers(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"q": "counted"})
+        self.assertEqual(response["X-DB-Queries"], "2")
+        self.assertGreaterEqual(float(response["X-DB-Time-ms"]), 0)
+        self.assertEqual(response["X-DB-Duplicates"], "0")
+
+    def test_log_line(self):
+        with self.assertLogs("core.queries", "INFO") as logs:
+            response = self.client.get(self.url, {"q": "counted"})
+        self.assertNotIn("X-DB-Queries", response)
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(line["view"], "search_movies")
+        self.assertEqual((line["method"], line["status"], line["queries"]), ("GET", 200, 2))
+
+    def test_slow_queries_are_logged(self):
+        with mock.patch.object(query_stats, "SLOW_MS", 0), \
+             self.assertLogs("core.queries", "WARNING") as logs:
+            self.client.get(self.url, {"q": "counted"})
+        self.assertTrue(logs.records)
+        self.assertIn("slow query", logs.records[0].getMessage())
+        self.assertIn("search_movies", logs.records[0].getMessage())
+
+    def test_fingerprint_collapses_in_lists(self):
+        self.assertEqual(query_stats.fingerprint("WHERE id IN (%s, %s, %s)"),
+                         query_stats.fingerprint("WHERE id IN (%s, %s)"))
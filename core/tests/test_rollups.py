@@ -0,0 +1,108 @@
+# core/tests/test_rollups.py
+"""
+Sales rollups: kept in step by bookings, untouched by archiving, equal to
+a full rebuild, and the admin dashboard reads nothing else.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import ProtectedError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import archive, holds, layouts, rollups
+from core.models import Booking, Movie, SalesRollup, Show, Theater
+
+
+def snapshot():
+    return sorted(SalesRollup.objects.values_list("day", "movie_id", "theater_id",
+                                                  "seat_class", "tickets", "revenue"))
+
+
+class SalesRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Rollup", city="Test")
+        cls.movie   = Movie.objects.create(title="Sums", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        cls.user    = User.objects.create_user("buyer")
+        cls.shows   = list(Show.objects.filter(movie=cls.movie, theater=cls.theater)
+                                       .order_by("show_time")[:2])
+        cls.plan    = layouts.plan(cls.shows[0].layout_id)
+
+    def buy(self, show, seats):
+        holds.claim(self.user, show, seats)
+        return holds.confirm(self.user, self.movie, show, seats)
+
+    def test_booking_updates_rollups(self):
+        seats   = self.plan.seat_numbers
+        first   = self.buy(self.shows[0], [seats[0], seats[-1]])   # front + back row
+        second  = self.buy(self.shows[1], [seats[1]])
+        rows    = SalesRollup.objects.filter(movie=self.movie, theater=self.theater)
+        self.assertEqual(sum(r.tickets for r in rows), 3)
+        self.assertEqual(sum(r.revenue for r in rows),
+                         first.total_price + second.total_price)
+        self.assertEqual({r.seat_class for r in rows}, set(first.price_breakdown))
+
+    def test_delete_takes_booking_back_out(self):
+        booking = self.buy(self.shows[0], self.plan.seat_numbers[:2])
+        booking.delete()
+        self.assertFalse(SalesRollup.objects.exists())
+
+    def test_movie_deletable_once_its_bookings_are_gone(self):
+        self.buy(self.shows[0], self.plan.seat_numbers[:1])
+        kept = self.buy(self.shows[1], self.plan.seat_numbers[:2])
+        Booking.objects.filter(show=self.shows[0]).delete()
+        self.assertEqual(sum(SalesRollup.objects.values_list("tickets", flat=True)), 2)
+        kept.delete()
+        self.movie.delete()
+        self.assertFalse(Movie.objects.filter(pk=self.movie.pk).exists())
+
+    def test_sales_protect_movie_and_theater(self):
+        self.buy(self.shows[0], self.plan.seat_numbers[:2])
+        before = snapshot()
+        for obj in (self.movie, self.theater):
+            with self.assertRaises(ProtectedError):
+                obj.delete()
+        self.assertEqual(snapshot(), before)
+        self.assertTrue(Booking.objects.filter(show=self.shows[0]).exists())
+
+    def test_failed_checkout_counts_nothing(self):
+        with self.assertRaises(holds.HoldExpired):
+            holds.confirm(self.user, self.movie, self.shows[0], self.plan.seat_numbers[:1])
+        self.assertFalse(SalesRollup.objects.exists())
+
+    def test_archive_keeps_rollups_and_rebuild_matches(self):
+        self.buy(self.shows[0], self.plan.seat_numbers[:2])
+        self.buy(self.shows[1], self.plan.seat_numbers[2:5])
+        before = snapshot()
+
+        Show.objects.filter(pk=self.shows[0].pk).update(
+            show_time=timezone.now() - timedelta(days=3))
+        archive.archive()
+        self.assertEqual(Booking.objects.filter(show=self.shows[0]).count(), 0)
+        self.assertEqual(snapshot(), before)
+
+        SalesRollup.objects.all().delete()
+        rollups.rebuild()
+        self.assertEqual(snapshot(), before)
+
+    def test_dashboard(self):
+        booking = self.buy(self.shows[0], self.plan.seat_numbers[:2])
+        today   = timezone.localdate()
+        data    = rollups.dashboard(today, today, theater=self.theater.id)
+        self.assertEqual(data["totals"], {"total_tickets": 2,
+                                          "total_revenue": booking.total_price})
+        self.assertEqual(data["by_show"][0]["movie_title"], "Sums")
+        self.assertEqual(rollups.dashboard(today - timedelta(days=7),
+                                           today - timedelta(days=1))["totals"],
+                         {"total_tickets": 0, "total_revenue": Decimal("0.00")})
+
+        staff = User.objects.create_superuser("finance")
+        self.client.force_login(staff)
+        response = self.client.get(reverse("admin:core_salesrollup_changelist"),
+                                   {"movie": self.movie.id})
+        self.assertContains(response, "Sums")
+        self.assertContains(response, f"₹{booking.total_price}")
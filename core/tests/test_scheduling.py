@@ -0,0 +1,83 @@
+# core/tests/test_scheduling.py
+"""
+Scheduling follows a movie's available_theaters, which are saved after
+the movie itself – through the admin or .set() later on – and never
+inserts a show twice.
+"""
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import holds, layouts, scheduling
+from core.models import Movie, Show, Theater
+
+
+class AvailableTheatersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Theater.objects.create(name="A", city="Test")
+        cls.b = Theater.objects.create(name="B", city="Test")
+
+    def theaters(self, movie):
+        return set(Show.objects.filter(movie=movie).values_list("theater_id", flat=True))
+
+    def test_admin_add_schedules_only_the_chosen_theaters(self):
+        self.client.force_login(User.objects.create_superuser("admin"))
+        response = self.client.post(reverse("admin:core_movie_add"), {
+            "title": "Limited", "description": "-", "duration": 90,
+            "release_date": timezone.localdate().isoformat(),
+            "available_theaters": [self.a.id],
+        })
+        self.assertEqual(response.status_code, 302)
+        movie = Movie.objects.get(title="Limited")
+        self.assertEqual(self.theaters(movie), {self.a.id})
+        self.assertEqual(Show.objects.filter(movie=movie).count(),
+                         scheduling.DAYS_AHEAD * len(scheduling.DEFAULT_TIMES))
+
+    def test_restricting_keeps_sold_shows_and_clearing_restores(self):
+        movie = Movie.objects.create(title="Wide", description="-", duration=90,
+                                     release_date=timezone.localdate())
+        self.assertEqual(self.theaters(movie), {self.a.id, self.b.id})
+        sold  = Show.objects.filter(movie=movie, theater=self.b).first()
+        buyer = User.objects.create_user("buyer")
+        holds.claim(buyer, sold, layouts.plan(sold.layout_id).seat_numbers[:1])
+
+        movie.available_theaters.set([self.a])
+        self.assertEqual(set(Show.objects.filter(movie=movie, theater=self.b)), {sold})
+
+        movie.available_theaters.clear()
+        self.assertEqual(Show.objects.filter(movie=movie, theater=self.b).count(),
+                         Show.objects.filter(movie=movie, theater=self.a).count())
+
+
+class GenerateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Once", city="Test")
+        cls.movie   = Movie.objects.create(title="Twice", description="-", duration=90,
+                                           release_date=timezone.localdate())
+
+    def test_rerun_is_a_noop(self):
+        before = Show.objects.count()
+        self.assertEqual(scheduling.generate(), 0)
+        self.assertEqual(Show.objects.count(), before)
+
+    def test_shows_already_inserted_are_skipped(self):
+        # what a second run sees when the first inserted after its read
+        existing = Show.objects.filter(movie=self.movie).order_by("show_time")
+        keys     = list(existing.values_list("movie_id", "theater_id", "show_time"))
+        count    = existing.count()
+        with mock.patch.object(Show.objects, "filter", return_value=Show.objects.none()):
+            scheduling.generate(movies=[self.movie])
+        self.assertEqual(Show.objects.filter(movie=self.movie).count(), count)
+        self.assertEqual(list(existing.values_list("movie_id", "theater_id", "show_time")), keys)
+
+    def test_show_is_unique(self):
+        show = Show.objects.filter(movie=self.movie).first()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Show.objects.create(movie=self.movie, theater=show.theater,
+                                show_time=show.show_time)
@@ -0,0 +1,113 @@
+# core/tests/test_search.py
+"""
+Movie search: ranking, prefix matching, pagination, index upkeep – and a
+100k-movie benchmark for the FTS5 query.
+"""
+import statistics
+import time
+from unittest import skipUnless
+
+from django.test import TestCase, tag
+from django.urls import reverse
+from django.utils import timezone
+
+from core import search
+from core.models import Movie
+
+
+def movie(title, description="-"):
+    return Movie.objects.create(title=title, description=description, duration=100,
+                                release_date=timezone.localdate())
+
+
+@skipUnless(search.enabled(), "FTS5 index is SQLite only")
+class MovieSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.wars   = movie("Star Wars", "A galaxy far, far away")
+        cls.trek   = movie("Star Trek", "Space, the final frontier")
+        cls.blurb  = movie("Docs", "A film about a star wars collector")
+        cls.other  = movie("Heat", "Cops and robbers in Los Angeles")
+
+    def titles(self, q, **kwargs):
+        return [m.title for m in search.search(q, **kwargs)[0]]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.titles("star wars"), ["Star Wars", "Docs"])
+
+    def test_prefix_matching(self):
+        self.assertEqual(self.titles("star wa"), ["Star Wars", "Docs"])
+        self.assertEqual(set(self.titles("sta")), {"Star Wars", "Star Trek", "Docs"})
+
+    def test_operators_are_plain_text(self):
+        self.assertEqual(self.titles('heat" OR "star'), [])
+        self.assertEqual(self.titles("  ---  "), [])
+
+    def test_pagination(self):
+        first, has_next = search.search("star", page=1, per_page=2)
+        second, more    = search.search("star", page=2, per_page=2)
+        self.assertTrue(has_next)
+        self.assertFalse(more)
+        self.assertEqual(len(first) + len(second), 3)
+        self.assertFalse({m.id for m in first} & {m.id for m in second})
+
+    def test_old_exact_title_beats_newer_description_hits(self):
+        exact = movie("Star")
+        Movie.objects.bulk_create(
+            [Movie(title=f"Feature {i}", description=f"a rising star, take {i}",
+                   duration=100, release_date=timezone.localdate())
+             for i in range(1200)])
+        search.rebuild()
+        movies, _ = search.search("star")
+        self.assertEqual(movies[0], exact)
+        # … once, even past the bm25 window's first page
+        second, _ = search.search("star", page=2)
+        self.assertNotIn(exact, second)
+        self.assertEqual(len(second), search.PER_PAGE)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.other.title = "Heatwave Express"
+        self.other.save()
+        self.assertEqual(self.titles("heatw"), ["Heatwave Express"])
+        self.other.delete()
+        self.assertEqual(self.titles("heatw"), [])
+
+    def test_endpoint_and_home_filter(self):
+        data = self.client.get(reverse("search_movies"), {"q": "trek"}).json()
+        self.assertEqual([r["title"] for r in data["results"]], ["Star Trek"])
+        self.assertFalse(data["has_next"])
+
+        response = self.client.get(reverse("home"), {"q": "trek"})
+        self.assertContains(response, "Star Trek")
+        self.assertNotContains(response, "Star Wars")
+
+
+@tag("benchmark")
+@skipUnless(search.enabled(), "FTS5 index is SQLite only")
+class MovieSearchScaleTests(TestCase):
+    MOVIES  = 100_000
+    WORDS   = ["star", "night", "river", "ghost", "city", "dream", "storm", "queen",
+               "shadow", "summer", "empire", "winter", "lost", "golden", "silent"]
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk insert (no signals), then index in one statement
+        today, w = timezone.localdate(), cls.WORDS
+        Movie.objects.bulk_create(
+            [Movie(title=f"{w[i % 15]} {w[i // 15 % 15]} {i}",
+                   description=f"{w[i // 7 % 15]} {w[i // 3 % 15]} story number {i}",
+                   duration=100, release_date=today)
+             for i in range(cls.MOVIES)], batch_size=5000)
+        search.rebuild()
+
+    def test_search_stays_fast(self):
+        for q in ["star", "gho", "silent winter", "empire 4242"]:
+            timings = []
+            for _ in range(5):
+                start = time.perf_counter()
+                movies, _ = search.search(q)
+                timings.append(time.perf_counter() - start)
+            self.assertTrue(movies, q)
+            self.assertLess(statistics.median(timings), 0.010,
+                            f"searching {q!r} over {self.MOVIES} movies took "
+                            f"{statistics.median(timings) * 1000:.1f} ms")
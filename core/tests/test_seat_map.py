@@ -0,0 +1,74 @@
+# core/tests/test_seat_map.py
+"""
+Per-show seat map endpoint: the compact encoding round-trips, held seats
+count as taken, and the cached copy is revalidated by ETag until a seat
+changes hands.
+"""
+import base64
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import availability, holds, layouts
+from core.models import Movie, SeatHold, Show, Theater
+
+
+def taken(payload):
+    """Decode the base64 bitmap against the rows, like book_movie.html does."""
+    bits, seats, i = base64.b64decode(payload["taken"]), [], 0
+    for row in payload["rows"]:
+        for c in range(1, row["seats"] + 1):
+            if bits[i >> 3] & (1 << (i & 7)):
+                seats.append(f"{row['row']}{c}")
+            i += 1
+    return seats
+
+
+class SeatMapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.theater = Theater.objects.create(name="Map", city="Test")
+        cls.movie   = Movie.objects.create(title="Seats", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        cls.show    = Show.objects.filter(movie=cls.movie).first()
+        cls.plan    = layouts.plan(cls.show.layout_id)
+        cls.user    = User.objects.create_user("picker")
+
+    def setUp(self):
+        cache.clear()                          # show ids repeat between test cases
+        self.url = reverse("seat_map", args=[self.show.id])
+
+    def test_encoding_round_trips(self):
+        seats = self.plan.seat_numbers
+        holds.claim(self.user, self.show, [seats[0], seats[-1]])
+        holds.confirm(self.user, self.movie, self.show, [seats[0], seats[-1]])
+        holds.claim(self.user, self.show, [seats[5]])            # held, not paid
+
+        show    = Show.objects.get(pk=self.show.pk)
+        payload = availability.compact_seat_map(
+            show, holds.active_holds([show]).get(show.id, ()))
+        self.assertEqual(payload["rows"], self.plan.rows)
+        self.assertEqual(taken(payload), [seats[0], seats[5], seats[-1]])
+
+    def test_etag_until_a_seat_is_claimed(self):
+        first = self.client.get(self.url)
+        self.assertEqual(taken(first.json()), [])
+        etag  = first["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        seat = self.plan.seat_numbers[3]
+        with self.captureOnCommitCallbacks(execute=True):
+            holds.claim(self.user, self.show, [seat])
+        again = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(taken(again.json()), [seat])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SeatHold.objects.filter(show=self.show).delete()    # lapsed / given up
+        self.assertEqual(taken(self.client.get(self.url).json()), [])
+
+    def test_unknown_show(self):
+        self.assertEqual(self.client.get(reverse("seat_map", args=[0])).status_code, 404)
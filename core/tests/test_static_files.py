@@ -0,0 +1,77 @@
+# core/tests/test_static_files.py
+"""
+Static build + serving: collectstatic writes hashed names, a manifest and
+gzip variants; templates link the hashed names; the middleware serves
+them immutable and precompressed per Accept-Encoding.
+"""
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware.static_files import StaticFilesMiddleware, accepted
+
+
+class StaticFilesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.root)
+        cls.settings = override_settings(STATIC_ROOT=cls.root, STATIC_URL="/static/")
+        cls.settings.enable()
+        cls.addClassCleanup(cls.settings.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        cls.hashed = staticfiles_storage.stored_name("core/css/style.css")
+
+    def setUp(self):
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("view"))
+        self.factory    = RequestFactory()
+
+    def get(self, path, **headers):
+        return self.middleware(self.factory.get(path, headers=headers))
+
+    def test_build(self):
+        self.assertRegex(self.hashed, r"^core/css/style\.[0-9a-f]{12}\.css$")
+        path = os.path.join(self.root, self.hashed)
+        with open(path, "rb") as f, gzip.open(path + ".gz") as packed:
+            self.assertEqual(packed.read(), f.read())
+        self.assertFalse(os.path.exists(                # not worth compressing
+            os.path.join(self.root, staticfiles_storage.stored_name("core/ground_login.jpg") + ".gz")))
+
+        html = Template("{% load static %}{% static 'core/css/style.css' %}").render(Context())
+        self.assertEqual(html, "/static/" + self.hashed)
+
+    def test_hashed_asset_is_immutable_and_precompressed(self):
+        plain = self.get("/static/" + self.hashed)
+        self.assertEqual(plain["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(plain["Content-Type"], "text/css")
+        self.assertEqual(plain["Vary"], "Accept-Encoding")
+        self.assertNotIn("Content-Encoding", plain)
+
+        packed = self.get("/static/" + self.hashed, accept_encoding="br;q=0, gzip")
+        self.assertEqual(packed["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(packed.content), plain.content)
+        self.assertLess(len(packed.content), len(plain.content))
+
+    def test_unhashed_asset_revalidates(self):
+        response = self.get("/static/core/css/style.css")
+        self.assertEqual(response["Cache-Control"], "public, max-age=60")
+        again = self.get("/static/core/css/style.css",
+                         if_modified_since=response["Last-Modified"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_unknown_paths_fall_through(self):
+        self.assertEqual(self.get("/static/core/missing.css").content, b"view")
+        self.assertEqual(self.get("/movies/").content, b"view")
+
+    def test_accepted(self):
+        self.assertEqual(accepted("gzip, deflate, br"), {"gzip", "deflate", "br"})
+        self.assertEqual(accepted("br;q=0, gzip;q=0.5"), {"gzip"})
+        self.assertEqual(accepted(""), set())
@@ -0,0 +1,120 @@
+# core/tests/test_tickets.py
+"""
+PDF tickets: one render per ticket HTML (cached on disk, shared while in
+flight), ETag / 304 on download, a real render through the pool, and a
+failing pool never fails a paid checkout.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import holds, layouts, tickets
+from core.models import Booking, Movie, Show, Theater
+
+
+def fake_render(html, path):
+    with open(path, "w") as f:
+        f.write(html)
+    return path
+
+
+class FakeExecutor:
+    """Hands out futures that finish only when the test says so."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.submitted.append((future, fn, args))
+        return future
+
+
+class TicketTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        theater     = Theater.objects.create(name="Tickets", city="Test")
+        cls.movie   = Movie.objects.create(title="Admit One", description="-", duration=90,
+                                           release_date=timezone.localdate())
+        show        = Show.objects.filter(movie=cls.movie, theater=theater).first()
+        cls.user    = User.objects.create_user("holder")
+        seats       = layouts.plan(show.layout_id).seat_numbers[:2]
+        holds.claim(cls.user, show, seats)
+        cls.booking = holds.confirm(cls.user, cls.movie, show, seats)
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        for patch in (mock.patch.object(tickets, "TICKET_DIR", self.dir),
+                      mock.patch.object(tickets, "_inflight", {})):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.html = tickets.ticket_html(self.booking)
+
+    def test_rendered_once_then_served_from_disk(self):
+        with mock.patch.object(tickets, "WORKERS", 0), \
+             mock.patch.object(tickets, "render_pdf", side_effect=fake_render) as render:
+            path = tickets.get_or_render(self.html)
+            self.assertEqual(tickets.get_or_render(self.html), path)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(path, tickets.locate(self.html)[1])
+        self.assertTrue(path.startswith(self.dir))
+
+    def test_in_flight_render_is_shared(self):
+        executor = FakeExecutor()
+        with mock.patch.object(tickets, "_executor", return_value=executor):
+            first, second = tickets._submit(self.html), tickets._submit(self.html)
+        self.assertIs(first, second)
+        self.assertEqual(len(executor.submitted), 1)
+
+        first.set_result(tickets.locate(self.html)[1])
+        self.assertEqual(tickets._inflight, {})          # done → forgotten
+
+    def test_download_etag_and_304(self):
+        self.client.force_login(self.user)
+        url = reverse("download_ticket_pdf", args=[self.booking.id])
+        with mock.patch.object(tickets, "WORKERS", 0), \
+             mock.patch.object(tickets, "render_pdf", side_effect=fake_render) as render:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            etag = response["ETag"]
+            self.assertEqual(b"".join(response.streaming_content).decode(), self.html)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(etag, f'"{tickets.locate(self.html)[0]}"')
+
+    def test_pool_renders_a_real_pdf(self):
+        path = tickets.get_or_render(self.html)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(5), b"%PDF-")
+        self.assertFalse([name for name in os.listdir(os.path.dirname(path))
+                          if name.endswith(".tmp")])
+
+    def test_broken_pool_is_replaced(self):
+        broken = mock.Mock(**{"submit.side_effect": BrokenProcessPool})
+        with mock.patch.object(tickets, "_pool", broken):
+            with self.assertRaises(BrokenProcessPool):
+                tickets._submit(self.html)
+            self.assertIsNone(tickets._pool)
+
+    def test_payment_survives_a_failing_pool(self):
+        show = self.booking.show
+        seat = layouts.plan(show.layout_id).seat_numbers[5]
+        self.client.force_login(self.user)
+        self.client.post(reverse("book_movie", args=[self.movie.id]),
+                         {"show_id": show.id, "selected_seats": seat})
+        with mock.patch.object(tickets, "render_async", side_effect=OSError("no fork")), \
+             self.assertLogs("core.views", "ERROR"):
+            response = self.client.post(reverse("payment", args=[self.movie.id]))
+        booking = Booking.objects.latest("id")
+        self.assertRedirects(response, reverse("booking_confirmation", args=[booking.id]),
+                             fetch_redirect_response=False)
+        self.assertEqual([s.seat_number for s in booking.seats.all()], [seat])
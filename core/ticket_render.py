@@ -0,0 +1,20 @@
+# core/ticket_render.py
+"""
+PDF rendering step run inside the ticket process pool (core.tickets).
+Kept free of Django imports so pool workers start cheaply.
+"""
+import os
+
+
+def render_pdf(html, path):
+    """Render `html` to `path` atomically (temp file + rename)."""
+    from xhtml2pdf import pisa
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as out:
+        status = pisa.CreatePDF(html, dest=out)
+    if status.err:
+        os.remove(tmp)
+        raise RuntimeError(f"xhtml2pdf reported {status.err} error(s)")
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,100 @@
+# core/tickets.py
+"""
+PDF tickets, rendered off the request path.
+
+A ticket is stored under MEDIA_ROOT/tickets/ named by the SHA-256 of its
+HTML, so identical tickets are rendered once and any change to the booking
+yields a new file.  Rendering runs in a bounded process pool: payment kicks
+it off as soon as a booking is confirmed, and the download view only waits
+for it on a cache miss.
+
+Pool workers are started with forkserver (spawn where that's missing),
+never plain fork: the web server is multithreaded, and a forked child can
+inherit a lock some other thread was holding and deadlock on it.
+"""
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from .ticket_render import render_pdf
+
+WORKERS        = getattr(settings, "TICKET_RENDER_WORKERS", 2)   # 0 ⟹ render inline
+RENDER_TIMEOUT = getattr(settings, "TICKET_RENDER_TIMEOUT", 30)  # seconds
+TICKET_DIR     = os.path.join(settings.MEDIA_ROOT, "tickets")
+
+_pool     = None
+_inflight = {}                 # digest → Future, so one ticket renders once
+_lock     = threading.Lock()
+
+
+def ticket_html(booking):
+    return get_template("core/booking_confirmation.html").render({
+        "booking": booking,
+        "movie":   booking.movie,
+        "total":   booking.total_price,
+        "show":    booking.show,
+        "seats":   booking.seats.all(),
+        "pdf":     True,
+    })
+
+
+def locate(html):
+    """(digest, path) of the cached PDF for this ticket HTML."""
+    digest = hashlib.sha256(html.encode()).hexdigest()
+    return digest, os.path.join(TICKET_DIR, digest[:2], f"{digest}.pdf")
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        method = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                  else "spawn")
+        _pool  = ProcessPoolExecutor(max_workers=WORKERS,
+                                     mp_context=multiprocessing.get_context(method))
+    return _pool
+
+
+def _reset():
+    global _pool
+    _pool = None
+
+
+def _submit(html):
+    digest, path = locate(html)
+    with _lock:
+        future = _inflight.get(digest)
+        if future is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                future = _executor().submit(render_pdf, html, path)
+            except BrokenProcessPool:
+                _reset()                # a worker died; the next call starts afresh
+                raise
+            _inflight[digest] = future
+            future.add_done_callback(lambda _: _inflight.pop(digest, None))
+    return future
+
+
+def render_async(booking):
+    """Start rendering `booking`'s ticket in the background (no-op if cached)."""
+    html = ticket_html(booking)
+    _, path = locate(html)
+    if WORKERS and not os.path.exists(path):
+        _submit(html)
+
+
+def get_or_render(html):
+    """Path of the PDF for `html`, rendering it now on a cache miss."""
+    _, path = locate(html)
+    if os.path.exists(path):
+        return path
+    if not WORKERS:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return render_pdf(html, path)
+    return _submit(html).result(timeout=RENDER_TIMEOUT)
@@ -1,25 +1,37 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 from django.contrib.auth.views import LogoutView
 from django.conf import settings
-from django.conf.urls.static import static
 # from .views import generate_pdf_ticket
 
+# ASGI deployments (moviebooking/asgi.py) get the booking widget's JSON
+# views as native async views; WSGI keeps the sync ones
+if settings.ASYNC_JSON_VIEWS:
+    get_movies, get_show_prices, get_shows = views.aget_movies, views.aget_show_prices, views.aget_shows
+else:
+    get_movies, get_show_prices, get_shows = views.get_movies, views.get_show_prices, views.get_shows
+
 urlpatterns = [
     path('', views.home, name='home'),
+    path('search/movies/', views.search_movies, name='search_movies'),
+    path('browse/', views.browse, name='browse'),
+    path('browse/shows/', views.browse_shows, name='browse_shows'),
+    path('exports/bookings/', views.export_bookings, name='export_bookings'),
     path('register/', views.register_view, name='register'),
     path('login/', views.login_view, name='login'),
     # path('register_login/', views.register_login_view, name='register_login'),
     path('logout/', LogoutView.as_view(next_page='home'), name='logout'),
     # path('generate-seats/<int:show_id>/', views.generate_seats, name='generate_seats'),
     # path('hierarchical-booking/', views.hierarchical_booking, name='hierarchical_booking'),
-    path('get-movies/<int:theater_id>/', views.get_movies, name='get_movies'),
+    path('get-movies/<int:theater_id>/', get_movies, name='get_movies'),
     
-    path('get-prices/<int:show_id>/', views.get_show_prices, name='get_prices'),
+    path('get-prices/<int:show_id>/', get_show_prices, name='get_prices'),
 
     path("payment/<int:movie_id>/", views.payment, name="payment"),
 
-    path('get-shows/<int:theater_id>/<int:movie_id>/',views.get_shows,name='get_shows'),
+    path('get-shows/<int:theater_id>/<int:movie_id>/',get_shows,name='get_shows'),
+    path('shows/<int:show_id>/seat-map/', views.show_seat_map, name='seat_map'),
+    path('shows/<int:show_id>/seat-events/', views.seat_events, name='seat_events'),
     path('book/<int:movie_id>/', views.book_movie, name='book_movie'),
     path("booking-confirmation/<int:booking_id>/",views.booking_confirmation,name="booking_confirmation",),
     
@@ -28,5 +40,7 @@ urlpatterns = [
 
 ]
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [
+        re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.*)$", views.serve_media),
+    ]
     
\ No newline at end of file
@@ -1,57 +1,65 @@
 from django.shortcuts import render,redirect,get_object_or_404
-from django.http import HttpResponse,JsonResponse
-from .models import Seat, Show, Movie,UserProfile,Booking,Theater,ShowPrice
+from django.http import HttpResponse,HttpResponseBadRequest,JsonResponse,FileResponse,StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import sync_to_async
+from .models import Show, Movie,UserProfile,Booking,Theater
 from django.contrib.auth import authenticate, login
 from .forms import UserRegistrationForm, LoginForm
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.utils import timezone
-import json
+from django.utils.dateparse import parse_datetime
+from django.urls import reverse
+import logging
+import math
+import re
+from django.conf import settings
+from django.views.static import serve
 from django.views.decorators.csrf import csrf_exempt
-from datetime import timedelta
-from decimal import Decimal
+from datetime import date, timedelta
+from urllib.parse import quote
+from . import admission, api_cache, availability, db, exports, holds, live, pricing, scheduling, search, tickets
+from django.utils.cache import get_conditional_response, patch_cache_control
 # from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 # from django.contrib.auth.models import User
-from django.template.loader import get_template
-from xhtml2pdf import pisa
 import io
 # from io import BytesIO
 # from weasyprint import HTML
 # import tempfile
 # from collections import defaultdict
 
+logger = logging.getLogger(__name__)
+
+HOME_PAGE_SIZE = 24
+BROWSE_CACHE_SECONDS = getattr(settings, "BROWSE_CACHE_SECONDS", 30)
+SEAT_MAP_CACHE_SECONDS = getattr(settings, "SEAT_MAP_CACHE_SECONDS", 30)
 
 
 @login_required
 def download_ticket_pdf(request, booking_id):
-    booking = get_object_or_404(Booking, id=booking_id, user=request.user)
-
-    # Load the same template you're using for confirmation
-    template_path = 'core/booking_confirmation.html'
-
-    context = {
-        'booking': booking,
-        'movie': booking.movie,
-        'total': booking.total_price,
-        'show': booking.show,
-        'seats': booking.seats.all(),
-        'pdf' : True
-    }
-
-    # Render the HTML
-    template = get_template(template_path)
-    html = template.render(context)
-
-    print("Total in PDF view:", total)
+    booking = get_object_or_404(Booking.objects.select_related("movie", "show__theater"),
+                                id=booking_id, user=request.user)
 
-    # Create a BytesIO buffer for the PDF
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="Ticket_{booking.id}.pdf"'
+    # The ticket HTML is cheap; its hash names the cached PDF
+    html      = tickets.ticket_html(booking)
+    digest, _ = tickets.locate(html)
+    etag      = f'"{digest}"'
 
-    pisa_status = pisa.CreatePDF(html, dest=response)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
 
-    if pisa_status.err:
-        return HttpResponse('We had some errors <pre>' + html + '</pre>')
+    try:
+        path = tickets.get_or_render(html)
+    except Exception:
+        return HttpResponse('We had some errors generating your ticket.', status=500)
+
+    response = FileResponse(open(path, "rb"), as_attachment=True,
+                            filename=f"Ticket_{booking.id}.pdf",
+                            content_type="application/pdf")
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, max_age=86400)
     return response
 
 @login_required
@@ -59,18 +67,10 @@ def booking_confirmation(request, booking_id):
     booking = get_object_or_404(Booking, id=booking_id)
     seats   = booking.seats.all()
 
-    total = 0
-    for seat in seats.select_related("seat_class"):
-        price = ShowPrice.objects.filter(
-                    show=booking.show,
-                    seat_class=seat.seat_class
-                ).first()
-        total += price.price if price else 0
-
     return render(request, "core/booking_confirmation.html", {
         "booking": booking,
         "seats":   seats,
-        "total":   total,
+        "total":   booking.total_price,
     })
 
 
@@ -88,124 +88,349 @@ def payment(request, movie_id):
         return redirect("book_movie", movie_id=movie.id)
 
     show  = get_object_or_404(Show, id=show_id)
-    seats = Seat.objects.filter(seat_number__in=seat_numbers, show=show)
 
-    # ── compute total ───────────────────────────────────────
-    total = Decimal("0.00")
-    for seat in seats.select_related("seat_class"):
-        price = ShowPrice.objects.filter(show=show,
-                                         seat_class=seat.seat_class).first()
-        total += price.price if price else 0
+    # the checkout slot from book_movie must still be live
+    scope = admission.movie_scope(movie.id)
+    if not admission.admitted(request, scope):
+        messages.error(request, "Your checkout time ran out – please pick your seats again.")
+        return redirect("book_movie", movie_id=movie.id)
+
+    # ── compute total (one query for all seats) ─────────────
+    total, _ = pricing.quote(show, seat_numbers)
 
-    # ── POST → "Pay now" clicked, create booking ────────────
+    # ── POST → "Pay now" clicked, turn the holds into a booking ─
     if request.method == "POST":
-        booking = Booking.objects.create(user=request.user,
-                                         movie=movie, show=show)
-        booking.seats.set(seats)
+        try:
+            booking = holds.confirm(request.user, movie, show, seat_numbers)
+        except db.DatabaseBusy:
+            # nothing was written and the holds still stand – let them retry
+            messages.error(request, "We're very busy right now – please try paying again.")
+            return redirect("payment", movie_id=movie.id)
+        except holds.HoldExpired:
+            booking = None
 
         # clear temporary session
-        for key in ("show_id", "seat_numbers"):
+        for key in ("show_id", "seat_numbers", "hold_expires"):
             request.session.pop(key, None)
-
+        if booking is None:
+            # the admission slot is kept on purpose: picking seats again is
+            # the same checkout, and if they leave, its lease runs out
+            messages.error(request, "Your seat hold expired – please pick your seats again.")
+            return redirect("book_movie", movie_id=movie.id)
+
+        admission.release(request, scope)  # next in the waiting room
+        try:
+            tickets.render_async(booking)  # PDF ready before it's asked for
+        except Exception:
+            # already paid – the download renders the PDF on demand instead
+            logger.exception("ticket pre-render failed for booking %s", booking.id)
         return redirect("booking_confirmation", booking_id=booking.id)
 
     # ── GET → display mock payment page ─────────────────────
-    return render(request, "core/payment.html", {
+    return render(request, "core/Payment.html", {
         "movie": movie,
         "show":  show,
         "seats": seat_numbers,
         "total_price": total,
+        "hold_expires": parse_datetime(request.session.get("hold_expires", "")),
     })
 
 
 def get_show_prices(request, show_id):
-    prices = (ShowPrice.objects
-              .filter(show_id=show_id)
-              .select_related('seat_class'))
-    data = {p.seat_class.name: float(p.price) for p in prices}
-    return JsonResponse({'prices': data})
+    def build():
+        # overrides for this show, class defaults for the rest
+        prices = pricing.show_prices(show_id).values_list('name', 'price')
+        return {'prices': {name: float(price) for name, price in prices}}
+
+    return api_cache.json_response(request, f"prices:{show_id}",
+                                   [f"prices:{show_id}", "seatclasses"], build)
 
 
 
 def get_movies(request, theater_id):
-    shows = Show.objects.filter(theater_id=theater_id).select_related('movie')
-    # unique movies per theater
-    movies = {}
-    for s in shows:
-        movies[s.movie.id] = s.movie.title
-    return JsonResponse(
-        {'movies': [{'id': pk, 'title': title} for pk, title in movies.items()]}
-    )
+    def build():
+        # unique movies per theater
+        movies = (Movie.objects.filter(show__theater_id=theater_id)
+                               .distinct()
+                               .order_by('id')
+                               .values_list('id', 'title'))
+        return {'movies': [{'id': pk, 'title': title} for pk, title in movies]}
+
+    return api_cache.json_response(request, f"movies:{theater_id}",
+                                   [f"theater:{theater_id}", "movies"], build)
 
 def get_shows(request, theater_id, movie_id):
-    tomorrow = timezone.now().date() + timedelta(days=1)
-    shows = (Show.objects
-             .filter(theater_id=theater_id,
-                     movie_id=movie_id,
-                     show_time__date=tomorrow)
-             .order_by('show_time'))
+    tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def build():
+        shows = (scheduling.shows_on(tomorrow,
+                                     theater_id=theater_id,
+                                     movie_id=movie_id)
+                 .order_by('show_time'))
+        return {'shows': [
+            {'id': s.id,
+             'time': s.show_time.strftime('%I:%M %p')}  # → 01:00 PM etc.
+            for s in shows
+        ]}
+
+    return api_cache.json_response(request,
+                                   f"shows:{theater_id}:{movie_id}:{tomorrow}",
+                                   [f"theater:{theater_id}"], build)
+
+
+def _browse_day(request):
+    try:
+        return date.fromisoformat(request.GET.get('date', ''))
+    except ValueError:
+        return timezone.localdate() + timedelta(days=1)
+
+
+def browse(request):
+    """City / date overview page – the table is filled from browse_shows."""
+    cities = (Theater.objects.order_by('city').values_list('city', flat=True).distinct())
+    return render(request, 'core/browse.html', {
+        'cities': cities,
+        'city':   request.GET.get('city', ''),
+        'day':    _browse_day(request),
+    })
+
+
+def browse_shows(request):
+    """Every show in ?city= on ?date= (default tomorrow) with its seats left."""
+    city = request.GET.get('city', '')
+    day  = _browse_day(request)
+
+    def build():
+        return {'city': city, 'date': day.isoformat(), 'shows': [
+            {'id':         s['id'],
+             'movie_id':   s['movie_id'],
+             'movie':      s['title'],
+             'theater':    s['theater_name'],
+             'time':       timezone.localtime(s['show_time']).strftime('%I:%M %p'),
+             'capacity':   s['capacity'],
+             'seats_left': max(s['seats_left'], 0)}
+            for s in availability.city_overview(city, day)
+        ]}
+
+    # seat counts change with every booking and bump no scope → short timeout
+    return api_cache.json_response(request, f"browse:{quote(city)}:{day}", ["movies"],
+                                   build, timeout=BROWSE_CACHE_SECONDS)
 
-    payload = [
-        {'id': s.id,
-         'time': s.show_time.strftime('%I:%M %p')}  # → 01:00 PM etc.
-        for s in shows
-    ]
-    return JsonResponse({'shows': payload})
+
+EXPORT_CONTENT_TYPES = {'csv': 'text/csv; charset=utf-8',
+                        'ndjson': 'application/x-ndjson'}
+
+
+@staff_member_required
+def export_bookings(request):
+    """
+    Bookings as a streamed CSV / NDJSON download (?format=csv|ndjson),
+    filtered by ?from= / ?to= (booking days, inclusive), ?theater=, ?movie=.
+    """
+    fmt = request.GET.get('format', 'csv')
+    try:
+        if fmt not in exports.FORMATS:
+            raise ValueError(fmt)
+        start   = exports.parse_day(request.GET.get('from'))
+        end     = exports.parse_day(request.GET.get('to'))
+        theater = int(request.GET['theater']) if request.GET.get('theater') else None
+        movie   = int(request.GET['movie']) if request.GET.get('movie') else None
+    except ValueError:
+        return HttpResponseBadRequest("format must be csv or ndjson, from/to YYYY-MM-DD, "
+                                      "theater/movie ids")
+
+    queryset = exports.bookings(start, end, theater, movie)
+    # ASGI only streams async iterators without buffering them whole
+    stream   = (exports.alines if isinstance(request, ASGIRequest) else exports.lines)
+    response = StreamingHttpResponse(stream(fmt, queryset),
+                                     content_type=EXPORT_CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="bookings.{fmt}"'
+    return response
+
+
+# ─────────────────────────────────────
+#  async versions of the JSON views – routed instead of the sync ones
+#  under ASGI (see settings.ASYNC_JSON_VIEWS / moviebooking/asgi.py)
+# ─────────────────────────────────────
+async def aget_show_prices(request, show_id):
+    async def build():
+        prices = pricing.show_prices(show_id).values_list('name', 'price')
+        return {'prices': {name: float(price) async for name, price in prices}}
+
+    return await api_cache.ajson_response(request, f"prices:{show_id}",
+                                          [f"prices:{show_id}", "seatclasses"], build)
+
+
+async def aget_movies(request, theater_id):
+    async def build():
+        movies = (Movie.objects.filter(show__theater_id=theater_id)
+                               .distinct()
+                               .order_by('id')
+                               .values_list('id', 'title'))
+        return {'movies': [{'id': pk, 'title': title} async for pk, title in movies]}
+
+    return await api_cache.ajson_response(request, f"movies:{theater_id}",
+                                          [f"theater:{theater_id}", "movies"], build)
+
+
+async def aget_shows(request, theater_id, movie_id):
+    tomorrow = timezone.localdate() + timedelta(days=1)
+
+    async def build():
+        shows = (scheduling.shows_on(tomorrow,
+                                     theater_id=theater_id,
+                                     movie_id=movie_id)
+                 .order_by('show_time')
+                 .values_list('id', 'show_time'))
+        return {'shows': [{'id': pk, 'time': show_time.strftime('%I:%M %p')}
+                          async for pk, show_time in shows]}
+
+    return await api_cache.ajson_response(request,
+                                          f"shows:{theater_id}:{movie_id}:{tomorrow}",
+                                          [f"theater:{theater_id}"], build)
+
+
+def show_seat_map(request, show_id):
+    """One show's seat map, compact: layout rows + base64 taken-bitmap."""
+    def build():
+        show = get_object_or_404(Show.objects.only('id', 'layout_id', 'seat_bitmap'),
+                                 pk=show_id)
+        held = holds.active_holds([show]).get(show.id, ())
+        return availability.compact_seat_map(show, held)
+
+    # bumped on every hold / release; lapsing holds are bounded by the timeout
+    return api_cache.json_response(request, f"seatmap:{show_id}", [f"seats:{show_id}"],
+                                   build, timeout=SEAT_MAP_CACHE_SECONDS)
+
+
+async def seat_events(request, show_id):
+    """
+    Server-sent events for one show's seat map: a snapshot, then
+    {"taken": [...], "released": [...]} deltas.  Needs the ASGI app to
+    stream; under WSGI it answers one snapshot and the browser re-polls.
+    """
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(live.stream(show_id),
+                                         content_type="text/event-stream")
+    else:
+        body     = await sync_to_async(live.snapshot_once)(show_id)
+        response = HttpResponse(body, content_type="text/event-stream")
+    response["Cache-Control"]     = "no-cache"
+    response["X-Accel-Buffering"] = "no"       # don't let nginx buffer it
+    return response
+
+
+# posters/<name>.<hash>.<width>w.<ext> – content-addressed, never changes
+HASHED_MEDIA = re.compile(r"\.[0-9a-f]{12}\.\d+w\.(?:webp|jpg)$")
+
+def serve_media(request, path):
+    """
+    DEBUG media server that also sends long-lived cache headers for hashed
+    variants (in production the web server does – see MEDIA_ROOT in settings).
+    """
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if HASHED_MEDIA.search(path):
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+def _page_number(request):
+    page = request.GET.get('page', '1')
+    return int(page) if page.isdigit() and int(page) > 0 else 1
 
 
 def home(request):
-    movies = Movie.objects.all()
-    return render(request, 'core/home.html', {'movies': movies})
+    q    = request.GET.get('q', '').strip()
+    page = _page_number(request)
+    if q:
+        movies, has_next = search.search(q, page, HOME_PAGE_SIZE)
+    else:
+        movies   = list(Movie.objects.order_by('id')
+                                     [(page - 1) * HOME_PAGE_SIZE:page * HOME_PAGE_SIZE + 1])
+        has_next = len(movies) > HOME_PAGE_SIZE
+        movies   = movies[:HOME_PAGE_SIZE]
+    return render(request, 'core/home.html', {
+        'movies':   movies,
+        'q':        q,
+        'page':     page,
+        'has_next': has_next,
+    })
+
+
+def search_movies(request):
+    """Typeahead / search API: ?q=star+wa&page=2 → ranked, paginated matches."""
+    q    = request.GET.get('q', '').strip()
+    page = _page_number(request)
+    movies, has_next = search.search(q, page)
+    return JsonResponse({
+        'query':    q,
+        'page':     page,
+        'has_next': has_next,
+        'results':  [{'id': m.id, 'title': m.title,
+                      'url': reverse('book_movie', args=[m.id])} for m in movies],
+    })
 
     
 @login_required
 def book_movie(request, movie_id):
     movie      = get_object_or_404(Movie, id=movie_id)
-    tomorrow   = timezone.now().date() + timedelta(days=1)
-    shows      = Show.objects.filter(movie=movie,
-                                     show_time__date=tomorrow)
-    theaters   = Theater.objects.all()
 
-    # seat‑map building ‑‑ (unchanged) ─────────────────────────
-    seat_map = {}
-    for show in shows:
-        all_seats    = Seat.objects.filter(show=show)          \
-                                   .values_list('seat_number', flat=True)
-        booked_seats = Booking.objects.filter(show=show)       \
-                                      .values_list('seats__seat_number', flat=True)
-        seat_map[show.id] = {
-            "available": list(all_seats),
-            "booked":    list(booked_seats),
-        }
+    # hot release → wait for a checkout slot before anything heavier runs
+    ticket = admission.enter(request, admission.movie_scope(movie.id))
+    if not ticket.admitted:
+        return render(request, "core/waiting_room.html", {
+            "movie":    movie,
+            "position": ticket.position,
+            "minutes":  math.ceil(ticket.wait / 60),
+            "poll":     admission.poll_seconds(),
+        })
+
+    theaters   = Theater.objects.all()
 
     # ─── handle POST (user clicked Confirm) ───────────────────
     if request.method == "POST":
         seat_numbers = request.POST.get("selected_seats", "").split(",")
-        seat_numbers = [s for s in seat_numbers if s.strip()]
+        seat_numbers = [s.strip() for s in seat_numbers if s.strip()]
+        show_id      = request.POST.get("show_id", "")
 
-        if not seat_numbers:
+        if not seat_numbers or not show_id.isdigit():
             # re‑render with error
             return render(request, "core/book_movie.html", {
                 "movie": movie,
-                "shows": shows,
                 "theaters": theaters,
-                "seat_map_json": json.dumps(seat_map),
                 "error": "Please select at least one seat."
             })
 
-        show_id = request.POST.get("show_id")
-        # --- save the choices in session ---------------------
+        show = get_object_or_404(Show, id=show_id, movie=movie)
+        # --- hold the seats, then remember them in session ---
+        try:
+            expires_at = holds.claim(request.user, show, seat_numbers)
+        except (holds.InvalidSelection, holds.SeatUnavailable, db.DatabaseBusy) as exc:
+            status = 200
+            if isinstance(exc, db.DatabaseBusy):
+                error = "We're very busy right now – please try again."
+            elif isinstance(exc, holds.InvalidSelection):
+                error  = (f"Seat(s) {exc} don't exist for this show – please choose again."
+                          if exc.seat_numbers else "Please select valid seats.")
+                status = 400
+            else:
+                error = f"Sorry, seat(s) {exc} were just taken – please choose again."
+            return render(request, "core/book_movie.html", {
+                "movie": movie,
+                "theaters": theaters,
+                "error": error,
+            }, status=status)
+
         request.session["seat_numbers"] = seat_numbers
-        request.session["show_id"]      = show_id
+        request.session["show_id"]      = show.id
+        request.session["hold_expires"] = expires_at.isoformat()
         # ------------------------------------------------------
         return redirect("payment", movie_id=movie.id)
 
-    # ─── GET: render the booking form ─────────────────────────
+    # ─── GET: render the booking form (seat maps load per show) ─
     return render(request, "core/book_movie.html", {
         "movie": movie,
-        "shows": shows,
         "theaters": theaters,
-        "seat_map_json": json.dumps(seat_map),
     })
 
 
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'moviebooking.settings')
+# route the JSON endpoints to their async views (settings.ASYNC_JSON_VIEWS)
+os.environ.setdefault('MOVIEBOOKING_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
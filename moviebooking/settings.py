@@ -15,6 +15,12 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Media: core.views.serve_media serves it under DEBUG only.  In production
+# the web server serves MEDIA_ROOT and must send the far-future header for
+# the content-hashed poster variants (core.posters) itself, e.g. nginx:
+#   location ~ "^/media/posters/.+\.[0-9a-f]{12}\.[0-9]+w\.(webp|jpg)$" {
+#       add_header Cache-Control "public, max-age=31536000, immutable";
+#   }
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -49,13 +55,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.static_files.StaticFilesMiddleware',  # STATIC_ROOT, precompressed
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'core.middleware.auto_create_shows.AutoCreateTomorrowShowsMiddleware',
 ]
 
 ROOT_URLCONF = 'moviebooking.urls'
@@ -85,9 +91,29 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # every atomic() takes the write lock up front (BEGIN IMMEDIATE)
+            'transaction_mode': 'IMMEDIATE',
+            # seconds to wait for the lock before "database is locked"
+            'timeout': 5,
+            # run on every new connection
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'          # readers don't block the writer
+                'PRAGMA synchronous=NORMAL;'        # safe with WAL, fewer fsyncs
+                'PRAGMA cache_size=-20000;'         # ~20 MB page cache
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA mmap_size=134217728;'       # 128 MB
+            ),
+        },
+        # on-disk test database so WAL and locking behave as in production
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# Retries of booking writes that still find the database locked (core.db)
+DB_LOCK_RETRIES = 3
+DB_LOCK_BACKOFF = 0.05
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -125,6 +151,79 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# `manage.py collectstatic` builds STATIC_ROOT: hashed names + manifest,
+# .gz/.br variants (core.storage); StaticFilesMiddleware serves it.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+    'default':     {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'},
+}
+STATIC_MAX_AGE = 60          # seconds, for the few assets without a hashed name
+
+# Cache – backs the booking widget's JSON endpoints (core.api_cache), which
+# need a shared backend (Redis / Memcached / file) to see other processes'
+# changes: with per-process memory they are rebuilt on every request
+# (core.api_cache.shared) and only save bandwidth through their ETags.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+JSON_CACHE_TIMEOUT = 300
+
+# Async JSON views: on when served through moviebooking/asgi.py
+ASYNC_JSON_VIEWS = os.environ.get('MOVIEBOOKING_ASYNC_VIEWS') == '1'
+
+# Waiting room (core.admission): concurrent checkouts per movie, 0 ⟹ off.
+# None ⟹ on (50) with a shared store such as DatabaseStore; off with
+# LocalStore, which can't follow a buyer across gunicorn workers.
+ADMISSION_STORE           = 'core.admission.DatabaseStore'   # shared
+ADMISSION_CAPACITY        = None
+ADMISSION_SESSION_SECONDS = 900      # an admitted checkout's slot (> the seat hold)
+ADMISSION_POLL_SECONDS    = 10       # waiting-room refresh
+
+# City/date show overview: seat counts may be this many seconds old
+BROWSE_CACHE_SECONDS = 30
+
+# Per-show seat map JSON: holds that lapse on their own show up within this
+SEAT_MAP_CACHE_SECONDS = 30
+
+# Cached seat plans (core.layouts): without a shared cache, another worker's
+# layout / seat class edit shows up within this
+LOCAL_PLAN_SECONDS = 30
+
+# PDF tickets: rendered by a process pool into MEDIA_ROOT/tickets (0 ⟹ inline)
+TICKET_RENDER_WORKERS = 2
+
+# SQL instrumentation (core.middleware.query_stats), installed unless None:
+#   'headers' – X-DB-* response headers (development)
+#   'log'     – one JSON line per request on the "core.queries" logger
+QUERY_STATS = 'headers' if DEBUG else None
+QUERY_STATS_SLOW_MS = 100
+
+if QUERY_STATS:
+    MIDDLEWARE.insert(0, 'core.middleware.query_stats.QueryStatsMiddleware')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.queries': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Show scheduling: `manage.py generate_shows` fills this many days ahead
+SHOW_SCHEDULE_DAYS = 7
+
+# Retention: `manage.py archive_shows` moves past shows to the archive tables
+ARCHIVE_BATCH_SIZE = 200
+
+# Poster variants (core.posters): widths rendered as WebP + JPEG for srcset
+POSTER_WIDTHS = [160, 320, 640]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 